@@ -0,0 +1,32 @@
+-- mcp_service
+ALTER TABLE `mcp_service` ADD COLUMN `request_timeout` int NULL DEFAULT NULL COMMENT 'Upstream request timeout in seconds' AFTER `tags`;
+
+-- usage_daily
+CREATE TABLE IF NOT EXISTS `usage_daily` (
+  `stats_day` DATE NOT NULL COMMENT 'Call day (call start time)',
+  `apikey_id` CHAR(36) NOT NULL DEFAULT '' COMMENT 'API key UUID, empty when unknown',
+  `service_id` CHAR(36) NOT NULL COMMENT 'MCP service UUID',
+  `user_id` CHAR(36) NOT NULL COMMENT 'User UUID',
+  `call_count` INT NOT NULL DEFAULT 0 COMMENT 'Number of calls',
+  `success_count` INT NOT NULL DEFAULT 0 COMMENT 'Number of successful calls',
+  `amount` DECIMAL(16,4) NOT NULL DEFAULT 0.0000 COMMENT 'Sum of unit prices',
+  `total_latency_ms` BIGINT NOT NULL DEFAULT 0 COMMENT 'Sum of call durations in milliseconds',
+  `created_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT 'Creation timestamp',
+  `updated_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT 'Last update timestamp',
+  PRIMARY KEY (`stats_day`, `apikey_id`, `service_id`, `user_id`),
+  INDEX `idx_apikey_day` (`apikey_id`, `stats_day`),
+  INDEX `idx_user_day` (`user_id`, `stats_day`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='Daily call usage rollup';
+
+-- keyset pagination on (created_at, id), InnoDB secondary indexes carry the primary key
+ALTER TABLE `mcp_call_log` ADD INDEX `idx_user_created_at` (`user_id`, `created_at`);
+ALTER TABLE `user_wallet_history` ADD INDEX `idx_type_status_created_at` (`type`, `status`, `created_at`);
+ALTER TABLE `user` ADD INDEX `idx_role_deleted_created_at` (`role_id`, `is_deleted`, `created_at`);
+ALTER TABLE `mcp_service` ADD INDEX `idx_created_at` (`created_at`);
+
+-- marketplace keyword search fallback when the in-process search index is unavailable
+ALTER TABLE `mcp_service` ADD FULLTEXT INDEX `ft_service_search` (`name`, `short_description`, `tags`) WITH PARSER ngram;
+
+INSERT INTO `sys_config` (`id`,`key`, `value`,`description`,`created_at`,`updated_at`)
+VALUES ('xpack-version','version', '1.0.2', 'User wallet history max count', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON DUPLICATE KEY UPDATE `value` = VALUES(`value`), `description` = VALUES(`description`), `updated_at` = CURRENT_TIMESTAMP;
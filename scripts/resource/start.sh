@@ -36,6 +36,9 @@ python ./init_db.py
 
 nohup uvicorn services.admin_service.main:app --host 0.0.0.0 --port 8001 --reload > ${LOG_DIR}/admin_service.log 2>&1 &
 
+# 计费消费者独立进程运行，不随 admin 服务 --reload 重启
+nohup python -m services.admin_service.consumers > ${LOG_DIR}/billing_consumer.log 2>&1 &
+
 sleep 5s
 
 nohup uvicorn services.api_service.main:app --host 0.0.0.0 --port 8002 --reload > ${LOG_DIR}/api_service.log 2>&1 &
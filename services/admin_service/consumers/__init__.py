@@ -0,0 +1 @@
+# Consumers package
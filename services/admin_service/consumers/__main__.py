@@ -0,0 +1,95 @@
+"""
+Standalone billing consumer process
+
+Usage:
+    python -m services.admin_service.consumers [--lanes 0,1] [--port 8003]
+
+Runs the billing consumer lanes outside the admin service so they can be
+scaled on their own. SIGTERM/SIGINT drains in-flight batches before the
+connections are closed. GET /healthz reports per-lane lag.
+"""
+
+import argparse
+from contextlib import asynccontextmanager
+from typing import List, Optional
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from services.common.config import Config
+from services.common.logging_config import setup_logging, get_logger
+from services.common.utils.billing_queue_utils import BillingQueueUtils
+from services.admin_service.consumers.billing_message_consumer import BillingConsumerPool
+
+setup_logging("billing_consumer")
+logger = get_logger(__name__)
+
+
+def parse_lanes(value: str) -> Optional[List[int]]:
+    """Parse comma-separated lane IDs, None (all lanes) when empty"""
+    if not value.strip():
+        return None
+    lanes = sorted({int(lane) for lane in value.split(",") if lane.strip()})
+    lane_count = BillingQueueUtils.lane_count()
+    invalid = [lane for lane in lanes if lane < 0 or lane >= lane_count]
+    if invalid:
+        raise ValueError(f"Invalid billing lanes {invalid}, BILLING_CONSUMER_LANES is {lane_count}")
+    return lanes
+
+
+def create_app(lanes: Optional[List[int]]) -> FastAPI:
+    """
+    Create the consumer process app: lifespan runs the lane pool, /healthz reports it
+
+    Args:
+        lanes: Lanes consumed by this process, all lanes when None
+
+    Returns:
+        FastAPI: Application
+    """
+    pool = BillingConsumerPool(lanes)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        logger.info("Billing consumer process starting...")
+        pool.start()
+        yield
+        # uvicorn handles SIGTERM/SIGINT and runs the shutdown phase
+        logger.info("Billing consumer process draining...")
+        pool.stop(timeout=Config.BILLING_CONSUMER_DRAIN_TIMEOUT)
+
+    app = FastAPI(title="Billing Consumer", lifespan=lifespan)
+
+    @app.get("/healthz")
+    def healthz():
+        """Report lane liveness, queue depth and lag, 503 when a lane is down or lagging"""
+        lanes_stats = pool.get_stats()
+        unhealthy = [
+            stats["lane"]
+            for stats in lanes_stats
+            if not stats["alive"] or (stats.get("queue_depth", 0) > 0 and stats.get("lag_seconds", 0) > Config.BILLING_CONSUMER_MAX_LAG)
+        ]
+        content = {
+            "status": "unhealthy" if unhealthy else "ok",
+            "unhealthy_lanes": unhealthy,
+            "max_lag_seconds": max((stats.get("lag_seconds", 0) for stats in lanes_stats), default=0),
+            "lanes": lanes_stats,
+        }
+        return JSONResponse(status_code=503 if unhealthy else 200, content=content)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Billing message consumer")
+    parser.add_argument("--lanes", default=Config.BILLING_CONSUMER_LANE_IDS, help="Comma-separated lanes to consume, all lanes by default")
+    parser.add_argument("--port", type=int, default=Config.BILLING_CONSUMER_PORT, help="Health check port")
+    parser.add_argument("--host", default="0.0.0.0", help="Health check host")
+    args = parser.parse_args()
+
+    app = create_app(parse_lanes(args.lanes))
+    uvicorn.run(app, host=args.host, port=args.port, log_config=None)
+
+
+if __name__ == "__main__":
+    main()
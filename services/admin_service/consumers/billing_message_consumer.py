@@ -7,23 +7,53 @@ import pika
 import threading
 import time
 import logging
-from typing import Callable
-import os
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
 from services.common.config import Config
 from services.common.database import get_db
+from services.common.utils.billing_queue_utils import BillingQueueUtils
 from services.admin_service.services.billing_message_handler import BillingMessageHandler
 
 logger = logging.getLogger(__name__)
 
+# Seconds between queue depth refreshes of a lane
+LAG_REFRESH_INTERVAL = 10
+# Backoff bounds (seconds) before a lane whose consumer failed is restarted
+LANE_RESTART_MIN_DELAY = 1
+LANE_RESTART_MAX_DELAY = 60
 
-class BillingMessageConsumer:
-    """Billing message consumer"""
 
-    def __init__(self):
-        self.queue_name = os.getenv("BILLING_QUEUE_NAME") or "billing.api.calls"
+class BillingMessageConsumer:
+    """Billing message consumer for one user-sharded lane"""
+
+    def __init__(self, lane: int = 0):
+        self.lane = lane
+        self.queue_names = BillingQueueUtils.consumer_queues(lane)
+        self.queue_name = self.queue_names[0]
+        self.batch_size = max(1, Config.BILLING_BATCH_SIZE)
+        self.batch_max_wait = Config.BILLING_BATCH_MAX_WAIT
         self.connection = None
         self.channel = None
         self.consuming = False
+        # Received but not yet processed messages: (delivery_tag, body, properties, source queue)
+        self._pending: List[Tuple[int, bytes, pika.BasicProperties, str]] = []
+        self._batch_timer = None
+        self._stats: Dict = {
+            "lane": lane,
+            "queues": self.queue_names,
+            "processed_total": 0,
+            "batches_total": 0,
+            "retried_total": 0,
+            "dead_lettered_total": 0,
+            "queue_depth": 0,
+            "lag_seconds": 0.0,
+            "throughput_per_second": 0.0,
+            "last_batch_at": None,
+        }
+        self._throughput_window_start = time.monotonic()
+        self._throughput_window_count = 0
+        # Monotonic time the lane last processed a batch or had nothing queued
+        self._last_progress_monotonic = time.monotonic()
         self._setup_connection()
 
     def _setup_connection(self):
@@ -45,12 +75,22 @@ class BillingMessageConsumer:
 
                 self.connection = pika.BlockingConnection(parameters)
                 self.channel = self.connection.channel()
-
-                # Declare queue
-                self.channel.queue_declare(queue=self.queue_name, durable=True)
-
-                # Set QoS, only process one message at a time
-                self.channel.basic_qos(prefetch_count=1)
+                # Retry and dead-letter copies must be confirmed by the broker before the original is acked
+                self.channel.confirm_delivery()
+
+                # Declare queues with their retry and dead-letter queues
+                for queue_name in self.queue_names:
+                    self.channel.queue_declare(queue=queue_name, durable=True)
+                    for retry_attempt in range(1, Config.BILLING_RETRY_TIMES + 1):
+                        self.channel.queue_declare(
+                            queue=BillingQueueUtils.retry_queue(queue_name, retry_attempt),
+                            durable=True,
+                            arguments=BillingQueueUtils.retry_queue_arguments(queue_name, retry_attempt),
+                        )
+                    self.channel.queue_declare(queue=BillingQueueUtils.dead_letter_queue(queue_name), durable=True)
+
+                # Prefetch a full batch so messages can be processed and acked together
+                self.channel.basic_qos(prefetch_count=self.batch_size)
 
                 logger.info("RabbitMQ connection established successfully")
                 return
@@ -78,44 +118,156 @@ class BillingMessageConsumer:
             self.consuming = True
 
             # Set message callback
-            self.channel.basic_consume(queue=self.queue_name, on_message_callback=self._process_message, auto_ack=False)  # Manual ack
+            for queue_name in self.queue_names:
+                self.channel.basic_consume(queue=queue_name, on_message_callback=self._process_message, auto_ack=False)  # Manual ack
 
-            logger.info(f"Start consuming queue: {self.queue_name}")
+            logger.info(f"Start consuming lane {self.lane}, queues: {', '.join(self.queue_names)}")
             logger.info("Consumer is now waiting for messages. Press CTRL+C to exit")
 
-            # Periodically log heartbeat to ensure consumer thread is running
-            import threading
+            # Queue depth must be read on the consumer thread, pika channels are not thread-safe
+            self._refresh_lag()
 
+            # Periodically log heartbeat to ensure consumer thread is running
             def log_heartbeat():
                 while self.consuming:
                     time.sleep(30)  # Log heartbeat every 30 seconds
                     if self.consuming:
-                        logger.info(f"Consumer heartbeat - listening on queue: {self.queue_name}")
+                        stats = self.get_stats()
+                        logger.info(
+                            f"Consumer heartbeat - Lane: {self.lane}, Queue depth: {stats['queue_depth']}, "
+                            f"Lag: {stats['lag_seconds']}s, Throughput: {stats['throughput_per_second']}/s"
+                        )
 
             heartbeat_thread = threading.Thread(target=log_heartbeat, daemon=True)
             heartbeat_thread.start()
 
+            # Returns once _drain_and_stop cancelled the consumers
             self.channel.start_consuming()
+            self._close_connection()
 
         except KeyboardInterrupt:
             logger.info("Received interrupt signal, stopping consumption")
-            self.stop_consuming()
+            self._drain_and_stop()
+            self._close_connection()
         except Exception as e:
             logger.error(f"Exception occurred while consuming messages: {str(e)}", exc_info=True)
+            # Stops the heartbeat thread, unacked deliveries go back to the queue
+            self.consuming = False
+            self._close_connection()
             raise
 
     def stop_consuming(self):
-        """Stop consuming messages"""
+        """
+        Stop consuming messages gracefully, safe to call from any thread
+
+        The drain runs on the consumer thread: deliveries are cancelled, the
+        pending batch is processed and acked, then the connection is closed.
+        Prefetched messages that were never handed to the consumer are requeued
+        by the broker.
+        """
+        self.consuming = False
+        if not self.connection or self.connection.is_closed:
+            return
+        try:
+            # pika connections are not thread-safe, schedule the drain on the consumer thread
+            self.connection.add_callback_threadsafe(self._drain_and_stop)
+        except Exception as e:
+            logger.warning(f"Failed to schedule billing consumer drain - Lane: {self.lane}: {str(e)}")
+
+    def _drain_and_stop(self):
+        """Cancel deliveries and finish the pending batch, runs on the consumer thread"""
         self.consuming = False
-        if self.channel:
-            self.channel.stop_consuming()
-        if self.connection and not self.connection.is_closed:
-            self.connection.close()
-        logger.info("Message consumption stopped")
+        try:
+            if self.channel and self.channel.is_open:
+                self.channel.stop_consuming()
+            self._flush_batch()
+        except Exception as e:
+            logger.error(f"Error draining billing consumer - Lane: {self.lane}: {str(e)}", exc_info=True)
+        logger.info(f"Message consumption stopped - Lane: {self.lane}")
+
+    def _close_connection(self):
+        """Close the connection, unacked deliveries are requeued by the broker"""
+        try:
+            if self.connection and not self.connection.is_closed:
+                self.connection.close()
+        except Exception as e:
+            logger.warning(f"Error closing billing consumer connection - Lane: {self.lane}: {str(e)}")
+
+    def get_stats(self) -> Dict:
+        """
+        Get lane statistics
+
+        Returns:
+            Dict: Processed counts, queue depth, lag (age of the newest processed message) and throughput
+        """
+        stats = dict(self._stats)
+        # Recomputed here too: a lane blocked in a batch does not run _refresh_lag
+        stats["lag_seconds"] = self._current_lag()
+        return stats
+
+    def _current_lag(self) -> float:
+        """
+        Get the lane lag, counting a lane that stopped making progress
+
+        The age of the newest processed message stays frozen when the lane stops
+        processing, so while messages are queued the lag is at least the time
+        since the last batch (or since the queue was last seen empty).
+
+        Returns:
+            float: Lag in seconds
+        """
+        lag = self._stats["lag_seconds"]
+        if self._stats["queue_depth"] > 0:
+            lag = max(lag, round(time.monotonic() - self._last_progress_monotonic, 3))
+        return lag
+
+    def _refresh_lag(self):
+        """Refresh queue depth and throughput, then reschedule itself"""
+        try:
+            depth = 0
+            for queue_name in self.queue_names:
+                result = self.channel.queue_declare(queue=queue_name, durable=True, passive=True)
+                depth += result.method.message_count
+            self._stats["queue_depth"] = depth
+            if depth == 0:
+                self._last_progress_monotonic = time.monotonic()
+            self._stats["lag_seconds"] = self._current_lag()
+
+            elapsed = time.monotonic() - self._throughput_window_start
+            if elapsed > 0:
+                self._stats["throughput_per_second"] = round(self._throughput_window_count / elapsed, 2)
+            self._throughput_window_start = time.monotonic()
+            self._throughput_window_count = 0
+        except Exception as e:
+            logger.warning(f"Failed to refresh lane {self.lane} lag: {str(e)}")
+        if self.consuming and self.connection and not self.connection.is_closed:
+            self.connection.call_later(LAG_REFRESH_INTERVAL, self._refresh_lag)
+
+    def _record_batch(self, messages_data: List[dict], batch_size: int):
+        """Update lane statistics after a batch"""
+        now = datetime.now(timezone.utc)
+        self._stats["processed_total"] += batch_size
+        self._stats["batches_total"] += 1
+        self._stats["last_batch_at"] = now.isoformat()
+        self._last_progress_monotonic = time.monotonic()
+        self._throughput_window_count += batch_size
+
+        # Lag: how long ago the newest call in the batch ended
+        end_times = []
+        for message_data in messages_data:
+            try:
+                end_times.append(datetime.fromisoformat(message_data["call_end_time"].replace("Z", "+00:00")))
+            except (KeyError, TypeError, AttributeError, ValueError):
+                continue
+        if end_times:
+            self._stats["lag_seconds"] = round(max(0.0, (now - max(end_times)).total_seconds()), 3)
 
     def _process_message(self, channel, method, properties, body):
         """
-        Process a single message
+        Collect a message into the current batch
+
+        The batch is processed when it is full or when BILLING_BATCH_MAX_WAIT
+        elapses after its first message, whichever comes first.
 
         Args:
             channel: Channel object
@@ -123,44 +275,192 @@ class BillingMessageConsumer:
             properties: Properties object
             body: Message body
         """
-        message_data = None
-        try:
-            # Parse message
-            message_data = json.loads(body)
-            logger.info(f"Received billing message: user_id={message_data.get('user_id')}, tool={message_data.get('tool_name')}")
-
-            # Get DB session and process message
+        self._pending.append((method.delivery_tag, body, properties, method.routing_key))
+        if len(self._pending) >= self.batch_size:
+            self._flush_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = self.connection.call_later(self.batch_max_wait, self._on_batch_timer)
+
+    def _on_batch_timer(self):
+        """Process partial batch once the max wait elapses"""
+        self._batch_timer = None
+        self._flush_batch()
+
+    def _flush_batch(self):
+        """Process pending messages as one batch and acknowledge them together"""
+        if self._batch_timer is not None:
+            self.connection.remove_timeout(self._batch_timer)
+            self._batch_timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        # Parsed messages with their delivery: (message_data, (delivery_tag, body, properties, source queue))
+        parsed = []
+        # Delivery tags that were rejected back to the broker and must not be acked
+        rejected = set()
+        for delivery in batch:
+            try:
+                parsed.append((json.loads(delivery[1]), delivery))
+            except json.JSONDecodeError as e:
+                # Format error, retrying cannot help
+                logger.error(f"Message format error: {str(e)}, body: {delivery[1]}")
+                if not self._dead_letter(delivery, f"Message format error: {str(e)}"):
+                    rejected.add(delivery[0])
+
+        messages_data = [message_data for message_data, _ in parsed]
+        if messages_data:
             db = next(get_db())
             try:
                 handler = BillingMessageHandler(db)
-                success = handler.process_billing_message(message_data)
+                handler.process_billing_batch(messages_data)
+            except Exception as e:
+                logger.error(f"Batch processing failed, falling back to per-message processing ({len(messages_data)} messages): {str(e)}", exc_info=True)
+                rejected.update(self._process_individually(parsed))
+            finally:
+                db.close()
 
-                if success:
-                    # Ack if processed successfully
-                    channel.basic_ack(delivery_tag=method.delivery_tag)
-                    logger.info(f"Message processed and acknowledged: {message_data.get('user_id')}")
-                else:
-                    # If failed, ack and drop (avoid infinite retry)
-                    channel.basic_ack(delivery_tag=method.delivery_tag)
-                    logger.error(f"Message processing failed, message dropped: {message_data.get('user_id')}")
+        self._record_batch(messages_data, len(batch))
+        self._ack_batch(batch, rejected)
+
+    def _ack_batch(self, batch: List[Tuple], rejected: set):
+        """
+        Acknowledge a processed batch with a single multi-ack
+
+        Args:
+            batch: Deliveries of the batch
+            rejected: Delivery tags already requeued with basic_nack
+        """
+        acked_tags = [delivery[0] for delivery in batch if delivery[0] not in rejected]
+        if not acked_tags:
+            return
+        try:
+            # Ack the whole batch at once, requeued deliveries are already settled and skipped
+            self.channel.basic_ack(delivery_tag=max(acked_tags), multiple=True)
+            logger.info(f"Billing batch acknowledged - Lane: {self.lane}, Messages: {len(acked_tags)}")
+        except Exception:
+            # If even ack fails, log error but do not raise
+            logger.error("Unable to acknowledge message batch", exc_info=True)
+
+    def _process_individually(self, parsed: List[Tuple[dict, Tuple]]) -> List[int]:
+        """
+        Process messages one by one, each in its own session
+
+        Failed messages are scheduled for a delayed retry, or dead-lettered
+        once retries are exhausted.
+
+        Args:
+            parsed: Parsed message data with its delivery
 
+        Returns:
+            List[int]: Delivery tags that could not be rescheduled and were requeued
+        """
+        rejected = []
+        for message_data, delivery in parsed:
+            db = next(get_db())
+            try:
+                handler = BillingMessageHandler(db)
+                if handler.process_billing_message(message_data):
+                    logger.info(f"Message processed: {message_data.get('user_id')}")
+                    continue
+                error = "Message processing failed"
+            except Exception as e:
+                logger.error(f"Exception occurred while processing message: {str(e)}", exc_info=True)
+                error = f"Exception occurred while processing message: {str(e)}"
             finally:
                 db.close()
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Message format error: {str(e)}, body: {body}")
-            # Format error, ack directly (do not requeue)
-            channel.basic_ack(delivery_tag=method.delivery_tag)
+            if not self._retry_or_dead_letter(delivery, error):
+                rejected.append(delivery[0])
+        return rejected
+
+    def _retry_or_dead_letter(self, delivery: Tuple, error: str) -> bool:
+        """
+        Schedule a delayed retry of a failed message, or dead-letter it after BILLING_RETRY_TIMES
+
+        Args:
+            delivery: (delivery_tag, body, properties, source queue)
+            error: Failure reason
+
+        Returns:
+            bool: Whether the message was rescheduled and can be acked
+        """
+        _, body, properties, queue = delivery
+        retry_count = self._get_retry_count(properties)
+        if retry_count >= Config.BILLING_RETRY_TIMES:
+            return self._dead_letter(delivery, error)
+
+        attempt = retry_count + 1
+        retry_queue = BillingQueueUtils.retry_queue(queue, attempt)
+        if not self._republish(retry_queue, body, properties, {"x-retry-count": attempt, "x-last-error": error[:500]}, delivery[0]):
+            return False
+        self._stats["retried_total"] += 1
+        logger.warning(
+            f"Billing message scheduled for retry {attempt}/{Config.BILLING_RETRY_TIMES} "
+            f"in {BillingQueueUtils.retry_delay_seconds(attempt)}s - Queue: {queue}, Error: {error}"
+        )
+        return True
+
+    def _dead_letter(self, delivery: Tuple, error: str) -> bool:
+        """
+        Move a message to the dead-letter queue of its source queue
+
+        Args:
+            delivery: (delivery_tag, body, properties, source queue)
+            error: Failure reason
+
+        Returns:
+            bool: Whether the message was moved and can be acked
+        """
+        _, body, properties, queue = delivery
+        headers = {
+            "x-retry-count": self._get_retry_count(properties),
+            "x-last-error": error[:500],
+            "x-original-queue": queue,
+            "x-dead-lettered-at": datetime.now(timezone.utc).isoformat(),
+        }
+        if not self._republish(BillingQueueUtils.dead_letter_queue(queue), body, properties, headers, delivery[0]):
+            return False
+        self._stats["dead_lettered_total"] += 1
+        logger.error(f"Billing message moved to dead-letter queue - Queue: {queue}, Error: {error}")
+        return True
+
+    def _republish(self, queue: str, body: bytes, properties, headers: dict, delivery_tag: int) -> bool:
+        """
+        Publish a copy of a delivery with updated headers, requeue the original if that fails
 
+        The channel is in confirm mode, so the copy counts as published only once
+        the broker confirmed it; a nacked or unroutable copy requeues the original.
+
+        Returns:
+            bool: Whether the copy was published
+        """
+        merged_headers = dict(properties.headers or {}) if properties else {}
+        merged_headers.update(headers)
+        try:
+            self.channel.basic_publish(
+                exchange="",
+                routing_key=queue,
+                body=body,
+                properties=pika.BasicProperties(delivery_mode=2, headers=merged_headers),
+                mandatory=True,
+            )
+            return True
+        except (pika.exceptions.UnroutableError, pika.exceptions.NackError) as e:
+            logger.error(f"Billing message copy to {queue} was not confirmed, requeueing: {str(e)}")
+            self._requeue(delivery_tag)
+            return False
         except Exception as e:
-            logger.error(f"Exception occurred while processing message: {str(e)}", exc_info=True)
-            # On exception, ack and drop (avoid infinite retry)
-            try:
-                channel.basic_ack(delivery_tag=method.delivery_tag)
-                logger.error(f"Exception handling failed, message dropped")
-            except:
-                # If even ack fails, log error but do not raise
-                logger.error("Unable to acknowledge message", exc_info=True)
+            logger.error(f"Failed to republish billing message to {queue}, requeueing: {str(e)}")
+            self._requeue(delivery_tag)
+            return False
+
+    def _requeue(self, delivery_tag: int) -> None:
+        """Return a delivery to its queue"""
+        try:
+            self.channel.basic_nack(delivery_tag=delivery_tag, requeue=True)
+        except Exception:
+            logger.error("Unable to requeue billing message", exc_info=True)
 
     def _get_retry_count(self, properties):
         """
@@ -177,6 +477,100 @@ class BillingMessageConsumer:
         return 0
 
 
+class BillingConsumerPool:
+    """
+    Pool of lane consumers, one thread and RabbitMQ connection per lane
+
+    Messages of the same user are routed to the same lane, so they are
+    processed in order, while different users are processed in parallel.
+    """
+
+    def __init__(self, lanes: Optional[List[int]] = None):
+        """
+        Args:
+            lanes: Lanes consumed by this pool, all lanes when None. Several
+                processes can split the lanes between them.
+        """
+        self.lanes = list(range(BillingQueueUtils.lane_count())) if lanes is None else lanes
+        self.consumers: Dict[int, BillingMessageConsumer] = {}
+        self.threads: Dict[int, threading.Thread] = {}
+        self._stopping = threading.Event()
+
+    def start(self):
+        """Start one consumer thread per lane"""
+        for lane in self.lanes:
+            thread = threading.Thread(target=self._run_lane, args=(lane,), name=f"billing-consumer-{lane}", daemon=True)
+            thread.start()
+            self.threads[lane] = thread
+        logger.info(f"Billing consumer pool started - Lanes: {self.lanes}")
+
+    def _run_lane(self, lane: int):
+        """
+        Run a lane consumer in the current thread until the pool is stopped
+
+        A consumer that fails (e.g. the broker connection dropped) is replaced
+        by a new one after an exponential backoff, so the lane never stays
+        unconsumed while the process is running.
+        """
+        delay = LANE_RESTART_MIN_DELAY
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            try:
+                consumer = BillingMessageConsumer(lane)
+                self.consumers[lane] = consumer
+                if self._stopping.is_set():
+                    consumer._close_connection()
+                    return
+                consumer.start_consuming()
+                if self._stopping.is_set():
+                    return
+                logger.warning(f"Billing consumer lane {lane} stopped unexpectedly")
+            except Exception as e:
+                logger.error(f"Billing consumer lane {lane} failed: {str(e)}", exc_info=True)
+            if time.monotonic() - started > LANE_RESTART_MAX_DELAY:
+                # The consumer ran for a while, this is a new failure rather than a restart loop
+                delay = LANE_RESTART_MIN_DELAY
+            logger.info(f"Restarting billing consumer lane {lane} in {delay}s")
+            if self._stopping.wait(delay):
+                return
+            delay = min(delay * 2, LANE_RESTART_MAX_DELAY)
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop all lane consumers and wait for their in-flight batches
+
+        Args:
+            timeout: Max seconds to wait for each lane to drain, None waits indefinitely
+        """
+        self._stopping.set()
+        for consumer in list(self.consumers.values()):
+            try:
+                consumer.stop_consuming()
+            except Exception as e:
+                logger.warning(f"Error stopping billing consumer lane {consumer.lane}: {str(e)}")
+        for lane, thread in self.threads.items():
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning(f"Billing consumer lane {lane} did not drain within {timeout}s")
+        logger.info("Billing consumer pool stopped")
+
+    def get_stats(self) -> List[Dict]:
+        """
+        Get per-lane statistics
+
+        Returns:
+            List[Dict]: Statistics of each lane, including whether its thread is alive
+        """
+        stats = []
+        for lane in self.lanes:
+            consumer = self.consumers.get(lane)
+            lane_stats = consumer.get_stats() if consumer else {"lane": lane}
+            thread = self.threads.get(lane)
+            lane_stats["alive"] = bool(thread and thread.is_alive())
+            stats.append(lane_stats)
+        return stats
+
+
 def start_billing_consumer():
     """Start billing message consumer"""
     consumer = BillingMessageConsumer()
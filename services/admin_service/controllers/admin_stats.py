@@ -1,42 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, date
 from services.common.database import get_db
 from services.common.utils.response_utils import ResponseUtils
-from services.common.models.user import User
-from services.common.models.user_wallet import UserWallet
-from services.common.models.mcp_service import McpService
-from services.common.models.mcp_call_log import McpCallLog
+from services.admin_service.services.platform_stats_service import platform_stats_service
 
 router = APIRouter()
 
 
 @router.get("/platform")
-async def get_platform_overview(db: Session = Depends(get_db)):
+async def get_platform_overview(
+    days: int = Query(0, ge=0, le=365, description="Days of daily invoke counts to include, 0 for none"),
+    db: Session = Depends(get_db),
+):
     """Get platform overview statistics and metrics."""
     try:
-        # Get total users (non-admin and not deleted)
-        total_user = db.query(User).filter(User.role_id != 1, User.is_deleted == 0).count()  # Non-admin (role_id 1 is admin), not deleted
-
-        # Get total balance
-        total_balance_result = db.query(func.sum(UserWallet.balance)).scalar()
-        total_balance = int(total_balance_result) if total_balance_result else 0
-
-        # Get total number of services
-        total_service = db.query(McpService).count()
-
-        # Get today's invocation count
-        today = date.today()
-        today_invoke_count = db.query(McpCallLog).filter(func.date(McpCallLog.created_at) == today).count()
-
-        # Build response data
-        response_data = {
-            "total_user": total_user,
-            "total_balance": total_balance,
-            "total_service": total_service,
-            "invoke_count": {"today": today_invoke_count},
-        }
+        # Counters are maintained incrementally in Redis and reconciled periodically
+        response_data = platform_stats_service.get_overview(db, days)
 
         return ResponseUtils.success(response_data)
 
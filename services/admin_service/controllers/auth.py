@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Request, Body
 from sqlalchemy.orm import Session
 from services.common.database import get_db
+from services.common.redis import RedisClient, get_redis_client
 from services.common.utils.response_utils import ResponseUtils
 from services.admin_service.services.auth_service import AuthService
 from services.admin_service.services.sys_config_service import SysConfigService
@@ -13,8 +14,8 @@ router = APIRouter()
 def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
     return AuthService(db)
 
-def get_sys_config_service(db: Session = Depends(get_db)) -> SysConfigService:
-    return SysConfigService(db)
+def get_sys_config_service(db: Session = Depends(get_db), redis: RedisClient = Depends(get_redis_client)) -> SysConfigService:
+    return SysConfigService(db, redis)
 
 
 @router.post("/email/sign", response_model=dict)
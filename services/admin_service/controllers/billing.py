@@ -0,0 +1,76 @@
+import logging
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, Query, Request
+from services.common.utils.response_utils import ResponseUtils
+from services.admin_service.services.billing_dead_letter_service import BillingDeadLetterService
+from services.admin_service.utils.user_utils import UserUtils
+from services.common import error_msg
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def get_dead_letter_service() -> BillingDeadLetterService:
+    return BillingDeadLetterService()
+
+
+@router.get("/dead_letters/stats", summary="Billing dead-letter queue sizes")
+def get_dead_letter_stats(request: Request, dead_letter_service: BillingDeadLetterService = Depends(get_dead_letter_service)):
+    """Get message count of each billing dead-letter queue."""
+    if not UserUtils.is_admin(request):
+        return ResponseUtils.error(error_msg=error_msg.NO_PERMISSION)
+
+    try:
+        return ResponseUtils.success(dead_letter_service.get_stats())
+    except Exception as e:
+        logger.error(f"Failed to get billing dead-letter stats: {str(e)}")
+        return ResponseUtils.error(error_msg=error_msg.SERVICE_UNAVAILABLE)
+
+
+@router.get("/dead_letters", summary="Inspect billing dead letters")
+def list_dead_letters(
+    request: Request,
+    queue: Optional[str] = Query(None, description="Dead-letter queue, all queues if omitted"),
+    limit: int = Query(50, ge=1, le=500, description="Max number of messages"),
+    dead_letter_service: BillingDeadLetterService = Depends(get_dead_letter_service),
+):
+    """Peek dead-lettered billing messages without removing them."""
+    if not UserUtils.is_admin(request):
+        return ResponseUtils.error(error_msg=error_msg.NO_PERMISSION)
+
+    try:
+        return ResponseUtils.success(dead_letter_service.list_messages(queue=queue, limit=limit))
+    except ValueError as e:
+        return ResponseUtils.error(message=str(e))
+    except Exception as e:
+        logger.error(f"Failed to list billing dead letters: {str(e)}")
+        return ResponseUtils.error(error_msg=error_msg.SERVICE_UNAVAILABLE)
+
+
+@router.post("/dead_letters/replay", summary="Replay billing dead letters")
+def replay_dead_letters(
+    request: Request,
+    body: dict = Body(default={}),
+    dead_letter_service: BillingDeadLetterService = Depends(get_dead_letter_service),
+):
+    """Move dead-lettered billing messages back to their source queue in bulk."""
+    if not UserUtils.is_admin(request):
+        return ResponseUtils.error(error_msg=error_msg.NO_PERMISSION)
+
+    queue = body.get("queue")
+    try:
+        limit = int(body.get("limit", 1000))
+    except (TypeError, ValueError):
+        return ResponseUtils.error(error_msg=error_msg.INVALID_REQUEST)
+    if limit < 1:
+        return ResponseUtils.error(error_msg=error_msg.INVALID_REQUEST)
+
+    try:
+        replayed = dead_letter_service.replay(queue=queue, limit=limit)
+        return ResponseUtils.success({"replayed": replayed, "total": sum(replayed.values())})
+    except ValueError as e:
+        return ResponseUtils.error(message=str(e))
+    except Exception as e:
+        logger.error(f"Failed to replay billing dead letters: {str(e)}")
+        return ResponseUtils.error(error_msg=error_msg.SERVICE_UNAVAILABLE)
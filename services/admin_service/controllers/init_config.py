@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends
 import json
 from sqlalchemy.orm import Session
 from services.common.database import get_db
+from services.common.redis import RedisClient, get_redis_client
 from services.common.utils.response_utils import ResponseUtils
 from services.admin_service.services.sys_config_service import SysConfigService
 from services.admin_service.constants.sys_config_key import (
@@ -34,11 +35,12 @@ router = APIRouter()
 @router.get("/config", summary="Get configuration (no login required)", tags=["common"])
 def get_config(
         db: Session = Depends(get_db),
+        redis: RedisClient = Depends(get_redis_client),
 ):
     """Get platform configuration settings without authentication."""
     try:
         # Create service instance
-        sys_config_service = SysConfigService(db)
+        sys_config_service = SysConfigService(db, redis)
         payment_channel_service = PaymentChannelService(db)
 
         # Get platform config
@@ -109,11 +111,11 @@ def get_config(
         return ResponseUtils.error(message="Failed to get configuration")
 
 @router.get("/homepage", summary="Get homepage configuration (no login required)", tags=["common"])
-def get_homepage_config(db: Session = Depends(get_db)):
+def get_homepage_config(db: Session = Depends(get_db), redis: RedisClient = Depends(get_redis_client)):
     """Get homepage configuration settings without authentication."""
     try:
         # Create service instance
-        sys_config_service = SysConfigService(db)
+        sys_config_service = SysConfigService(db, redis)
 
         # Get homepage config
         faq = sys_config_service.get_value_by_key(KEY_FAQ) or "[]"
@@ -1,6 +1,6 @@
 import uuid
 import logging
-from fastapi import APIRouter, Depends, Request, Body, UploadFile, File, HTTPException, Form
+from fastapi import APIRouter, Depends, Request, Body, UploadFile, File, HTTPException, Form, Query
 from pydantic import BaseModel, HttpUrl
 from typing import Optional
 from sqlalchemy.orm import Session
@@ -170,23 +170,31 @@ def get_mcp_service_info(request: Request, id: str, mcp_manager_service: McpMana
 
 @router.get("/service/list", summary="获取mcp服务列表")
 def get_mcp_service_list(
-    request: Request, page: int = 1, page_size: int = 10, mcp_manager_service: McpManagerService = Depends(get_mcp_manager)
+    request: Request,
+    page: int = 1,
+    page_size: int = 10,
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page (page.next_cursor); pass it empty to start cursor pagination, page is then ignored"),
+    mcp_manager_service: McpManagerService = Depends(get_mcp_manager),
 ):
     """Get paginated list of all MCP services."""
     if not UserUtils.is_admin(request):
         return ResponseUtils.error(error_msg=error_msg.NO_PERMISSION)
 
+    next_cursor = None
     try:
         # 获取分页数据
-        try:
-            services, total = mcp_manager_service.get_all_paginated(page=page, page_size=page_size)
-        except AttributeError:
-            # 如果方法不存在，使用非分页方式
-            all_services = mcp_manager_service.get_all()
-            total = len(all_services)
-            start = (page - 1) * page_size
-            end = start + page_size
-            services = all_services[start:end]
+        if cursor is not None:
+            services, total, next_cursor = mcp_manager_service.get_all_by_cursor(cursor=cursor, page_size=page_size)
+        else:
+            try:
+                services, total = mcp_manager_service.get_all_paginated(page=page, page_size=page_size)
+            except AttributeError:
+                # 如果方法不存在，使用非分页方式
+                all_services = mcp_manager_service.get_all()
+                total = len(all_services)
+                start = (page - 1) * page_size
+                end = start + page_size
+                services = all_services[start:end]
         service_list = []
 
         for service in services:
@@ -211,7 +219,11 @@ def get_mcp_service_list(
             }
             service_list.append(service_dict)
 
+        if cursor is not None:
+            return ResponseUtils.success_cursor(data=service_list, page_size=page_size, next_cursor=next_cursor, total=total)
         return ResponseUtils.success_page(data=service_list, page_num=page, page_size=page_size, total=total)
+    except ValueError:
+        return ResponseUtils.error(error_msg=error_msg.INVALID_REQUEST)
     except Exception as e:
         logger.error(f"Failed to get service list: {str(e)}")
         return ResponseUtils.error(error_msg=error_msg.INTERNAL_ERROR)
@@ -1,8 +1,10 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy import table
 from sqlalchemy.orm import Session
 from services.common.database import get_db
 from services.common.utils.response_utils import ResponseUtils
+from services.common import error_msg
 from services.admin_service.services.user_service import UserService
 from services.admin_service.services.user_wallet_history_service import UserWalletHistoryService
 
@@ -21,13 +23,23 @@ def get_user_service(db: Session = Depends(get_db)) -> UserService:
 def get_user_order_list(
     page: int = Query(1, description="Current page number"),
     page_size: int = Query(15, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page (page.next_cursor); pass it empty to start cursor pagination, page is then ignored"),
     user_service: UserService = Depends(get_user_service),
     user_wallet_history_service: UserWalletHistoryService = Depends(get_user_wallet_history_service),
 ):
     """Get paginated list of user order history."""
-    offset = (page - 1) * page_size
-    total, orders = user_wallet_history_service.success_deposit_order_list(offset, page_size)
+    next_cursor = None
+    if cursor is not None:
+        try:
+            total, orders, next_cursor = user_wallet_history_service.success_deposit_order_list_by_cursor(cursor, page_size)
+        except ValueError:
+            return ResponseUtils.error(error_msg=error_msg.INVALID_REQUEST)
+    else:
+        offset = (page - 1) * page_size
+        total, orders = user_wallet_history_service.success_deposit_order_list(offset, page_size)
     if not orders:
+        if cursor is not None:
+            return ResponseUtils.success_cursor(data=[], total=total, page_size=page_size)
         return ResponseUtils.success_page(data=[], total=total, page_num=page, page_size=page_size)
     result = []
     for order in orders:
@@ -51,4 +63,6 @@ def get_user_order_list(
             }
         )
 
+    if cursor is not None:
+        return ResponseUtils.success_cursor(data=result, total=total, page_size=page_size, next_cursor=next_cursor)
     return ResponseUtils.success_page(data=result, total=total, page_num=page, page_size=page_size)
@@ -3,6 +3,7 @@ import json
 from sqlalchemy import false, table
 from sqlalchemy.orm import Session
 from services.common.database import get_db
+from services.common.redis import RedisClient, get_redis_client
 from services.common.utils.response_utils import ResponseUtils
 from services.common.utils.email_utils import EmailUtils
 from services.admin_service.services.sys_config_service import SysConfigService
@@ -16,8 +17,8 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
-def get_sysconfig_service(db: Session = Depends(get_db)) -> SysConfigService:
-    return SysConfigService(db)
+def get_sysconfig_service(db: Session = Depends(get_db), redis: RedisClient = Depends(get_redis_client)) -> SysConfigService:
+    return SysConfigService(db, redis)
 
 
 def get_user_service(db: Session = Depends(get_db)) -> UserService:
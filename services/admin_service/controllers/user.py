@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, Request,Body
+from typing import Optional
+from fastapi import APIRouter, Depends, Request,Body, Query
 from sqlalchemy.orm import Session
 from services.common.database import get_db
 from services.common.utils.response_utils import ResponseUtils
+from services.common import error_msg
 from services.common.response.user_response import UserResponse
 from services.common.response.user_wallet_response import UserWalletResponse
 from services.admin_service.utils.user_utils import UserUtils
 from services.admin_service.services.user_wallet_service import UserWalletService
 from services.admin_service.services.auth_service import AuthService
+from services.admin_service.services.mcp_call_log_service import McpCallLogService
 
 router = APIRouter()
 
@@ -17,6 +20,9 @@ def get_user_wallet(db: Session = Depends(get_db)) -> UserWalletService:
 def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
     return AuthService(db)
 
+def get_mcp_call_log_service(db: Session = Depends(get_db)) -> McpCallLogService:
+    return McpCallLogService(db)
+
 
 @router.get("/info", response_model=dict)
 def get_user(request: Request, user_wallet: UserWalletService = Depends(get_user_wallet)):
@@ -65,3 +71,45 @@ def update_password(
 
     return ResponseUtils.error(message="not found user", code=404)
 
+
+@router.get("/call_history", summary="Get current user call history")
+def get_call_history(
+    request: Request,
+    page: int = Query(1, description="Current page number"),
+    page_size: int = Query(20, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page (page.next_cursor); pass it empty to start cursor pagination, page is then ignored"),
+    mcp_call_log_service: McpCallLogService = Depends(get_mcp_call_log_service),
+):
+    """Get paginated call history of the current user, newest first."""
+    user = UserUtils.get_request_user(request)
+    if not user:
+        return ResponseUtils.error(message="not found user", code=404)
+
+    next_cursor = None
+    if cursor is not None:
+        try:
+            total, records, next_cursor = mcp_call_log_service.get_user_call_history_by_cursor(user.id, cursor, page_size)
+        except ValueError:
+            return ResponseUtils.error(error_msg=error_msg.INVALID_REQUEST)
+    else:
+        total, records = mcp_call_log_service.get_user_call_history(user.id, page, page_size)
+
+    result = [
+        {
+            "id": record.id,
+            "service_id": record.service_id,
+            "tool_name": record.tool_name,
+            "apikey_id": record.apikey_id,
+            "call_success": record.call_success,
+            "unit_price": record.unit_price,
+            "actual_cost": record.actual_cost,
+            "process_status": record.process_status.value if record.process_status else None,
+            "call_start_time": record.call_start_time,
+            "call_end_time": record.call_end_time,
+            "created_at": record.created_at,
+        }
+        for record in records
+    ]
+    if cursor is not None:
+        return ResponseUtils.success_cursor(data=result, total=total, page_size=page_size, next_cursor=next_cursor)
+    return ResponseUtils.success_page(data=result, total=total, page_num=page, page_size=page_size)
@@ -1,3 +1,4 @@
+from typing import Optional
 from fastapi import APIRouter, Query, Body, Request
 from sqlalchemy.orm import Session
 from fastapi import Depends
@@ -7,6 +8,7 @@ from services.common.database import get_db
 from services.common.response.user_manager_response import UserManagerResponse
 from services.common.utils.response_utils import ResponseUtils
 from services.common.utils.validation_utils import ValidationUtils
+from services.common import error_msg
 from services.common.logging_config import get_logger
 import json,hashlib
 from services.admin_service.services.payment_service import PaymentService
@@ -56,6 +58,7 @@ async def delete_user(
 async def get_user_list(
     page: int = Query(1, description="Page number (starts from 1)"),
     page_size: int = Query(15, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page (page.next_cursor); pass it empty to start cursor pagination, page is then ignored"),
     user_service: UserService = Depends(get_user_service),
     user_wallet_service: UserWalletService = Depends(get_user_wallet_service),
 ):
@@ -64,13 +67,19 @@ async def get_user_list(
     # Validate pagination parameters
     validated_page, validated_page_size = ValidationUtils.validate_pagination(page, page_size)
     
-    logger.info(f"Fetching user list - page: {validated_page}, size: {validated_page_size}")
+    logger.info(f"Fetching user list - page: {validated_page}, size: {validated_page_size}, cursor: {cursor}")
     
-    # Calculate offset
-    skip = (validated_page - 1) * validated_page_size
-
     # Get user list - let any exception bubble up to middleware
-    total, users = user_service.get_user_list(skip, validated_page_size)
+    next_cursor = None
+    if cursor is not None:
+        try:
+            total, users, next_cursor = user_service.get_user_list_by_cursor(cursor, validated_page_size)
+        except ValueError:
+            return ResponseUtils.error(error_msg=error_msg.INVALID_REQUEST)
+    else:
+        # Calculate offset
+        skip = (validated_page - 1) * validated_page_size
+        total, users = user_service.get_user_list(skip, validated_page_size)
 
     # Convert user data to list
     user_list = []
@@ -78,6 +87,8 @@ async def get_user_list(
         wallet = user_wallet_service.get_by_user_id(user.id)
         user_list.append({"id": user.id, "email": user.email, "created_at": user.created_at, "balance": wallet.balance if wallet else 0})
 
+    if cursor is not None:
+        return ResponseUtils.success_cursor(data=user_list, total=total, page_size=validated_page_size, next_cursor=next_cursor)
     return ResponseUtils.success_page(data=user_list, total=total, page_num=page, page_size=page_size)
 
 @router.post("/balance/recharge")
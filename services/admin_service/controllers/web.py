@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 from services.common.database import get_db
 from services.common.utils.response_utils import ResponseUtils
 from services.common.utils.validation_utils import ValidationUtils
 from services.admin_service.services.mcp_manager_service import McpManagerService
+from services.admin_service.services.catalog_service import catalog_service
 from services.common.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -16,9 +17,34 @@ def get_mcp_manager(db: Session = Depends(get_db)) -> McpManagerService:
     return McpManagerService(db)
 
 
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the client copy is current according to If-None-Match"""
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+def catalog_response(etag: str, body: Optional[str] = None) -> Response:
+    """
+    Build a catalog response that clients and CDNs revalidate with the ETag
+
+    Args:
+        etag: ETag of the current catalog version
+        body: Serialized response body, None for 304 Not Modified
+
+    Returns:
+        Response: 200 with the body, or 304 without one
+    """
+    headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
+    if body is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/mcp_services", summary="Get public MCP services list")
 def get_public_mcp_services(
+    request: Request,
     keyword: Optional[str] = Query(None, description="Search keyword"),
+    tag: Optional[str] = Query(None, description="Only return services with this tag"),
     page: Optional[int] = Query(1, description="Page number (starts from 1)"),
     page_size: Optional[int] = Query(10, description="Page size (default 10)"),
     mcp_manager_service: McpManagerService = Depends(get_mcp_manager),
@@ -30,12 +56,37 @@ def get_public_mcp_services(
 
     # Set default keyword if not provided
     search_keyword = keyword.strip() if keyword else ""
-
-    logger.info(f"Fetching public MCP services - page: {validated_page}, size: {validated_page_size}, keyword: '{search_keyword}'")
+    search_tag = tag.strip() if tag else ""
+
+    logger.info(f"Fetching public MCP services - page: {validated_page}, size: {validated_page_size}, keyword: '{search_keyword}', tag: '{search_tag}'")
+
+    if search_keyword or search_tag:
+        # Ranked search with tag facets - let any exception bubble up to middleware
+        service_list, total, facets = mcp_manager_service.search_public_services(
+            keyword=search_keyword, tag=search_tag, page=validated_page, page_size=validated_page_size
+        )
+        logger.info(f"Successfully retrieved {len(service_list)} services")
+        response = ResponseUtils.success_page(data=service_list, page_num=validated_page, page_size=validated_page_size, total=total)
+        response["facets"] = {"tags": facets}
+        return response
+
+    # Keyword-less pages are served from the versioned catalog snapshot
+    version = catalog_service.get_version()
+    if version is not None:
+        etag = catalog_service.page_etag(version, validated_page, validated_page_size)
+        if etag_matches(request, etag):
+            return catalog_response(etag)
+        body = catalog_service.get_page(
+            version, validated_page, validated_page_size,
+            lambda: mcp_manager_service.serialize_public_catalog_page(validated_page, validated_page_size),
+        )
+        # Pages past the end have no snapshot, they are answered directly below
+        if body is not None:
+            return catalog_response(etag, body)
 
     # Get service list - let any exception bubble up to middleware
     service_list, total = mcp_manager_service.get_public_services_paginated(
-        keyword=search_keyword, page=validated_page, page_size=validated_page_size
+        keyword="", page=validated_page, page_size=validated_page_size
     )
 
     logger.info(f"Successfully retrieved {len(service_list)} services")
@@ -44,6 +95,7 @@ def get_public_mcp_services(
 
 @router.get("/mcp_service_info", summary="Get public MCP service information")
 def get_public_mcp_service_info(
+    request: Request,
     id: str = Query(..., description="Service ID"),
     mcp_manager_service: McpManagerService = Depends(get_mcp_manager),
 ):
@@ -54,6 +106,16 @@ def get_public_mcp_service_info(
 
     logger.info(f"Fetching public MCP service info for ID: {id}")
 
+    version = catalog_service.get_version()
+    if version is not None:
+        etag = catalog_service.service_etag(version, id)
+        if etag_matches(request, etag):
+            return catalog_response(etag)
+        body = catalog_service.get_service(version, id, lambda: mcp_manager_service.serialize_public_service_info(id))
+        # Validate that service exists
+        ValidationUtils.require_resource_exists(body, "service")
+        return catalog_response(etag, body)
+
     # Get service information - let any exception bubble up to middleware
     service_info = mcp_manager_service.get_public_service_info(id)
 
@@ -3,7 +3,6 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-import threading
 import os
 from contextlib import asynccontextmanager
 
@@ -24,10 +23,11 @@ from services.admin_service.controllers import admin_stats
 from services.admin_service.controllers import user_stats
 from services.admin_service.controllers import email_test
 from services.admin_service.controllers import upload
+from services.admin_service.controllers import billing
 
 
 
-from services.admin_service.consumers.billing_message_consumer import BillingMessageConsumer
+from services.admin_service.consumers.billing_message_consumer import BillingConsumerPool
 from services.admin_service.middleware import AuthMiddleware
 from services.common.middleware.exception_middleware import ExceptionHandlingMiddleware
 from services.common.utils.response_utils import ResponseUtils
@@ -40,48 +40,46 @@ setup_logging("admin_service")
 logger = get_logger(__name__)
 
 # 全局消费者实例
-consumer_instance = None
-consumer_thread = None
+consumer_pool = None
 
 
 def start_billing_consumer():
-    """Start billing consumer in background thread"""
-    global consumer_instance
+    """Start billing consumer lanes in background threads"""
+    global consumer_pool
     try:
         logger.info("Starting billing message consumer...")
-        consumer_instance = BillingMessageConsumer()
-        consumer_instance.start_consuming()
+        consumer_pool = BillingConsumerPool()
+        consumer_pool.start()
     except Exception as e:
         logger.error(f"Failed to start billing consumer: {str(e)}", exc_info=True)
 
 
 def stop_billing_consumer():
     """Stop billing consumer"""
-    global consumer_instance
-    if consumer_instance:
+    if consumer_pool:
         logger.info("Stopping billing message consumer...")
-        consumer_instance.stop_consuming()
+        consumer_pool.stop(timeout=Config.BILLING_CONSUMER_DRAIN_TIMEOUT)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifecycle management"""
-    global consumer_thread
     # start_alipay_order_monitor()
 
-    # Startup: Start consumer in separate thread
+    # Startup: Start consumer lanes in separate threads, unless they run as a standalone process
     logger.info("Admin Service starting...")
-    try:
-        consumer_thread = threading.Thread(target=start_billing_consumer, daemon=True)
-        consumer_thread.start()
+    if Config.BILLING_CONSUMER_EMBEDDED:
+        start_billing_consumer()
         logger.info("Billing message consumer started in background")
-    except Exception as e:
-        logger.error(f"Failed to start billing consumer: {str(e)}")
+    else:
+        logger.info("Embedded billing consumer disabled, expecting a standalone consumer process")
+    start_platform_stats_reconcile()
     
     yield
     
     # Shutdown: Stop consumer
     logger.info("Admin Service shutting down...")
     stop_billing_consumer()
+    stop_platform_stats_reconcile()
     # start_alipay_order_monitor()
 
 
@@ -166,6 +164,7 @@ app.include_router(admin_stats.router, prefix="/api/overview")
 app.include_router(user_stats.router, prefix="/api/stats")
 app.include_router(email_test.router, prefix="/api/email_test")
 app.include_router(upload.router, prefix="/api/upload")
+app.include_router(billing.router, prefix="/api/billing")
 
 # Logging is already configured by setup_logging("admin_service")
 # 创建uploads目录（如果不存在）
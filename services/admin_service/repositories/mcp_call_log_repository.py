@@ -1,8 +1,10 @@
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, List, Tuple
+from typing import Dict, Iterable, Optional, List, Tuple
 from sqlalchemy.orm import Session
 from services.common.models.mcp_call_log import McpCallLog, ProcessStatus
+from services.common.redis_keys import RedisKeys
+from services.common.utils.pagination_utils import PaginationUtils
 
 
 class McpCallLogRepository:
@@ -17,9 +19,21 @@ class McpCallLogRepository:
         self.db.refresh(call_log)
         return call_log
 
+    def add_batch(self, call_logs: List[McpCallLog]) -> None:
+        """Stage call logs in the current transaction, the caller commits"""
+        self.db.add_all(call_logs)
+
     def get_by_id(self, log_id: str) -> Optional[McpCallLog]:
         return self.db.query(McpCallLog).filter(McpCallLog.id == log_id).first()
 
+    def get_status_by_ids(self, log_ids: Iterable[str]) -> Dict[str, ProcessStatus]:
+        """Get process status of the call logs that already exist, in one primary key lookup"""
+        log_ids = list(log_ids)
+        if not log_ids:
+            return {}
+        rows = self.db.query(McpCallLog.id, McpCallLog.process_status).filter(McpCallLog.id.in_(log_ids)).all()
+        return {log_id: status for log_id, status in rows}
+
     def update_status(
         self, log_id: str, status: ProcessStatus, error_msg: Optional[str] = None, wallet_history_id: Optional[str] = None
     ) -> bool:
@@ -41,7 +55,7 @@ class McpCallLogRepository:
         records = (
             self.db.query(McpCallLog)
             .filter(McpCallLog.user_id == user_id)
-            .order_by(McpCallLog.call_start_time.desc())
+            .order_by(McpCallLog.created_at.desc(), McpCallLog.id.desc())
             .offset(offset)
             .limit(page_size)
             .all()
@@ -49,6 +63,28 @@ class McpCallLogRepository:
 
         return total, records
 
+    def get_user_call_history_by_cursor(
+        self, user_id: str, cursor: Optional[str] = None, limit: int = 20
+    ) -> Tuple[int, List[McpCallLog], Optional[str]]:
+        """
+        Get user call history by keyset pagination on (created_at, id)
+
+        Args:
+            user_id: User ID
+            cursor: Cursor of the previous page, empty for the first page
+            limit: Page size
+
+        Returns:
+            Tuple[int, List[McpCallLog], Optional[str]]: (cached total, records, next_cursor)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = self.db.query(McpCallLog).filter(McpCallLog.user_id == user_id)
+        records, next_cursor = PaginationUtils.keyset_page(query, McpCallLog.created_at, McpCallLog.id, cursor, limit)
+        total = PaginationUtils.cached_total(query, RedisKeys.page_total_key(f"call_history:{user_id}"))
+        return total, records, next_cursor
+
     def get_pending_logs(self, limit: int = 100) -> List[McpCallLog]:
         return (
             self.db.query(McpCallLog)
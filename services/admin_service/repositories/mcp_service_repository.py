@@ -1,7 +1,13 @@
 from datetime import datetime, timezone
+from sqlalchemy import func
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.orm import Session
 from services.common.models.mcp_service import McpService
-from typing import Optional, Tuple, List
+from services.common.models.mcp_tool_api import McpToolApi
+from services.common.redis_keys import RedisKeys
+from services.common.utils.pagination_utils import PaginationUtils
+from services.admin_service.utils.platform_counters import platform_counters
+from typing import Optional, Tuple, List, Any
 
 
 class McpServiceRepository:
@@ -23,6 +29,7 @@ class McpServiceRepository:
             return None
         self.db.delete(service)
         self.db.commit()
+        platform_counters.incr_services(-1)
         return service
 
     def update(self, mcp_service: McpService) -> McpService:
@@ -60,10 +67,23 @@ class McpServiceRepository:
 
         total = self.db.query(McpService).count()
 
-        services = self.db.query(McpService).order_by(McpService.created_at.desc()).offset(offset).limit(page_size).all()
+        services = (
+            self.db.query(McpService)
+            .order_by(McpService.created_at.desc(), McpService.id.desc())
+            .offset(offset)
+            .limit(page_size)
+            .all()
+        )
 
         return services, total
 
+    def get_all_by_cursor(self, cursor: Optional[str] = None, page_size: int = 10) -> Tuple[List[McpService], int, Optional[str]]:
+        """Get service list by keyset pagination on (created_at, id), returns (services, cached total, next_cursor)"""
+        query = self.db.query(McpService)
+        services, next_cursor = PaginationUtils.keyset_page(query, McpService.created_at, McpService.id, cursor, page_size)
+        total = PaginationUtils.cached_total(query, RedisKeys.page_total_key("services"))
+        return services, total, next_cursor
+
     def create(self, mcp_service: McpService) -> McpService:
         # Set timestamps explicitly if not already set
         current_time = datetime.now(timezone.utc)
@@ -75,10 +95,13 @@ class McpServiceRepository:
         self.db.add(mcp_service)
         self.db.commit()
         self.db.refresh(mcp_service)
+        platform_counters.incr_services(1)
         return mcp_service
 
-    def get_public_services_paginated(self, keyword: str, page: int = 1, page_size: int = 10) -> Tuple[List[McpService], int]:
-        """Get public service list with pagination, supports keyword search"""
+    def get_public_services_paginated(
+        self, keyword: str, page: int = 1, page_size: int = 10, tag: Optional[str] = None
+    ) -> Tuple[List[McpService], int]:
+        """Get public service list with pagination, supports keyword search and tag filtering"""
         offset = (page - 1) * page_size
 
         query = self.db.query(McpService).filter(McpService.enabled == 1)
@@ -86,9 +109,85 @@ class McpServiceRepository:
         if keyword:
             keyword = f"%{keyword}%"
             query = query.filter((McpService.name.like(keyword)) | (McpService.short_description.like(keyword)))
+        if tag:
+            query = query.filter(self._has_tag(tag))
+
+        total = query.count()
+
+        services = query.order_by(McpService.created_at.desc(), McpService.id.desc()).offset(offset).limit(page_size).all()
+
+        return services, total
+
+    def search_public_services_fulltext(
+        self, keyword: str, tag: Optional[str] = None, page: int = 1, page_size: int = 10
+    ) -> Tuple[List[McpService], int]:
+        """Search public services with the ft_service_search FULLTEXT index, ordered by relevance (newest first without keyword)"""
+        offset = (page - 1) * page_size
+
+        query = self.db.query(McpService).filter(McpService.enabled == 1)
+        order_by = [McpService.created_at.desc(), McpService.id.desc()]
+        if keyword:
+            # MATCH against an empty keyword scores every row 0, so tag-only searches skip it
+            relevance = match(McpService.name, McpService.short_description, McpService.tags, against=keyword).in_natural_language_mode()
+            query = query.filter(relevance > 0)
+            order_by.insert(0, relevance.desc())
+        if tag:
+            query = query.filter(self._has_tag(tag))
 
         total = query.count()
 
-        services = query.order_by(McpService.created_at.desc()).offset(offset).limit(page_size).all()
+        services = query.order_by(*order_by).offset(offset).limit(page_size).all()
 
         return services, total
+
+    @staticmethod
+    def _has_tag(tag: str):
+        """Match a whole tag of the comma-separated tags column, case-insensitively like the search index"""
+        # Drop the spaces around commas, the index strips them from each tag too
+        tags = func.replace(func.replace(McpService.tags, ", ", ","), " ,", ",")
+        return func.find_in_set(tag.strip().lower(), func.lower(tags)) > 0
+
+    def get_by_ids(self, service_ids: List[str]) -> List[McpService]:
+        """Get services by IDs, in no particular order"""
+        if not service_ids:
+            return []
+        return self.db.query(McpService).filter(McpService.id.in_(service_ids)).all()
+
+    def get_search_signatures(self) -> List[Any]:
+        """
+        Get change signatures of enabled services for the search index
+
+        Returns:
+            List[Any]: Rows of (id, updated_at, tool_updated_at, tool_count), tool columns cover enabled APIs
+        """
+        tool_stats = (
+            self.db.query(
+                McpToolApi.service_id,
+                func.max(McpToolApi.updated_at).label("tool_updated_at"),
+                func.count(McpToolApi.id).label("tool_count"),
+            )
+            .filter(McpToolApi.enabled == 1, McpToolApi.is_deleted == 0)
+            .group_by(McpToolApi.service_id)
+            .subquery()
+        )
+        return (
+            self.db.query(McpService.id, McpService.updated_at, tool_stats.c.tool_updated_at, tool_stats.c.tool_count)
+            .outerjoin(tool_stats, tool_stats.c.service_id == McpService.id)
+            .filter(McpService.enabled == 1)
+            .all()
+        )
+
+    def get_search_documents(self, service_ids: List[str]) -> List[Any]:
+        """
+        Get searchable columns of services, without the large text columns
+
+        Returns:
+            List[Any]: Rows of (id, name, short_description, tags, created_at)
+        """
+        if not service_ids:
+            return []
+        return (
+            self.db.query(McpService.id, McpService.name, McpService.short_description, McpService.tags, McpService.created_at)
+            .filter(McpService.id.in_(service_ids))
+            .all()
+        )
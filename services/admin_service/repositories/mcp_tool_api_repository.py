@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from services.common.models.mcp_tool_api import McpToolApi
-from typing import Optional, List
+from typing import Optional, List, Any
 
 
 class McpToolApiRepository:
@@ -38,6 +38,29 @@ class McpToolApiRepository:
             McpToolApi.is_deleted == 0
         ).all()
 
+    def get_enabled_summaries_by_service_ids(self, service_ids: List[str]) -> List[Any]:
+        """
+        Get enabled APIs of several services in one query, without the large text columns
+
+        Args:
+            service_ids: Service IDs
+
+        Returns:
+            List[Any]: Rows of (service_id, id, name, description)
+        """
+        if not service_ids:
+            return []
+        return self.db.query(
+            McpToolApi.service_id,
+            McpToolApi.id,
+            McpToolApi.name,
+            McpToolApi.description,
+        ).filter(
+            McpToolApi.service_id.in_(service_ids),
+            McpToolApi.enabled == 1,
+            McpToolApi.is_deleted == 0
+        ).all()
+
     def get_by_id(self, api_id: str) -> Optional[McpToolApi]:
         """Get single API by API ID"""
         return self.db.query(McpToolApi).filter(
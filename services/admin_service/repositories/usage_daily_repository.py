@@ -0,0 +1,121 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Tuple
+from sqlalchemy import func, select, delete, case, literal_column
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import Session
+from services.common.models.usage_daily import UsageDaily
+from services.common.models.mcp_call_log import McpCallLog
+
+# Rollup key: (stats_day, apikey_id, service_id, user_id)
+UsageKey = Tuple[date, str, str, str]
+
+
+class UsageDailyRepository:
+    """Daily usage rollup repository class"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_increments(self, increments: Dict[UsageKey, Dict]) -> None:
+        """
+        Upsert rollup increments in the current transaction, the caller commits
+
+        Args:
+            increments: Counters to add per rollup key: call_count, success_count, amount, total_latency_ms
+        """
+        if not increments:
+            return
+        rows = [
+            {
+                "stats_day": stats_day,
+                "apikey_id": apikey_id,
+                "service_id": service_id,
+                "user_id": user_id,
+                **counters,
+            }
+            for (stats_day, apikey_id, service_id, user_id), counters in increments.items()
+        ]
+        stmt = insert(UsageDaily)
+        stmt = stmt.on_duplicate_key_update(
+            call_count=UsageDaily.call_count + stmt.inserted.call_count,
+            success_count=UsageDaily.success_count + stmt.inserted.success_count,
+            amount=UsageDaily.amount + stmt.inserted.amount,
+            total_latency_ms=UsageDaily.total_latency_ms + stmt.inserted.total_latency_ms,
+        )
+        self.db.execute(stmt, rows)
+
+    def get_daily_by_apikey(self, apikey_id: str, start_date: date, end_date: date) -> List:
+        """
+        Get per-day totals of an API key, summed over services
+
+        Args:
+            apikey_id: API key ID
+            start_date: First day, inclusive
+            end_date: Last day, inclusive
+
+        Returns:
+            List: Rows of (stats_day, call_count, success_count, amount)
+        """
+        return (
+            self.db.query(
+                UsageDaily.stats_day,
+                func.sum(UsageDaily.call_count).label("call_count"),
+                func.sum(UsageDaily.success_count).label("success_count"),
+                func.sum(UsageDaily.amount).label("amount"),
+            )
+            .filter(
+                UsageDaily.apikey_id == apikey_id,
+                UsageDaily.stats_day >= start_date,
+                UsageDaily.stats_day <= end_date,
+            )
+            .group_by(UsageDaily.stats_day)
+            .all()
+        )
+
+    def rebuild_day(self, stats_day: date) -> int:
+        """
+        Recompute one day of the rollup from mcp_call_log and commit
+
+        The call start time is filtered as a plain range so idx_call_start_time is used.
+
+        Args:
+            stats_day: Day to rebuild
+
+        Returns:
+            int: Number of rollup rows written
+        """
+        day_start = datetime.combine(stats_day, time.min)
+        day_end = day_start + timedelta(days=1)
+        latency_ms = func.coalesce(func.timestampdiff(literal_column("MICROSECOND"), McpCallLog.call_start_time, McpCallLog.call_end_time), 0) / 1000
+        source = (
+            select(
+                func.date(McpCallLog.call_start_time),
+                func.coalesce(McpCallLog.apikey_id, ""),
+                McpCallLog.service_id,
+                McpCallLog.user_id,
+                func.count(McpCallLog.id),
+                func.sum(case((McpCallLog.call_success == True, 1), else_=0)),
+                func.coalesce(func.sum(McpCallLog.unit_price), 0),
+                func.coalesce(func.sum(latency_ms), 0),
+            )
+            .where(McpCallLog.call_start_time >= day_start, McpCallLog.call_start_time < day_end)
+            .group_by(
+                func.date(McpCallLog.call_start_time),
+                func.coalesce(McpCallLog.apikey_id, ""),
+                McpCallLog.service_id,
+                McpCallLog.user_id,
+            )
+        )
+        try:
+            self.db.execute(delete(UsageDaily).where(UsageDaily.stats_day == stats_day))
+            result = self.db.execute(
+                insert(UsageDaily).from_select(
+                    ["stats_day", "apikey_id", "service_id", "user_id", "call_count", "success_count", "amount", "total_latency_ms"],
+                    source,
+                )
+            )
+            self.db.commit()
+            return result.rowcount
+        except Exception:
+            self.db.rollback()
+            raise
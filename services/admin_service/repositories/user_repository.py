@@ -2,6 +2,9 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from typing import Optional, Tuple, List
 from services.common.models.user import User
+from services.common.redis_keys import RedisKeys
+from services.common.utils.pagination_utils import PaginationUtils
+from services.admin_service.utils.platform_counters import platform_counters
 
 
 class UserRepository:
@@ -46,6 +49,8 @@ class UserRepository:
         self.db.add(user)
         self.db.commit()
         self.db.refresh(user)
+        if role_id != 1:
+            platform_counters.incr_users(1)
         return user
 
     def create_google_user(self, email: str, name: str, google_id: str, role_id: int = 2) -> Optional[User]:
@@ -66,23 +71,42 @@ class UserRepository:
         self.db.add(user)
         self.db.commit()
         self.db.refresh(user)
+        if role_id != 1:
+            platform_counters.incr_users(1)
         return user
 
     def delete(self, user_id: str) -> Optional[User]:
         user = self.get_by_id(user_id)
         if not user:
             return None
+        counted = user.is_deleted == 0 and user.role_id != 1
         user.is_deleted = 1
         self.db.commit()
         self.db.refresh(user)
+        if counted:
+            platform_counters.incr_users(-1)
         return user
 
     def get_user_list(self, offset: int, limit: int) -> Tuple[int, List[User]]:
         total = self.db.query(User).filter(User.is_deleted == 0, User.role_id == 2).count()
 
-        users = self.db.query(User).filter(User.is_deleted == 0, User.role_id == 2).offset(offset).limit(limit).all()
+        users = (
+            self.db.query(User)
+            .filter(User.is_deleted == 0, User.role_id == 2)
+            .order_by(User.created_at.desc(), User.id.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
         return total, users
 
+    def get_user_list_by_cursor(self, cursor: Optional[str], limit: int) -> Tuple[int, List[User], Optional[str]]:
+        """Get user list by keyset pagination on (created_at, id), returns (cached total, users, next_cursor)"""
+        query = self.db.query(User).filter(User.is_deleted == 0, User.role_id == 2)
+        users, next_cursor = PaginationUtils.keyset_page(query, User.created_at, User.id, cursor, limit)
+        total = PaginationUtils.cached_total(query, RedisKeys.page_total_key("users"))
+        return total, users, next_cursor
+
     def get_admin_user(self) -> Optional[User]:
         return self.db.query(User).filter(User.role_id == 1, User.is_deleted == 0).first()
 
@@ -6,6 +6,9 @@ from services.common.models.user_wallet import UserWallet
 from services.common.models.user_wallet_history import TransactionType, PaymentMethod
 from uuid import uuid4
 from datetime import datetime, timezone
+from services.admin_service.utils.platform_counters import platform_counters
+from services.common.redis_keys import RedisKeys
+from services.common.utils.pagination_utils import PaginationUtils
 
 class UserWalletHistoryRepository:
     """
@@ -206,6 +209,7 @@ class UserWalletHistoryRepository:
             obj.transaction_id = transaction_id
 
             self.db.commit()
+            platform_counters.incr_balance(obj.amount)
             self.logging.info(f"Deposit completed successfully: id={id}, amount={obj.amount}, new_balance={wallet.balance}")
             return True
 
@@ -234,13 +238,39 @@ class UserWalletHistoryRepository:
             return total, []
         history = (
             query
-            .order_by(UserWalletHistory.created_at.desc())
+            .order_by(UserWalletHistory.created_at.desc(), UserWalletHistory.id.desc())
             .offset(offset)
             .limit(limit)
             .all()
         )
         return total, history
 
+    def success_deposit_order_list_by_cursor(
+        self, cursor: Optional[str], limit: int
+    ) -> Tuple[int, List[UserWalletHistory], Optional[str]]:
+        """
+        Get list of successful orders by keyset pagination on (created_at, id).
+
+        Args:
+            cursor: Cursor of the previous page, empty for the first page
+            limit: Limit for pagination
+
+        Returns:
+            tuple: (cached_total_count, order_list, next_cursor)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = self.db.query(UserWalletHistory).filter(
+            UserWalletHistory.status == 1,
+            UserWalletHistory.type == TransactionType.DEPOSIT,
+        )
+        history, next_cursor = PaginationUtils.keyset_page(
+            query, UserWalletHistory.created_at, UserWalletHistory.id, cursor, limit
+        )
+        total = PaginationUtils.cached_total(query, RedisKeys.page_total_key("deposit_orders"))
+        return total, history, next_cursor
+
     def get_by_id(self, history_id: str) -> Optional[UserWalletHistory]:
         """
         Get user wallet history record by ID.
@@ -275,6 +305,15 @@ class UserWalletHistoryRepository:
             self.db.rollback()
             return None
 
+    def add_consume_records_batch(self, histories: List[UserWalletHistory]) -> None:
+        """
+        Stage consume records in the current transaction, the caller commits.
+
+        Args:
+            histories: Wallet history record objects
+        """
+        self.db.add_all(histories)
+
     def order_list(self, payment_method: str, status: int, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[UserWalletHistory]:
         """
         Get list of orders based on filters.
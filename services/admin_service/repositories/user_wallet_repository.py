@@ -1,10 +1,12 @@
 import uuid
 import secrets
 from datetime import datetime, timezone
+from decimal import Decimal
 from typing import Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from services.common.models.user_wallet import UserWallet
+from services.admin_service.utils.platform_counters import platform_counters
 
 
 class UserWalletRepository:
@@ -32,13 +34,42 @@ class UserWalletRepository:
         """Get user wallet with row-level lock for update"""
         return self.db.query(UserWallet).filter(UserWallet.user_id == user_id).with_for_update().first()
 
+    def decrement_balance(self, user_id: str, amount: Decimal) -> Optional[Decimal]:
+        """
+        Atomically deduct amount if the balance covers it.
+
+        Runs a single conditional UPDATE, then reads back the new balance from
+        the row the UPDATE has locked. Does not commit, so the caller can write
+        related records in the same transaction.
+
+        Args:
+            user_id: User ID
+            amount: Amount to deduct
+
+        Returns:
+            Optional[Decimal]: New balance, None if the wallet does not exist or the balance is insufficient
+        """
+        updated_rows = self.db.query(UserWallet).filter(
+            UserWallet.user_id == user_id,
+            UserWallet.balance >= amount
+        ).update({
+            "balance": UserWallet.balance - amount,
+            "updated_at": datetime.now(timezone.utc)
+        }, synchronize_session=False)
+        if updated_rows == 0:
+            return None
+        balance = self.db.query(UserWallet.balance).filter(UserWallet.user_id == user_id).scalar()
+        return Decimal(str(balance))
+
     def update_balance(self, user_id: str, new_balance: float) -> bool:
         """Update user balance"""
         wallet = self.get_by_user_id(user_id)
         if wallet:
+            old_balance = wallet.balance
             wallet.balance = new_balance
             wallet.updated_at = datetime.now(timezone.utc)
             self.db.commit()
+            platform_counters.incr_balance(Decimal(str(new_balance)) - Decimal(str(old_balance)))
             return True
         return False
 
@@ -66,6 +97,8 @@ class UserWalletRepository:
             
             # Commit the transaction and check if any row was updated
             self.db.commit()
+            if updated_rows > 0:
+                platform_counters.incr_balance(Decimal(str(new_balance)) - Decimal(str(expected_balance)))
             return updated_rows > 0
             
         except Exception as e:
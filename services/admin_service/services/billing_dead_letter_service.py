@@ -0,0 +1,140 @@
+"""
+Billing dead-letter service - Inspect and replay billing messages that exhausted their retries
+"""
+
+import json
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+import pika
+from services.common.config import Config
+from services.common.utils.billing_queue_utils import BillingQueueUtils
+
+logger = logging.getLogger(__name__)
+
+
+class BillingDeadLetterService:
+    """Billing dead-letter queue operations, each on a short-lived RabbitMQ connection"""
+
+    @contextmanager
+    def _channel(self):
+        """Open a confirm-mode channel, unacked messages are requeued when it closes"""
+        credentials = pika.PlainCredentials(Config.RABBITMQ_USER, Config.RABBITMQ_PASSWORD)
+        parameters = pika.ConnectionParameters(
+            host=Config.RABBITMQ_HOST,
+            port=Config.RABBITMQ_PORT,
+            virtual_host=Config.RABBITMQ_VHOST,
+            credentials=credentials,
+            blocked_connection_timeout=30,
+        )
+        connection = pika.BlockingConnection(parameters)
+        try:
+            channel = connection.channel()
+            channel.confirm_delivery()
+            yield channel
+        finally:
+            if not connection.is_closed:
+                connection.close()
+
+    def _resolve_queues(self, queue: Optional[str]) -> List[str]:
+        """Resolve dead-letter queues, all of them when queue is not given"""
+        dead_letter_queues = [BillingQueueUtils.dead_letter_queue(name) for name in BillingQueueUtils.all_consumer_queues()]
+        if queue is None:
+            return dead_letter_queues
+        if queue not in dead_letter_queues:
+            raise ValueError(f"Unknown billing dead-letter queue: {queue}")
+        return [queue]
+
+    def get_stats(self) -> List[Dict]:
+        """
+        Get message count of each dead-letter queue
+
+        Returns:
+            List[Dict]: Queue name and message count
+        """
+        stats = []
+        with self._channel() as channel:
+            for queue in self._resolve_queues(None):
+                result = channel.queue_declare(queue=queue, durable=True)
+                stats.append({"queue": queue, "message_count": result.method.message_count})
+        return stats
+
+    def list_messages(self, queue: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """
+        Peek dead-lettered messages without removing them
+
+        Messages are fetched without ack and requeued when the channel closes.
+
+        Args:
+            queue: Dead-letter queue, all queues when None
+            limit: Max number of messages to return
+
+        Returns:
+            List[Dict]: Messages with their failure headers
+        """
+        messages = []
+        with self._channel() as channel:
+            for dead_letter_queue in self._resolve_queues(queue):
+                channel.queue_declare(queue=dead_letter_queue, durable=True)
+                while len(messages) < limit:
+                    method, properties, body = channel.basic_get(queue=dead_letter_queue, auto_ack=False)
+                    if method is None:
+                        break
+                    headers = properties.headers or {}
+                    try:
+                        payload = json.loads(body)
+                    except (ValueError, UnicodeDecodeError):
+                        payload = body.decode("utf-8", errors="replace")
+                    messages.append({
+                        "queue": dead_letter_queue,
+                        "retry_count": headers.get("x-retry-count", 0),
+                        "last_error": headers.get("x-last-error"),
+                        "dead_lettered_at": headers.get("x-dead-lettered-at"),
+                        "message": payload,
+                    })
+                if len(messages) >= limit:
+                    break
+        return messages
+
+    def replay(self, queue: Optional[str] = None, limit: int = 1000) -> Dict[str, int]:
+        """
+        Move dead-lettered messages back to their source queue with a fresh retry budget
+
+        Each message is acked only after the broker confirmed its republish.
+
+        Args:
+            queue: Dead-letter queue, all queues when None
+            limit: Max number of messages to replay
+
+        Returns:
+            Dict[str, int]: Replayed count per dead-letter queue
+        """
+        replayed = {}
+        total = 0
+        with self._channel() as channel:
+            for dead_letter_queue in self._resolve_queues(queue):
+                channel.queue_declare(queue=dead_letter_queue, durable=True)
+                count = 0
+                while total < limit:
+                    method, properties, body = channel.basic_get(queue=dead_letter_queue, auto_ack=False)
+                    if method is None:
+                        break
+                    headers = dict(properties.headers or {})
+                    target = headers.pop("x-original-queue", None) or BillingQueueUtils.source_queue(dead_letter_queue)
+                    for key in ("x-retry-count", "x-last-error", "x-dead-lettered-at", "x-death"):
+                        headers.pop(key, None)
+                    channel.basic_publish(
+                        exchange="",
+                        routing_key=target,
+                        body=body,
+                        properties=pika.BasicProperties(delivery_mode=2, headers=headers or None),
+                    )
+                    channel.basic_ack(delivery_tag=method.delivery_tag)
+                    count += 1
+                    total += 1
+                replayed[dead_letter_queue] = count
+                if count:
+                    logger.info(f"Replayed {count} billing messages from {dead_letter_queue}")
+                if total >= limit:
+                    break
+        return replayed
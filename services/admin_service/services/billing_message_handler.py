@@ -7,7 +7,7 @@ import uuid
 import logging
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, List, Dict
 from sqlalchemy.orm import Session
 
 from services.common.models.billing import BillingMessage
@@ -16,7 +16,10 @@ from services.common.models.user_wallet_history import UserWalletHistory, Transa
 from services.admin_service.repositories.mcp_call_log_repository import McpCallLogRepository
 from services.admin_service.repositories.user_wallet_repository import UserWalletRepository
 from services.admin_service.repositories.user_wallet_history_repository import UserWalletHistoryRepository
+from services.admin_service.repositories.usage_daily_repository import UsageDailyRepository, UsageKey
 from services.common.redis import redis_client
+from services.common.utils.wallet_cache_utils import WalletCacheUtils, REBUILD_BALANCE_SCRIPT
+from services.admin_service.utils.platform_counters import platform_counters
 
 logger = logging.getLogger(__name__)
 
@@ -29,17 +32,23 @@ class BillingMessageHandler:
         self.call_log_repo = McpCallLogRepository(db)
         self.wallet_repo = UserWalletRepository(db)
         self.wallet_history_repo = UserWalletHistoryRepository(db)
+        self.usage_daily_repo = UsageDailyRepository(db)
         self.redis = redis_client
+        self._rebuild_balance_script = self.redis.client.register_script(REBUILD_BALANCE_SCRIPT)
 
     def process_billing_message(self, message_data: dict) -> bool:
         """
         Process billing message
 
+        Business failures (missing wallet, insufficient balance) are final: the
+        call log is marked failed and the message is done, as in the batch path.
+        Only transient errors leave the call log pending for a retry.
+
         Args:
             message_data: Message data
 
         Returns:
-            bool: Whether processing was successful
+            bool: Whether the message is done (processed or failed), False to retry it
         """
         try:
             # Parse message
@@ -47,28 +56,206 @@ class BillingMessageHandler:
             if not billing_message:
                 return False
 
-            # Create API call log
-            call_log_id = self._create_call_log(billing_message)
+            # The call ID is the call log primary key, so a redelivered message is detected here.
+            # Processed and failed calls are final, only pending ones are resumed.
+            existing = self.call_log_repo.get_by_id(billing_message.call_log_id)
+            if existing and existing.process_status != ProcessStatus.PENDING:
+                logger.info(f"Duplicate billing message skipped - Call ID: {billing_message.call_log_id}")
+                return True
+
+            # Create API call log, or resume one that was created but never charged
+            call_log_id = existing.id if existing else self._create_call_log(billing_message)
             if not call_log_id:
                 return False
 
-            # Process billing logic
+            # Usage rollup is committed together with the final call log status
+            self.usage_daily_repo.add_increments(self._build_usage_increments([billing_message]))
+
+            # Process billing logic, exceptions leave the call log pending for the retry
             if billing_message.call_success and billing_message.unit_price > 0:
-                success = self._process_billing(billing_message, call_log_id)
-                if not success:
-                    # Update record status to failed
+                # A successful charge already committed the processed status with the deduction
+                if not self._process_billing(billing_message, call_log_id):
+                    # The failed deduction was rolled back with the rollup increment, stage it again
+                    self.usage_daily_repo.add_increments(self._build_usage_increments([billing_message]))
+                    # Update record status to failed, the call is not charged
                     self.call_log_repo.update_status(call_log_id, ProcessStatus.FAILED, "Billing processing failed")
-                    return False
-
-            # Update record status to processed
-            self.call_log_repo.update_status(call_log_id, ProcessStatus.PROCESSED)
+            else:
+                # Update record status to processed
+                self.call_log_repo.update_status(call_log_id, ProcessStatus.PROCESSED)
+            platform_counters.incr_calls(self._count_calls_by_day([billing_message]))
             logger.info(f"Billing message processed successfully - User ID: {billing_message.user_id}, Tool: {billing_message.tool_name}")
             return True
 
         except Exception as e:
             logger.error(f"Failed to process billing message: {str(e)}", exc_info=True)
+            # Nothing of this attempt is kept, the call log stays pending for the retry
+            self.db.rollback()
             return False
 
+    def process_billing_batch(self, messages_data: List[dict]) -> None:
+        """
+        Process a batch of billing messages in a single transaction
+
+        All call logs and wallet history rows are built in memory, each user's
+        charges are applied with one atomic decrement, and the whole batch is
+        committed together. Any exception rolls the batch back and is re-raised,
+        so the caller can fall back to per-message processing.
+
+        Messages whose call ID was already processed or failed are skipped, so
+        redelivered messages are never charged twice. Pending call logs are
+        resumed one by one after the batch.
+
+        Args:
+            messages_data: Message data list
+        """
+        now = datetime.now(timezone.utc)
+        parsed: Dict[str, BillingMessage] = {}
+        parsed_count = 0
+        for message_data in messages_data:
+            billing_message = self._parse_message(message_data)
+            if billing_message:
+                parsed_count += 1
+                # Duplicates within the batch collapse onto the same call ID
+                parsed.setdefault(billing_message.call_log_id, billing_message)
+
+        existing = self.call_log_repo.get_status_by_ids(parsed.keys())
+        billing_messages = [billing_message for call_log_id, billing_message in parsed.items() if call_log_id not in existing]
+        # Call logs created but never charged are resumed one by one after the batch
+        resumed = [parsed[call_log_id] for call_log_id, status in existing.items() if status == ProcessStatus.PENDING]
+        duplicates = parsed_count - len(billing_messages) - len(resumed)
+        if duplicates:
+            logger.info(f"Skipped {duplicates} duplicate billing messages")
+        if not billing_messages:
+            self._resume_call_logs(resumed)
+            return
+
+        try:
+            call_logs = []
+            histories = []
+            charges: Dict[str, List] = {}
+            for billing_message in billing_messages:
+                call_log = self._build_call_log(billing_message)
+                call_log.process_status = ProcessStatus.PROCESSED
+                call_logs.append(call_log)
+                if billing_message.call_success and billing_message.unit_price > 0:
+                    charges.setdefault(billing_message.user_id, []).append((billing_message, call_log))
+
+            balances: Dict[str, Decimal] = {}
+            # Sorted user order keeps row lock acquisition consistent across consumers
+            for user_id in sorted(charges):
+                balance = self._apply_user_charges(user_id, charges[user_id], histories, now)
+                if balance is not None:
+                    balances[user_id] = balance
+
+            self.call_log_repo.add_batch(call_logs)
+            self.wallet_history_repo.add_consume_records_batch(histories)
+            self.usage_daily_repo.add_increments(self._build_usage_increments(billing_messages))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        platform_counters.incr_calls(self._count_calls_by_day(billing_messages))
+        platform_counters.incr_balance(sum(Decimal(str(history.amount)) for history in histories))
+
+        for user_id, balance in balances.items():
+            self._update_wallet_cache(user_id, balance)
+        self._resume_call_logs(resumed)
+        logger.info(f"Billing batch processed - Messages: {len(billing_messages)}, Charged: {len(histories)}, Users: {len(charges)}")
+
+    def _resume_call_logs(self, billing_messages: List[BillingMessage]) -> None:
+        """
+        Finish call logs that were created but never charged
+
+        Raises when one fails; the caller's per-message fallback is safe because
+        everything already committed is skipped as a duplicate.
+        """
+        for billing_message in billing_messages:
+            if not self.process_billing_message(self._billing_message_to_dict(billing_message)):
+                raise Exception(f"Failed to resume billing call log {billing_message.call_log_id}")
+
+    def _apply_user_charges(self, user_id: str, items: List, histories: List[UserWalletHistory], now: datetime) -> Optional[Decimal]:
+        """
+        Apply one user's charges of a batch within the current transaction
+
+        The common case is a single atomic decrement of the total. When the
+        balance does not cover the total, the wallet row is locked and the
+        charges are applied one by one, failing the ones that no longer fit.
+
+        Args:
+            user_id: User ID
+            items: (billing_message, call_log) pairs to charge
+            histories: Output list for created wallet history rows
+            now: Batch timestamp
+
+        Returns:
+            Optional[Decimal]: Final balance, None if the wallet does not exist
+        """
+        total = sum((billing_message.unit_price for billing_message, _ in items), Decimal("0"))
+        new_balance = self.wallet_repo.decrement_balance(user_id, total)
+        if new_balance is not None:
+            balance = new_balance + total
+            for billing_message, call_log in items:
+                balance -= billing_message.unit_price
+                self._attach_history(billing_message, call_log, balance, histories, now)
+            return new_balance
+
+        wallet = self.wallet_repo.get_by_user_id_with_lock(user_id)
+        if not wallet:
+            logger.error(f"User wallet not found - User ID: {user_id}")
+            for _, call_log in items:
+                call_log.process_status = ProcessStatus.FAILED
+                call_log.error_msg = "Billing processing failed"
+            return None
+
+        balance = Decimal(str(wallet.balance))
+        for billing_message, call_log in items:
+            amount = billing_message.unit_price
+            if balance < amount:
+                logger.warning(f"Insufficient balance for billing - User ID: {user_id}, Balance: {balance}, Required: {amount}")
+                call_log.process_status = ProcessStatus.FAILED
+                call_log.error_msg = "Billing processing failed"
+                continue
+            balance -= amount
+            self._attach_history(billing_message, call_log, balance, histories, now)
+        wallet.balance = float(balance)
+        wallet.updated_at = now
+        return balance
+
+    def _count_calls_by_day(self, billing_messages: List[BillingMessage]) -> Dict:
+        """Count calls per call day"""
+        calls_by_day: Dict = {}
+        for billing_message in billing_messages:
+            stats_day = billing_message.call_start_time.date()
+            calls_by_day[stats_day] = calls_by_day.get(stats_day, 0) + 1
+        return calls_by_day
+
+    def _build_usage_increments(self, billing_messages: List[BillingMessage]) -> Dict[UsageKey, Dict]:
+        """Aggregate billing messages into daily usage rollup increments"""
+        increments: Dict[UsageKey, Dict] = {}
+        for billing_message in billing_messages:
+            key = (
+                billing_message.call_start_time.date(),
+                billing_message.apikey_id or "",
+                billing_message.service_id,
+                billing_message.user_id,
+            )
+            counters = increments.setdefault(key, {"call_count": 0, "success_count": 0, "amount": Decimal("0"), "total_latency_ms": 0})
+            counters["call_count"] += 1
+            if billing_message.call_success:
+                counters["success_count"] += 1
+            counters["amount"] += billing_message.unit_price
+            if billing_message.call_end_time:
+                latency = billing_message.call_end_time - billing_message.call_start_time
+                counters["total_latency_ms"] += max(0, int(latency.total_seconds() * 1000))
+        return increments
+
+    def _attach_history(self, billing_message: BillingMessage, call_log: McpCallLog, balance_after: Decimal, histories: List[UserWalletHistory], now: datetime) -> None:
+        """Create deduction record for a charged call and link it to the call log"""
+        history = self._build_wallet_history(billing_message, call_log.id, balance_after, now)
+        call_log.wallet_history_id = history.id
+        histories.append(history)
+
     def _parse_message(self, message_data: dict) -> Optional[BillingMessage]:
         """
         Parse RabbitMQ message
@@ -98,6 +285,8 @@ class BillingMessageHandler:
                 charge_type=message_data["charge_type"],
                 call_start_time=call_start_time,
                 call_end_time=call_end_time,
+                # api_id has always been the per-call ID, older messages carry no call_log_id
+                call_log_id=message_data.get("call_log_id") or message_data["api_id"],
                 apikey_id=message_data.get("apikey_id"),  # Support older version messages that don't have this field
             )
         except (KeyError, ValueError, TypeError) as e:
@@ -115,23 +304,7 @@ class BillingMessageHandler:
             Optional[str]: Created record ID
         """
         try:
-            log_id = str(uuid.uuid4())
-            call_log = McpCallLog(
-                id=log_id,
-                user_id=billing_message.user_id,
-                service_id=billing_message.service_id,
-                api_id=billing_message.api_id,
-                tool_name=billing_message.tool_name,
-                input_params=billing_message.input_params,
-                call_success=billing_message.call_success,
-                unit_price=float(billing_message.unit_price),
-                actual_cost=0.0,  # Initially 0, updated later
-                call_start_time=billing_message.call_start_time,
-                call_end_time=billing_message.call_end_time,
-                process_status=ProcessStatus.PENDING,
-                apikey_id=billing_message.apikey_id,
-            )
-
+            call_log = self._build_call_log(billing_message)
             created_log = self.call_log_repo.create(call_log)
             return created_log.id
 
@@ -139,6 +312,41 @@ class BillingMessageHandler:
             logger.error(f"Failed to create API call log record: {str(e)}")
             return None
 
+    def _build_call_log(self, billing_message: BillingMessage) -> McpCallLog:
+        """Build pending API call log record from billing message"""
+        return McpCallLog(
+            id=billing_message.call_log_id or str(uuid.uuid4()),
+            user_id=billing_message.user_id,
+            service_id=billing_message.service_id,
+            api_id=billing_message.api_id,
+            tool_name=billing_message.tool_name,
+            input_params=billing_message.input_params,
+            call_success=billing_message.call_success,
+            unit_price=float(billing_message.unit_price),
+            actual_cost=0.0,  # Initially 0, updated later
+            call_start_time=billing_message.call_start_time,
+            call_end_time=billing_message.call_end_time,
+            process_status=ProcessStatus.PENDING,
+            apikey_id=billing_message.apikey_id,
+        )
+
+    def _build_wallet_history(self, billing_message: BillingMessage, call_log_id: str, balance_after: Decimal, now: datetime) -> UserWalletHistory:
+        """Build API call deduction record"""
+        return UserWalletHistory(
+            id=str(uuid.uuid4()),
+            user_id=billing_message.user_id,
+            payment_method=PaymentMethod.PLATFORM,
+            amount=float(-billing_message.unit_price),  # Negative value indicates deduction
+            balance_after=float(balance_after),
+            type=TransactionType.API_CALL,
+            status=1,  # Completed
+            transaction_id=call_log_id,
+            channel_user_id=None,
+            callback_data=json.dumps(self._billing_message_to_dict(billing_message)),
+            created_at=now,
+            updated_at=now,
+        )
+
     def _process_billing(self, billing_message: BillingMessage, call_log_id: str) -> bool:
         """
         Process actual billing logic
@@ -148,85 +356,66 @@ class BillingMessageHandler:
             call_log_id: Call log ID
 
         Returns:
-            bool: Whether processing was successful
+            bool: Whether processing was successful, False for business failures (insufficient balance, missing wallet)
+
+        Raises:
+            Exception: Database and other transient errors, after rolling back the deduction
         """
         try:
             user_id = billing_message.user_id
             amount = billing_message.unit_price
 
-            # Get user wallet
-            wallet = self.wallet_repo.get_by_user_id(user_id)
-            if not wallet:
-                logger.error(f"User wallet not found - User ID: {user_id}")
-                return False
-
-            current_balance = Decimal(str(wallet.balance))
-
-            # Check if balance is sufficient (theoretically already pre-deducted, but check again to ensure data consistency)
-            if current_balance < amount:
-                logger.warning(f"Insufficient balance for billing - User ID: {user_id}, Balance: {current_balance}, Required: {amount}")
-                return False
-
-            # Execute deduction
-            new_balance = current_balance - amount
-            success = self.wallet_repo.update_balance(user_id, float(new_balance))
-            if not success:
-                logger.error(f"Failed to update user wallet balance - User ID: {user_id}")
+            # Deduct atomically; the check also guarantees data consistency with the pre-deduction
+            new_balance = self.wallet_repo.decrement_balance(user_id, amount)
+            if new_balance is None:
+                self.db.rollback()
+                if not self.wallet_repo.get_by_user_id(user_id):
+                    logger.error(f"User wallet not found - User ID: {user_id}")
+                else:
+                    logger.warning(f"Insufficient balance for billing - User ID: {user_id}, Required: {amount}")
                 return False
 
-            # Create wallet change history record
-            history_id = str(uuid.uuid4())
+            # Create wallet change history record in the same transaction
             now = datetime.now(timezone.utc)
-            wallet_history = UserWalletHistory(
-                id=history_id,
-                user_id=user_id,
-                payment_method=PaymentMethod.PLATFORM,
-                amount=float(-amount),  # Negative value indicates deduction
-                balance_after=float(new_balance),
-                type=TransactionType.API_CALL,
-                status=1,  # Completed
-                transaction_id=call_log_id,
-                channel_user_id=None,
-                callback_data=json.dumps(self._billing_message_to_dict(billing_message)),
-                created_at=now,
-                updated_at=now,
-            )
-
-            created_history = self.wallet_history_repo.add_consume_record(wallet_history)
-            if not created_history:
-                logger.error(f"Failed to create wallet history record - User ID: {user_id}")
-                # Rollback balance update
-                self.wallet_repo.update_balance(user_id, float(current_balance))
-                return False
+            wallet_history = self._build_wallet_history(billing_message, call_log_id, new_balance, now)
+            history_id = wallet_history.id
+            self.wallet_history_repo.add_consume_records_batch([wallet_history])
 
-            logger.info(f"Wallet history record created successfully - User ID: {user_id}, History ID: {history_id}, Created at: {now}")
-
-            # Update API call record's actual deduction amount and associated history record ID
+            # Link the call record to the history record, committing deduction and history together
             self.call_log_repo.update_status(call_log_id, ProcessStatus.PROCESSED, None, history_id)
+            logger.info(f"Wallet history record created successfully - User ID: {user_id}, History ID: {history_id}, Created at: {now}")
 
             # Update wallet balance cache in Redis
             self._update_wallet_cache(user_id, new_balance)
+            platform_counters.incr_balance(-amount)
 
             logger.info(
-                f"Billing processing completed successfully - User ID: {user_id}, Amount deducted: {amount}, Balance: {current_balance} -> {new_balance}"
+                f"Billing processing completed successfully - User ID: {user_id}, Amount deducted: {amount}, Balance: {new_balance}"
             )
             return True
 
         except Exception as e:
             logger.error(f"Billing processing failed - User ID: {billing_message.user_id}: {str(e)}", exc_info=True)
-            return False
+            # Discard the uncommitted deduction, the caller keeps the call log pending so the retry charges it
+            self.db.rollback()
+            raise
 
     def _update_wallet_cache(self, user_id: str, new_balance: Decimal) -> None:
         """
         Update wallet balance cache in Redis
 
+        The amounts still reserved by the user's calls in flight stay deducted,
+        so settling those calls refunds onto a balance that includes them.
+
         Args:
             user_id: User ID
             new_balance: New balance
         """
         try:
-            cache_key = f"wallet:balance:{user_id}"
-            self.redis.set(cache_key, str(new_balance), ex=300)  # 5 minutes expiration
+            self._rebuild_balance_script(
+                keys=WalletCacheUtils.rebuild_keys(user_id),
+                args=WalletCacheUtils.rebuild_args(new_balance, 300, keep_cached=False),  # 5 minutes expiration
+            )
         except Exception as e:
             logger.warning(f"Failed to update wallet cache - User ID: {user_id}: {str(e)}")
             # Cache update failure doesn't affect main flow
@@ -0,0 +1,258 @@
+"""
+Catalog search service - In-process inverted index over the public marketplace
+"""
+
+import bisect
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from services.common.config import Config
+from services.common.logging_config import get_logger
+from services.admin_service.repositories.mcp_service_repository import McpServiceRepository
+from services.admin_service.repositories.mcp_tool_api_repository import McpToolApiRepository
+from services.admin_service.services.catalog_service import catalog_service
+
+logger = get_logger(__name__)
+
+# Weight of a term by the field it appears in
+NAME_WEIGHT = 8.0
+TAG_WEIGHT = 5.0
+SHORT_DESCRIPTION_WEIGHT = 3.0
+TOOL_NAME_WEIGHT = 2.0
+TOOL_DESCRIPTION_WEIGHT = 1.0
+
+# Score factor of a prefix match relative to an exact term match
+PREFIX_MATCH_FACTOR = 0.5
+# Shorter query terms only match exactly, prefixes that short would hit most of the index
+MIN_PREFIX_LENGTH = 2
+MAX_TAG_FACETS = 20
+
+# Latin words and digits, CJK characters one by one
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase search terms"""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def split_tags(tags: Optional[str]) -> List[str]:
+    """Split the comma-separated tags column"""
+    if not tags:
+        return []
+    return [tag.strip() for tag in tags.split(",") if tag.strip()]
+
+
+@dataclass
+class SearchDocument:
+    """Indexed state of one enabled service"""
+
+    signature: Tuple
+    created_at: float
+    tags: List[str]
+    terms: Dict[str, float] = field(default_factory=dict)
+
+
+class CatalogSearchService:
+    """
+    Keyword search over enabled services and their enabled tool APIs
+
+    Each admin worker keeps its own index. A search first compares the catalog
+    version with the one the index was synced at; after a catalog write, one
+    light query returns a change signature per service, and only new or changed
+    services are re-read. Query terms must all match (exact or, from
+    MIN_PREFIX_LENGTH characters, as a prefix). Results are ranked by field
+    weights, then by creation time. When the index cannot be used, callers fall
+    back to the MySQL FULLTEXT search.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._documents: Dict[str, SearchDocument] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._sorted_terms: List[str] = []
+        self._synced_version: Optional[int] = None
+        self._synced_at = 0.0
+        self._rebuilt_at = 0.0
+
+    def search(
+        self, db: Session, keyword: str, tag: Optional[str] = None, offset: int = 0, limit: int = 10
+    ) -> Tuple[List[str], int, Dict[str, int]]:
+        """
+        Search enabled services
+
+        Args:
+            db: Database session, used to sync the index with the catalog
+            keyword: Search keyword, empty to match every service
+            tag: Only return services with this tag (case-insensitive)
+            offset: Offset of the first result
+            limit: Max number of results
+
+        Returns:
+            Tuple[List[str], int, Dict[str, int]]: (service IDs of the page in rank order, total, tag facets of the keyword matches)
+        """
+        self._sync(db)
+        query_terms = list(dict.fromkeys(tokenize(keyword)))
+        with self._lock:
+            scores = self._score(query_terms)
+            facets = Counter(tag_value for service_id in scores for tag_value in self._documents[service_id].tags)
+            if tag:
+                tag_lower = tag.strip().lower()
+                scores = {
+                    service_id: score
+                    for service_id, score in scores.items()
+                    if any(tag_value.lower() == tag_lower for tag_value in self._documents[service_id].tags)
+                }
+            ranked = sorted(scores, key=lambda service_id: (-scores[service_id], -self._documents[service_id].created_at, service_id))
+        return ranked[offset:offset + limit], len(ranked), dict(facets.most_common(MAX_TAG_FACETS))
+
+    def _score(self, query_terms: List[str]) -> Dict[str, float]:
+        """Score documents matching all query terms, caller holds the lock"""
+        if not query_terms:
+            return {service_id: 0.0 for service_id in self._documents}
+
+        scores: Optional[Dict[str, float]] = None
+        for query_term in query_terms:
+            term_scores: Dict[str, float] = dict(self._postings.get(query_term, {}))
+            if len(query_term) >= MIN_PREFIX_LENGTH:
+                position = bisect.bisect_right(self._sorted_terms, query_term)
+                while position < len(self._sorted_terms) and self._sorted_terms[position].startswith(query_term):
+                    for service_id, weight in self._postings[self._sorted_terms[position]].items():
+                        prefix_score = weight * PREFIX_MATCH_FACTOR
+                        if prefix_score > term_scores.get(service_id, 0.0):
+                            term_scores[service_id] = prefix_score
+                    position += 1
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {service_id: score + term_scores[service_id] for service_id, score in scores.items() if service_id in term_scores}
+            if not scores:
+                return {}
+        return scores
+
+    def _sync(self, db: Session) -> None:
+        """Bring the index up to date with the catalog when it has changed"""
+        version = catalog_service.get_version()
+        if not self._needs_sync(version):
+            return
+        with self._sync_lock:
+            # Another thread may have synced while this one waited
+            if self._needs_sync(version):
+                self._sync_documents(db, version)
+
+    def _needs_sync(self, version: Optional[int]) -> bool:
+        """Whether the index lags behind the catalog version or is due for a sync"""
+        now = time.time()
+        if now - self._rebuilt_at >= Config.CATALOG_SEARCH_REBUILD_INTERVAL:
+            return True
+        if version is None:
+            # Without a catalog version (Redis down), sync on an interval
+            return now - self._synced_at >= Config.CATALOG_SEARCH_SYNC_INTERVAL
+        return version != self._synced_version
+
+    def _sync_documents(self, db: Session, version: Optional[int]) -> None:
+        """Re-index new and changed services and drop removed ones, caller holds the sync lock"""
+        now = time.time()
+        # Periodic full rebuild also catches changes within the signature's one-second resolution
+        full_rebuild = now - self._rebuilt_at >= Config.CATALOG_SEARCH_REBUILD_INTERVAL
+        service_repository = McpServiceRepository(db)
+        signatures = {
+            row.id: (row.updated_at, row.tool_updated_at, row.tool_count or 0)
+            for row in service_repository.get_search_signatures()
+        }
+        with self._lock:
+            if full_rebuild:
+                changed = list(signatures)
+            else:
+                changed = [
+                    service_id for service_id, signature in signatures.items()
+                    if service_id not in self._documents or self._documents[service_id].signature != signature
+                ]
+            changed_ids = set(changed)
+            removed = [service_id for service_id in self._documents if service_id not in signatures or service_id in changed_ids]
+
+        documents = self._load_documents(db, changed, signatures)
+
+        with self._lock:
+            for service_id in removed:
+                self._remove_document(service_id)
+            for service_id, document in documents.items():
+                self._add_document(service_id, document)
+            self._synced_version = version
+            self._synced_at = now
+            if full_rebuild:
+                self._rebuilt_at = now
+        if changed or removed:
+            logger.info(
+                f"Catalog search index synced - Version: {version}, Indexed: {len(documents)}, "
+                f"Removed: {len(set(removed) - set(documents))}, Total: {len(self._documents)}"
+            )
+
+    def _load_documents(self, db: Session, service_ids: List[str], signatures: Dict[str, Tuple]) -> Dict[str, SearchDocument]:
+        """Read and tokenize services and their enabled tool APIs"""
+        if not service_ids:
+            return {}
+        documents: Dict[str, SearchDocument] = {}
+        for row in McpServiceRepository(db).get_search_documents(service_ids):
+            tags = split_tags(row.tags)
+            document = SearchDocument(
+                signature=signatures[row.id],
+                created_at=row.created_at.timestamp() if isinstance(row.created_at, datetime) else 0.0,
+                tags=tags,
+            )
+            self._add_terms(document, row.name, NAME_WEIGHT)
+            self._add_terms(document, " ".join(tags), TAG_WEIGHT)
+            self._add_terms(document, row.short_description, SHORT_DESCRIPTION_WEIGHT)
+            documents[row.id] = document
+
+        for service_id, _api_id, name, description in McpToolApiRepository(db).get_enabled_summaries_by_service_ids(service_ids):
+            document = documents.get(service_id)
+            if document:
+                self._add_terms(document, name, TOOL_NAME_WEIGHT)
+                self._add_terms(document, description, TOOL_DESCRIPTION_WEIGHT)
+        return documents
+
+    @staticmethod
+    def _add_terms(document: SearchDocument, text: Optional[str], weight: float) -> None:
+        """Add the terms of a field, a term keeps the weight of its best field"""
+        for term in tokenize(text):
+            if weight > document.terms.get(term, 0.0):
+                document.terms[term] = weight
+
+    def _add_document(self, service_id: str, document: SearchDocument) -> None:
+        """Add a document to the postings, caller holds the lock"""
+        self._documents[service_id] = document
+        for term, weight in document.terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._sorted_terms, term)
+            postings[service_id] = weight
+
+    def _remove_document(self, service_id: str) -> None:
+        """Remove a document from the postings, caller holds the lock"""
+        document = self._documents.pop(service_id, None)
+        if not document:
+            return
+        for term in document.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(service_id, None)
+            if not postings:
+                del self._postings[term]
+                position = bisect.bisect_left(self._sorted_terms, term)
+                if position < len(self._sorted_terms) and self._sorted_terms[position] == term:
+                    del self._sorted_terms[position]
+
+
+# Global catalog search service instance
+catalog_search_service = CatalogSearchService()
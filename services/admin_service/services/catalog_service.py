@@ -0,0 +1,127 @@
+"""
+Catalog service - Versioned, pre-serialized snapshots of the public marketplace
+"""
+
+import time
+from typing import Callable, Optional
+from services.common.redis import redis_client
+from services.common.redis_keys import RedisKeys
+from services.common.config import Config
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class CatalogService:
+    """
+    Marketplace catalog snapshots keyed by a monotonically increasing version
+
+    Every catalog write bumps the version, so snapshots of older versions are
+    simply no longer read and expire on their own. The version also makes the
+    ETag: a client holding the current version gets a 304 without any snapshot
+    or MySQL access.
+
+    Only existing snapshots are stored: pages and service details are requested
+    by any client-supplied page number, ID or slug, so caching pages past the
+    end or unknown services would let clients create unbounded keys.
+    """
+
+    def __init__(self):
+        self.redis = redis_client
+
+    def get_version(self) -> Optional[int]:
+        """
+        Get the current catalog version
+
+        Returns:
+            Optional[int]: Version, None when Redis is unavailable
+        """
+        try:
+            version = self.redis.client.get(RedisKeys.catalog_version_key())
+            if version is None:
+                # Start from the clock so a lost key never reissues an old version
+                self.redis.client.set(RedisKeys.catalog_version_key(), int(time.time() * 1000), nx=True)
+                version = self.redis.client.get(RedisKeys.catalog_version_key())
+            return int(version)
+        except Exception as e:
+            logger.error(f"Failed to get catalog version: {e}")
+            return None
+
+    def bump_version(self) -> Optional[int]:
+        """
+        Publish a new catalog version after a write
+
+        Returns:
+            Optional[int]: New version, None when Redis is unavailable
+        """
+        if self.get_version() is None:
+            return None
+        try:
+            version = self.redis.client.incr(RedisKeys.catalog_version_key())
+            logger.info(f"Catalog version bumped to {version}")
+            return version
+        except Exception as e:
+            logger.error(f"Failed to bump catalog version: {e}")
+            return None
+
+    @staticmethod
+    def page_etag(version: int, page: int, page_size: int) -> str:
+        """Build the ETag of a catalog page"""
+        return f'"catalog-{version}-{page}-{page_size}"'
+
+    @staticmethod
+    def service_etag(version: int, service_id: str) -> str:
+        """Build the ETag of a catalog service detail"""
+        return f'"catalog-{version}-{service_id}"'
+
+    def get_page(self, version: int, page: int, page_size: int, build: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Get a serialized catalog page, building and storing it on a miss
+
+        Args:
+            version: Catalog version
+            page: Page number
+            page_size: Page size
+            build: Builds the serialized response body, None for a page past the end
+
+        Returns:
+            Optional[str]: Serialized response body, None for a page past the end
+        """
+        return self._get_snapshot(RedisKeys.catalog_page_key(version, page, page_size), build)
+
+    def get_service(self, version: int, service_id: str, build: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Get a serialized catalog service detail, building and storing it on a miss
+
+        Args:
+            version: Catalog version
+            service_id: Service ID or slug name as requested
+            build: Builds the serialized response body, None when the service is not public
+
+        Returns:
+            Optional[str]: Serialized response body, None when the service is not public
+        """
+        return self._get_snapshot(RedisKeys.catalog_service_key(version, service_id), build)
+
+    def _get_snapshot(self, key: str, build: Callable[[], Optional[str]]) -> Optional[str]:
+        """Read a snapshot, or build it and store it when it exists"""
+        try:
+            snapshot = self.redis.client.get(key)
+            if snapshot is not None:
+                return snapshot
+        except Exception as e:
+            logger.error(f"Failed to read catalog snapshot {key}: {e}")
+            return build()
+
+        snapshot = build()
+        if snapshot is None:
+            return None
+        try:
+            self.redis.client.set(key, snapshot, ex=Config.CATALOG_SNAPSHOT_TTL)
+        except Exception as e:
+            logger.error(f"Failed to store catalog snapshot {key}: {e}")
+        return snapshot
+
+
+# Global catalog service instance
+catalog_service = CatalogService()
@@ -0,0 +1,17 @@
+from sqlalchemy.orm import Session
+from typing import Optional, List, Tuple
+from services.common.models.mcp_call_log import McpCallLog
+from services.admin_service.repositories.mcp_call_log_repository import McpCallLogRepository
+
+
+class McpCallLogService:
+    def __init__(self, db: Session):
+        self.mcp_call_log_repository = McpCallLogRepository(db)
+
+    def get_user_call_history(self, user_id: str, page: int, page_size: int) -> Tuple[int, List[McpCallLog]]:
+        """Get user call history by page"""
+        return self.mcp_call_log_repository.get_user_call_history(user_id, page, page_size)
+
+    def get_user_call_history_by_cursor(self, user_id: str, cursor: Optional[str], limit: int) -> Tuple[int, List[McpCallLog], Optional[str]]:
+        """Get user call history by cursor"""
+        return self.mcp_call_log_repository.get_user_call_history_by_cursor(user_id, cursor, limit)
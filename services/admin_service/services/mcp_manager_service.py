@@ -4,7 +4,7 @@ import json
 import re
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Dict
 from services.admin_service.repositories.mcp_service_repository import McpServiceRepository
 from services.admin_service.repositories.mcp_tool_api_repository import McpToolApiRepository
 from services.admin_service.repositories.temp_mcp_service_repository import TempMcpServiceRepository
@@ -14,9 +14,18 @@ from services.common.models.mcp_tool_api import McpToolApi, HttpMethod
 from services.common.models.temp_mcp_service import TempMcpService, AuthMethod as TempAuthMethod, ChargeType as TempChargeType
 from services.common.models.temp_mcp_tool_api import TempMcpToolApi, HttpMethod as TempHttpMethod
 from services.admin_service.services.openapi_helper import OpenApiForAI
+from services.admin_service.services.catalog_service import catalog_service
+from services.admin_service.services.catalog_search_service import catalog_search_service
+from services.common.config import Config
+from services.common.redis_keys import RedisKeys
+from services.common.utils.cache_utils import CacheUtils
+from services.common.utils.response_utils import ResponseUtils
 
 logger = logging.getLogger(__name__)
 
+# Page size of the marketplace first page, rebuilt right after catalog writes
+CATALOG_PREWARM_PAGE_SIZE = 10
+
 # Utility function: Convert tags string to array
 def parse_tags_to_array(tags_str: Optional[str]) -> List[str]:
     """
@@ -78,10 +87,35 @@ class McpManagerService:
         self.temp_mcp_tool_api_repository = TempMcpToolApiRepository(db)
 
     def update_enabled(self, id: str, enabled: int) -> McpService:
-        return self.mcp_service_repository.update_enabled(id, enabled)
+        service = self.mcp_service_repository.update_enabled(id, enabled)
+        self._invalidate_service_cache(service.id)
+        self._publish_catalog()
+        return service
 
     def delete(self, id: str) -> Optional[McpService]:
-        return self.mcp_service_repository.delete(id)
+        service = self.mcp_service_repository.delete(id)
+        if service:
+            self._invalidate_service_cache(service.id)
+        self._publish_catalog()
+        return service
+
+    def _invalidate_service_cache(self, service_id: str) -> None:
+        """Drop every api_service cache entry of a service (by ID, by any slug it had, price) from Redis and every local cache"""
+        CacheUtils.invalidate_tags(RedisKeys.service_tag_key(service_id))
+
+    def _publish_catalog(self) -> None:
+        """Switch the marketplace to a new catalog version and rebuild its first page"""
+        version = catalog_service.bump_version()
+        if version is None:
+            return
+        try:
+            catalog_service.get_page(
+                version, 1, CATALOG_PREWARM_PAGE_SIZE,
+                lambda: self.serialize_public_catalog_page(1, CATALOG_PREWARM_PAGE_SIZE),
+            )
+        except Exception as e:
+            # Readers build the page themselves on a miss
+            logger.error(f"Failed to prewarm catalog version {version}: {str(e)}")
 
     def update(self, body: dict) -> bool:
         # Update mcp_service
@@ -202,6 +236,9 @@ class McpManagerService:
                     existing_service.input_token_price = body["input_token_price"]
                 if "output_token_price" in body and body["output_token_price"] is not None:
                     existing_service.output_token_price = body["output_token_price"]
+        if "request_timeout" in body:
+            # Empty value falls back to the api_service default upstream timeout
+            existing_service.request_timeout = body["request_timeout"] or None
         if "tags" in body and body["tags"] is not None:
             # If provided as array, convert to string for storage
             if isinstance(body["tags"], list):
@@ -262,6 +299,8 @@ class McpManagerService:
                 self.db.commit()
                 self.db.refresh(existing_api)
 
+        self._invalidate_service_cache(service_id)
+        self._publish_catalog()
         return True
 
     def get_by_id(self, id: str) -> Optional[McpService]:
@@ -291,6 +330,7 @@ class McpManagerService:
             "output_token_price": str(float(service.output_token_price)) if service.output_token_price and service.charge_type == ChargeType.PER_TOKEN else "0.00",
             "enabled": service.enabled,
             "tags": parse_tags_to_array(service.tags),
+            "request_timeout": service.request_timeout,
             "apis": [{"id": api.id, "name": api.name, "description": api.description,"url":api.path} for api in apis],
         }
 
@@ -303,6 +343,10 @@ class McpManagerService:
         """Get service list with pagination"""
         return self.mcp_service_repository.get_all_paginated(page=page, page_size=page_size)
 
+    def get_all_by_cursor(self, cursor: Optional[str] = None, page_size: int = 10) -> Tuple[List[McpService], int, Optional[str]]:
+        """Get service list by cursor"""
+        return self.mcp_service_repository.get_all_by_cursor(cursor=cursor, page_size=page_size)
+
     def create_service_from_openapi(self, openapi_data: OpenApiForAI) -> str:
         # Convert OpenApiForAI info to McpService object and McpToolApi object list, return service ID or exception.
         try:
@@ -369,6 +413,7 @@ class McpManagerService:
                 # Save API
                 self.mcp_tool_api_repository.create(tool_api)
 
+            self._publish_catalog()
             return service_id
 
         except Exception as e:
@@ -478,18 +523,53 @@ class McpManagerService:
     def get_public_services_paginated(self, keyword: str, page: int = 1, page_size: int = 10) -> Tuple[List[dict], int]:
         """Get public services list with pagination, returns formatted data with API info"""
         services, total = self.mcp_service_repository.get_public_services_paginated(keyword, page, page_size)
+        return self._build_public_service_list(services), total
+
+    def search_public_services(
+        self, keyword: str, tag: Optional[str] = None, page: int = 1, page_size: int = 10
+    ) -> Tuple[List[dict], int, Dict[str, int]]:
+        """
+        Search public services by keyword and tag, ranked by relevance
+
+        Uses the in-process catalog search index; falls back to the MySQL FULLTEXT
+        index, and to LIKE matching when that index is missing.
+
+        Args:
+            keyword: Search keyword, matched against service names, descriptions, tags and tool APIs
+            tag: Only return services with this tag
+            page: Page number
+            page_size: Page size
+
+        Returns:
+            Tuple[List[dict], int, Dict[str, int]]: (formatted services with API info, total, tag facets)
+        """
+        if Config.CATALOG_SEARCH_INDEX_ENABLED:
+            try:
+                service_ids, total, facets = catalog_search_service.search(
+                    self.db, keyword, tag=tag, offset=(page - 1) * page_size, limit=page_size
+                )
+                services_by_id = {service.id: service for service in self.mcp_service_repository.get_by_ids(service_ids)}
+                services = [services_by_id[service_id] for service_id in service_ids if service_id in services_by_id]
+                return self._build_public_service_list(services), total, facets
+            except Exception as e:
+                logger.error(f"Catalog search index failed, falling back to FULLTEXT: {str(e)}")
+
+        try:
+            services, total = self.mcp_service_repository.search_public_services_fulltext(keyword, tag, page, page_size)
+        except Exception as e:
+            logger.error(f"FULLTEXT search failed, falling back to LIKE: {str(e)}")
+            self.db.rollback()
+            services, total = self.mcp_service_repository.get_public_services_paginated(keyword, page, page_size, tag=tag)
+        return self._build_public_service_list(services), total, {}
+
+    def _build_public_service_list(self, services: List[McpService]) -> List[dict]:
+        """Format public services with their enabled APIs"""
+        # Enabled APIs of the whole page in one query
+        apis_by_service = self._get_public_api_lists([service.id for service in services])
 
         service_list = []
         for service in services:
-            # Get service's API list
-            apis = self.mcp_tool_api_repository.get_by_service_id(service.id)
-
-            # Build API info
-            api_list = []
-            for api in apis:
-                if api.enabled == 1:  # Only return enabled APIs
-                    api_info = {"id": api.id, "name": api.name, "description": api.description}
-                    api_list.append(api_info)
+            api_list = apis_by_service.get(service.id, [])
 
             # Build service info
             service_info = {
@@ -508,7 +588,54 @@ class McpManagerService:
             }
             service_list.append(service_info)
 
-        return service_list, total
+        return service_list
+
+    def serialize_public_catalog_page(self, page: int, page_size: int) -> Optional[str]:
+        """
+        Build the serialized response body of a keyword-less marketplace page
+
+        Args:
+            page: Page number
+            page_size: Page size
+
+        Returns:
+            Optional[str]: JSON response body, None for an empty page past the first one
+        """
+        service_list, total = self.get_public_services_paginated(keyword="", page=page, page_size=page_size)
+        if not service_list and page > 1:
+            return None
+        response = ResponseUtils.success_page(data=service_list, page_num=page, page_size=page_size, total=total)
+        return json.dumps(response, ensure_ascii=False, default=str)
+
+    def serialize_public_service_info(self, id: str) -> Optional[str]:
+        """
+        Build the serialized response body of a public service detail
+
+        Args:
+            id: Service ID or slug name
+
+        Returns:
+            Optional[str]: JSON response body, None when the service is not public
+        """
+        service_info = self.get_public_service_info(id)
+        if not service_info:
+            return None
+        return json.dumps(ResponseUtils.success(data=service_info), ensure_ascii=False, default=str)
+
+    def _get_public_api_lists(self, service_ids: List[str]) -> Dict[str, List[dict]]:
+        """
+        Get public API info of services, grouped by service ID
+
+        Args:
+            service_ids: Service IDs
+
+        Returns:
+            Dict[str, List[dict]]: Service ID -> list of {id, name, description}
+        """
+        api_lists: Dict[str, List[dict]] = {}
+        for service_id, api_id, name, description in self.mcp_tool_api_repository.get_enabled_summaries_by_service_ids(service_ids):
+            api_lists.setdefault(service_id, []).append({"id": api_id, "name": name, "description": description})
+        return api_lists
 
     def get_public_service_info(self, id: str) -> Optional[dict]:
         """Get public service details (only returns enabled services and APIs)"""
@@ -520,15 +647,8 @@ class McpManagerService:
         if service.enabled != 1:
             return None
 
-        # Get service's API list (only return enabled APIs)
-        all_apis = self.mcp_tool_api_repository.get_by_service_id(service.id)
-        apis = [api for api in all_apis if api.enabled == 1]
-
-        # Build API info (according to API specification format)
-        api_list = []
-        for api in apis:
-            api_info = {"id": api.id, "name": api.name, "description": api.description}
-            api_list.append(api_info)
+        # Get service's API list (only return enabled APIs, according to API specification format)
+        api_list = self._get_public_api_lists([service.id]).get(service.id, [])
 
         # Build return data (according to API specification format)
         service_info = {
@@ -0,0 +1,165 @@
+"""
+Platform statistics service - Real-time overview counters kept in Redis
+"""
+
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from services.common.models.user import User
+from services.common.models.user_wallet import UserWallet
+from services.common.models.mcp_service import McpService
+from services.common.models.usage_daily import UsageDaily
+from services.common.redis import redis_client
+from services.common.redis_keys import RedisKeys
+from services.common.config import Config
+from services.common.logging_config import get_logger
+from services.admin_service.utils.platform_counters import (
+    FIELD_TOTAL_USER,
+    FIELD_TOTAL_BALANCE,
+    FIELD_TOTAL_SERVICE,
+    FIELD_RECONCILED_AT,
+)
+
+logger = get_logger(__name__)
+
+# Days of daily call counts kept in Redis
+DAILY_CALLS_RETENTION_DAYS = 400
+
+
+class PlatformStatsService:
+    """
+    Platform overview built from the Redis counters
+
+    Write paths maintain the counters through PlatformCounters; a periodic
+    reconciliation recomputes them from MySQL to correct any drift.
+    """
+
+    def __init__(self):
+        self.redis = redis_client
+
+    def reconcile(self, db: Session, days: int = 30) -> bool:
+        """
+        Recompute counters from MySQL, at most once per reconcile interval across all workers
+
+        The lock is released when the recomputation fails, so the next call
+        retries instead of waiting for the whole interval.
+
+        Args:
+            db: Database session
+            days: Days of daily call counts to recompute from the usage rollup
+
+        Returns:
+            bool: Whether this call performed the reconciliation
+        """
+        lock_ttl = max(1, Config.PLATFORM_STATS_RECONCILE_INTERVAL)
+        lock_key = RedisKeys.platform_stats_reconcile_lock_key()
+        if not self.redis.client.set(lock_key, "1", nx=True, ex=lock_ttl):
+            return False
+
+        try:
+            totals, daily_calls = self._load_from_db(db, days)
+
+            # The two hashes live in different cluster slots, so they are written in one round trip but not in a MULTI
+            pipeline = self.redis.client.pipeline(transaction=False)
+            pipeline.hset(RedisKeys.platform_stats_key(), mapping={**totals, FIELD_RECONCILED_AT: int(time.time())})
+            if daily_calls:
+                pipeline.hset(RedisKeys.platform_daily_calls_key(), mapping=daily_calls)
+            pipeline.execute()
+        except Exception:
+            self.redis.client.delete(lock_key)
+            raise
+        self._trim_daily_calls()
+        logger.info(
+            f"Platform counters reconciled - Users: {totals[FIELD_TOTAL_USER]}, "
+            f"Services: {totals[FIELD_TOTAL_SERVICE]}, Balance: {totals[FIELD_TOTAL_BALANCE]}"
+        )
+        return True
+
+    def _load_from_db(self, db: Session, days: int) -> Tuple[Dict, Dict[str, int]]:
+        """
+        Compute the counters from MySQL
+
+        Args:
+            db: Database session
+            days: Days of daily call counts to compute, ending today
+
+        Returns:
+            Tuple[Dict, Dict[str, int]]: (counter fields, calls per ISO day)
+        """
+        total_user = db.query(User).filter(User.role_id != 1, User.is_deleted == 0).count()  # role_id 1 is admin
+        total_balance = db.query(func.sum(UserWallet.balance)).scalar() or 0
+        total_service = db.query(McpService).count()
+
+        end_date = date.today()
+        start_date = end_date - timedelta(days=days - 1)
+        rows = (
+            db.query(UsageDaily.stats_day, func.sum(UsageDaily.call_count))
+            .filter(UsageDaily.stats_day >= start_date, UsageDaily.stats_day <= end_date)
+            .group_by(UsageDaily.stats_day)
+            .all()
+        )
+        daily_calls = {stats_day.isoformat(): int(count) for stats_day, count in rows}
+        totals = {
+            FIELD_TOTAL_USER: total_user,
+            FIELD_TOTAL_BALANCE: str(total_balance),
+            FIELD_TOTAL_SERVICE: total_service,
+        }
+        return totals, daily_calls
+
+    def _trim_daily_calls(self) -> None:
+        """Drop daily call counts older than the retention"""
+        oldest = (date.today() - timedelta(days=DAILY_CALLS_RETENTION_DAYS)).isoformat()
+        stale = [day for day in self.redis.client.hkeys(RedisKeys.platform_daily_calls_key()) if day < oldest]
+        if stale:
+            self.redis.client.hdel(RedisKeys.platform_daily_calls_key(), *stale)
+
+    def get_overview(self, db: Session, days: int = 0) -> Dict:
+        """
+        Get platform overview from the counters
+
+        Args:
+            db: Database session, only used when the counters were never reconciled
+            days: Length of the optional daily call series, 0 disables it
+
+        Returns:
+            Dict: total_user, total_balance, total_service, invoke_count and optionally series
+        """
+        today = date.today()
+        series_days = [today - timedelta(days=offset) for offset in range(max(days, 1) - 1, -1, -1)]
+
+        stats = self.redis.client.hgetall(RedisKeys.platform_stats_key())
+        if FIELD_RECONCILED_AT not in stats:
+            # Cold start, build the counters once
+            if self.reconcile(db, max(days, 30)):
+                stats = self.redis.client.hgetall(RedisKeys.platform_stats_key())
+            else:
+                # Another worker is building them, the hash may be missing or partial: read MySQL directly
+                stats, daily_calls = self._load_from_db(db, len(series_days))
+                counts = [daily_calls.get(day.isoformat(), 0) for day in series_days]
+                return self._build_overview(stats, series_days, counts, days)
+
+        counts = self.redis.client.hmget(RedisKeys.platform_daily_calls_key(), [day.isoformat() for day in series_days])
+        counts = [int(count or 0) for count in counts]
+        return self._build_overview(stats, series_days, counts, days)
+
+    @staticmethod
+    def _build_overview(stats: Dict, series_days: List[date], counts: List[int], days: int) -> Dict:
+        """Build the overview response from counter fields and the daily call series"""
+        overview = {
+            "total_user": int(stats.get(FIELD_TOTAL_USER, 0)),
+            "total_balance": int(Decimal(stats.get(FIELD_TOTAL_BALANCE, "0"))),
+            "total_service": int(stats.get(FIELD_TOTAL_SERVICE, 0)),
+            "invoke_count": {"today": counts[-1]},
+        }
+        if days > 0:
+            overview["series"] = [
+                {"stats_day": day.isoformat(), "invoke_count": count} for day, count in zip(series_days, counts)
+            ]
+        return overview
+
+
+# Global platform stats service instance
+platform_stats_service = PlatformStatsService()
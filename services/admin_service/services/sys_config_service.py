@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict
 from services.common.database import SessionLocal
-from services.common.redis import RedisClient
+from services.common.redis import RedisClient, redis_client
 from services.common.redis_keys import RedisKeys
 import logging
 
@@ -13,14 +13,11 @@ logger = logging.getLogger(__name__)
 
 
 class SysConfigService:
-    def __init__(self, db: Session = SessionLocal()):
+    def __init__(self, db: Session = SessionLocal(), redis: Optional[RedisClient] = None):
         self.sys_config_repository = SysConfigRepository(db)
         self.sys_config_large_repository = SysConfigLargeRepository(db)
-        try:
-            self.redis_client = RedisClient()
-        except Exception as e:
-            logger.warning(f"Redis connection failed, cache will be disabled: {e}")
-            self.redis_client = None
+        # Shared process-wide client, constructing one per service would open new connections per request
+        self.redis_client = redis or redis_client
 
     def get_value_by_key(self, key: str, is_large:bool = False) -> str:
         if is_large:
@@ -4,6 +4,8 @@ from typing import Optional, List
 from services.common.models.user_apikey import UserApiKey
 from services.common.database import SessionLocal
 from datetime import datetime
+from services.common.redis_keys import RedisKeys
+from services.common.utils.cache_utils import CacheUtils
 from services.admin_service.repositories.user_apikey_repository import UserApiKeyRepository
 
 logger = logging.getLogger(__name__)
@@ -24,13 +26,16 @@ class UserApiKeyService:
         if not user_apikey or user_apikey.user_id != user_id:
             return None
         updated = self.user_apikey_repository.update(id, name, description, expire_at)
+        CacheUtils.invalidate(RedisKeys.user_apikey_key(updated.apikey))
         return updated
 
     def delete(self, id: str, user_id: str) -> Optional[UserApiKey]:
         user_apikey = self.user_apikey_repository.get_by_id(id)
         if not user_apikey or user_apikey.user_id != user_id:
             return None
+        apikey = user_apikey.apikey
         self.user_apikey_repository.delete(id)
+        CacheUtils.invalidate(RedisKeys.user_apikey_key(apikey))
         return user_apikey
 
     def get_by_user_id(self, user_id: str) -> List[UserApiKey]:
@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from typing import Optional, Tuple, List
 from services.common.models.user import User
 from services.common.database import SessionLocal
+from services.common.redis_keys import RedisKeys
+from services.common.utils.cache_utils import CacheUtils
 
 from services.admin_service.repositories.user_repository import UserRepository
 from services.admin_service.repositories.user_wallet_repository import UserWalletRepository
@@ -30,12 +32,20 @@ class UserService:
 
     def delete(self, user_id: str) -> Optional[User]:
         """Delete user"""
-        return self.user_repository.delete(user_id)
+        user = self.user_repository.delete(user_id)
+        if user:
+            # API keys of the user are cached by the api_service
+            CacheUtils.invalidate_tags(RedisKeys.user_tag_key(user_id))
+        return user
 
     def get_user_list(self, offset: int, limit: int) -> Tuple[int, List[User]]:
         """Get user list"""
         return self.user_repository.get_user_list(offset, limit)
 
+    def get_user_list_by_cursor(self, cursor: Optional[str], limit: int) -> Tuple[int, List[User], Optional[str]]:
+        """Get user list by cursor"""
+        return self.user_repository.get_user_list_by_cursor(cursor, limit)
+
     def get_admin_user(self) -> Optional[User]:
         """Get admin user"""
         return self.user_repository.get_admin_user()
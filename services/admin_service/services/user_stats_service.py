@@ -5,9 +5,8 @@ User statistics service
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from services.common.models.mcp_call_log import McpCallLog
 from services.common.models.user_apikey import UserApiKey
+from services.admin_service.repositories.usage_daily_repository import UsageDailyRepository
 from services.common.logging_config import get_logger
 from decimal import Decimal, getcontext
 
@@ -19,6 +18,7 @@ class UserStatsService:
 
     def __init__(self, db: Session):
         self.db = db
+        self.usage_daily_repo = UsageDailyRepository(db)
 
     def get_apikey_call_tool_stats(self, apikey_id: str, last_day: int = 30) -> List[Dict]:
         """
@@ -48,27 +48,11 @@ class UserStatsService:
 
         logger.info(f"Querying stats from {start_date} to {end_date}")
 
-        # Query statistics data
-        stats_query = (
-            self.db.query(
-                func.date(McpCallLog.call_start_time).label("stats_day"),
-                func.count(McpCallLog.id).label("call_tool_count"),
-                func.sum(McpCallLog.unit_price).label("amount"),
-            )
-            .join(UserApiKey, UserApiKey.id == McpCallLog.apikey_id)
-            .filter(
-                and_(
-                    UserApiKey.id == apikey_id,
-                    func.date(McpCallLog.call_start_time) >= start_date,
-                    func.date(McpCallLog.call_start_time) <= end_date,
-                )
-            )
-            .group_by(func.date(McpCallLog.call_start_time))
-            .all()
-        )
+        # Query statistics data from the daily rollup
+        stats_query = self.usage_daily_repo.get_daily_by_apikey(apikey_id, start_date, end_date)
 
         # Convert to dictionary for easy lookup
-        stats_dict = {str(row.stats_day): [row.call_tool_count,row.amount] for row in stats_query}
+        stats_dict = {str(row.stats_day): [int(row.call_count), row.amount] for row in stats_query}
 
         # Generate complete date sequence, including dates with no calls
         result = []
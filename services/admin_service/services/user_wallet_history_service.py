@@ -18,6 +18,9 @@ class UserWalletHistoryService:
     def success_deposit_order_list(self, offset: int, limit: int) -> Tuple[int, List[UserWalletHistory]]:
         return self.user_wallet_history_repository.success_deposit_order_list(offset, limit)
 
+    def success_deposit_order_list_by_cursor(self, cursor: Optional[str], limit: int) -> Tuple[int, List[UserWalletHistory], Optional[str]]:
+        return self.user_wallet_history_repository.success_deposit_order_list_by_cursor(cursor, limit)
+
     def order_list(self, payment_method: str, status: int, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[UserWalletHistory]:
         return self.user_wallet_history_repository.order_list(payment_method, status, start, end)
 
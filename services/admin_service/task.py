@@ -1,4 +1,5 @@
 from services.admin_service.tasks.alipay_order_monitor_task import AlipayOrderMonitorTask
+from services.admin_service.tasks.platform_stats_reconcile_task import platform_stats_reconcile_task
 from services.common.logging_config import get_logger
 logger = get_logger(__name__)
 
@@ -19,3 +20,17 @@ def stop_alipay_order_monitor():
         alipay_monitor_task.stop_monitor()
     except Exception as e:
         logger.error(f"Failed to stop Alipay order monitor: {str(e)}", exc_info=True)
+
+def start_platform_stats_reconcile():
+    """Start platform stats reconcile task"""
+    try:
+        platform_stats_reconcile_task.start()
+    except Exception as e:
+        logger.error(f"Failed to start platform stats reconcile task: {str(e)}", exc_info=True)
+
+def stop_platform_stats_reconcile():
+    """Stop platform stats reconcile task"""
+    try:
+        platform_stats_reconcile_task.stop()
+    except Exception as e:
+        logger.error(f"Failed to stop platform stats reconcile task: {str(e)}", exc_info=True)
@@ -0,0 +1,49 @@
+import threading
+from services.common.config import Config
+from services.common.database import SessionLocal
+from services.common.logging_config import get_logger
+from services.admin_service.services.platform_stats_service import platform_stats_service
+
+logger = get_logger(__name__)
+
+
+class PlatformStatsReconcileTask:
+    """Periodically reconciles the platform overview counters with MySQL"""
+
+    def __init__(self, interval: int = Config.PLATFORM_STATS_RECONCILE_INTERVAL):
+        self.interval = max(1, interval)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the reconcile thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="platform-stats-reconcile", daemon=True)
+        self._thread.start()
+        logger.info(f"Platform stats reconcile task started - Interval: {self.interval}s")
+
+    def stop(self):
+        """Stop the reconcile thread"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        logger.info("Platform stats reconcile task stopped")
+
+    def _run(self):
+        """Reconcile immediately, then once per interval"""
+        while not self._stop_event.is_set():
+            db = SessionLocal()
+            try:
+                # The shared lock makes only one admin worker reconcile per interval
+                platform_stats_service.reconcile(db)
+            except Exception as e:
+                logger.error(f"Platform stats reconcile failed: {str(e)}", exc_info=True)
+            finally:
+                db.close()
+            self._stop_event.wait(self.interval)
+
+
+# Global platform stats reconcile task instance
+platform_stats_reconcile_task = PlatformStatsReconcileTask()
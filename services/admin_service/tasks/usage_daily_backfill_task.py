@@ -0,0 +1,66 @@
+"""
+Backfill the usage_daily rollup from mcp_call_log
+
+Usage:
+    python -m services.admin_service.tasks.usage_daily_backfill_task --days 90
+    python -m services.admin_service.tasks.usage_daily_backfill_task --start 2025-01-01 --end 2025-06-30
+
+Each day is rebuilt in its own transaction (delete + INSERT ... SELECT), so the
+command can be re-run safely. Run it once after deploying the rollup; from then
+on the billing consumer keeps it up to date. Rebuilding a day that is still
+receiving calls may miss calls committed while that day is being rebuilt.
+"""
+
+import argparse
+from datetime import date, timedelta
+from services.common.database import SessionLocal
+from services.common.logging_config import setup_logging, get_logger
+from services.admin_service.repositories.usage_daily_repository import UsageDailyRepository
+
+logger = get_logger(__name__)
+
+
+def backfill_usage_daily(start_date: date, end_date: date) -> int:
+    """
+    Rebuild the rollup for every day in the range
+
+    Args:
+        start_date: First day, inclusive
+        end_date: Last day, inclusive
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    total_rows = 0
+    db = SessionLocal()
+    try:
+        repository = UsageDailyRepository(db)
+        current_date = start_date
+        while current_date <= end_date:
+            rows = repository.rebuild_day(current_date)
+            total_rows += rows
+            logger.info(f"Usage rollup rebuilt - Day: {current_date}, Rows: {rows}")
+            current_date += timedelta(days=1)
+    finally:
+        db.close()
+    logger.info(f"Usage rollup backfill finished - From {start_date} to {end_date}, Rows: {total_rows}")
+    return total_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the usage_daily rollup from mcp_call_log")
+    parser.add_argument("--days", type=int, default=30, help="Rebuild the last N days including today, ignored when --start is given")
+    parser.add_argument("--start", type=date.fromisoformat, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day (YYYY-MM-DD), default today")
+    args = parser.parse_args()
+
+    end_date = args.end or date.today()
+    start_date = args.start or end_date - timedelta(days=max(1, args.days) - 1)
+    if start_date > end_date:
+        parser.error("--start must not be after --end")
+    backfill_usage_daily(start_date, end_date)
+
+
+if __name__ == "__main__":
+    setup_logging("usage_backfill")
+    main()
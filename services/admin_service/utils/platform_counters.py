@@ -0,0 +1,73 @@
+"""
+Platform counters - Real-time overview counters kept in Redis
+"""
+
+from datetime import date
+from typing import Dict
+from services.common.redis import redis_client
+from services.common.redis_keys import RedisKeys
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+FIELD_TOTAL_USER = "total_user"
+FIELD_TOTAL_BALANCE = "total_balance"
+FIELD_TOTAL_SERVICE = "total_service"
+FIELD_RECONCILED_AT = "reconciled_at"
+
+
+class PlatformCounters:
+    """
+    Incremental platform overview counters
+
+    Write paths call these right after their commit. Failures are logged and
+    never fail the write path; the periodic reconciliation corrects any drift.
+    """
+
+    def __init__(self):
+        self.redis = redis_client
+
+    def incr_users(self, delta: int = 1) -> None:
+        """Adjust number of users (non-admin, not deleted)"""
+        self._incr(FIELD_TOTAL_USER, delta)
+
+    def incr_services(self, delta: int = 1) -> None:
+        """Adjust number of MCP services"""
+        self._incr(FIELD_TOTAL_SERVICE, delta)
+
+    def incr_balance(self, delta) -> None:
+        """Adjust sum of wallet balances"""
+        if not delta:
+            return
+        try:
+            self.redis.client.hincrbyfloat(RedisKeys.platform_stats_key(), FIELD_TOTAL_BALANCE, float(delta))
+        except Exception as e:
+            logger.warning(f"Failed to update platform counter {FIELD_TOTAL_BALANCE}: {str(e)}")
+
+    def incr_calls(self, calls_by_day: Dict[date, int]) -> None:
+        """
+        Add call counts per day
+
+        Args:
+            calls_by_day: Number of calls per call day
+        """
+        if not calls_by_day:
+            return
+        try:
+            pipeline = self.redis.client.pipeline(transaction=False)
+            for stats_day, count in calls_by_day.items():
+                pipeline.hincrby(RedisKeys.platform_daily_calls_key(), stats_day.isoformat(), count)
+            pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Failed to update platform daily calls: {str(e)}")
+
+    def _incr(self, field: str, delta: int) -> None:
+        """Increment an integer counter"""
+        try:
+            self.redis.client.hincrby(RedisKeys.platform_stats_key(), field, delta)
+        except Exception as e:
+            logger.warning(f"Failed to update platform counter {field}: {str(e)}")
+
+
+# Global platform counters instance
+platform_counters = PlatformCounters()
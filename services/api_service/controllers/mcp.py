@@ -12,7 +12,8 @@ from services.api_service.services.mcp_server_factory import McpServerFactory
 from services.common.logging_config import get_logger
 from services.api_service.repositories.user_apikey_repository import UserApiKeyRepository
 from services.api_service.utils.connection_manager import connection_manager
-from services.common.database import get_db
+from services.api_service.repositories.mcp_service_repository import McpServiceRepository
+from services.common.async_database import AsyncSessionLocal
 
 logger = get_logger(__name__)
 
@@ -33,7 +34,7 @@ class McpController:
         
         try:
             # Extract service_id from URL path (supports both ID and slug_name)
-            service_id = self._extract_service_id(request)
+            service_id = await self._extract_service_id(request)
             if not service_id:
                 logger.error("Missing service_id parameter or service not found")
                 # For SSE connection errors, we need to send response directly via ASGI interface
@@ -43,7 +44,7 @@ class McpController:
             logger.info(f"Received SSE connection request - Service ID: {service_id}, Client: {client_ip}, UA: {user_agent[:50]}...")
 
             # Extract user ID (for billing) - must provide valid apikey
-            user_info = self._extract_user_info(request)
+            user_info = await self._extract_user_info(request)
             if not user_info:
                 logger.error("Missing or invalid apikey, connection rejected")
                 await self._send_error_response(request, 401, "Missing or invalid apikey parameter")
@@ -108,32 +109,28 @@ class McpController:
             'body': response_body,
         })
 
-    def _extract_service_id(self, request: Request) -> Optional[str]:
+    async def _extract_service_id(self, request: Request) -> Optional[str]:
         """Extract service ID from request path, supporting both ID and slug_name."""
         service_identifier = request.path_params.get("service_id")
         if not service_identifier:
             return None
             
         # Try to find service by service_identifier, supports both ID and slug_name modes
-        db = None
         try:
-            from services.api_service.repositories.mcp_service_repository import McpServiceRepository
-            from services.common.database import get_db
-            
-            db = next(get_db())
-            service_repository = McpServiceRepository(db)
-            
-            # Try to find by ID first
-            service = service_repository.get_by_id(service_identifier)
-            if service:
-                logger.debug(f"Service found (by ID): {service.name} ({service.id})")
-                return service.id
-            
-            # If not found by ID, try by slug_name
-            service = service_repository.get_by_slug_name(service_identifier)
-            if service:
-                logger.debug(f"Service found (by slug_name): {service.name} ({service.id})")
-                return service.id
+            async with AsyncSessionLocal() as db:
+                service_repository = McpServiceRepository(db)
+                
+                # Try to find by ID first
+                service = await service_repository.get_by_id(service_identifier)
+                if service:
+                    logger.debug(f"Service found (by ID): {service.name} ({service.id})")
+                    return service.id
+                
+                # If not found by ID, try by slug_name
+                service = await service_repository.get_by_slug_name(service_identifier)
+                if service:
+                    logger.debug(f"Service found (by slug_name): {service.name} ({service.id})")
+                    return service.id
                 
             logger.warning(f"Service not found: {service_identifier}")
             return None
@@ -141,11 +138,8 @@ class McpController:
         except Exception as e:
             logger.error(f"Error occurred while querying service: {str(e)}", exc_info=True)
             return None
-        finally:
-            if db is not None:
-                db.close()
 
-    def _extract_user_info(self, request: Request) -> Optional[tuple[str, str]]:
+    async def _extract_user_info(self, request: Request) -> Optional[tuple[str, str]]:
         """Extract user ID and apikey ID from request by validating apikey parameter."""
         # Get apikey from URL query parameters
         apikey = request.query_params.get("apikey")
@@ -155,14 +149,13 @@ class McpController:
 
         logger.debug(f"Validating apikey: {apikey[:10]}...")  # Only log first 10 characters for debugging
 
-        db = None
         try:
             # Create database session
-            db = next(get_db())
-            user_apikey_repo = UserApiKeyRepository(db)
-            
-            # Query user info by apikey
-            user_apikey = user_apikey_repo.get_by_apikey(apikey)
+            async with AsyncSessionLocal() as db:
+                user_apikey_repo = UserApiKeyRepository(db)
+                
+                # Query user info by apikey
+                user_apikey = await user_apikey_repo.get_by_apikey(apikey)
             if not user_apikey:
                 logger.warning(f"Apikey not found in database: {apikey[:10]}...")
                 return None
@@ -187,9 +180,6 @@ class McpController:
         except Exception as e:
             logger.error(f"Error occurred while querying user apikey: {str(e)}", exc_info=True)
             return None
-        finally:
-            if db is not None:
-                db.close()
 
     def get_sse_mount_handler(self):
         """Get SSE message handler for processing requests."""
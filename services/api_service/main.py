@@ -17,6 +17,11 @@ from services.common.config import Config
 from services.common.logging_config import setup_logging, get_logger
 from services.api_service.controllers.mcp import McpController
 from services.api_service.utils.connection_manager import connection_manager
+from services.api_service.utils.upstream_client import upstream_client_registry
+from services.common.async_database import dispose_async_engine
+from services.common.redis import async_redis_client
+from services.common.utils.cache_utils import CacheUtils, cache_invalidation_listener
+from services.api_service.services.billing_service import billing_service
 from services.common.middleware.exception_middleware import ExceptionHandlingMiddleware
 from services.common.utils.response_utils import ResponseUtils
 from services.common import error_msg
@@ -30,10 +35,17 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifecycle management"""
     logger.info(f"MCP Streamable HTTP Service starting... Port: {Config.API_PORT}")
+    await billing_service.start()
+    await cache_invalidation_listener.start()
     
     yield
     
     logger.info("MCP Streamable HTTP Service shutting down...")
+    await cache_invalidation_listener.stop()
+    await billing_service.stop()
+    await upstream_client_registry.aclose()
+    await dispose_async_engine()
+    await async_redis_client.aclose()
 
 
 # Create FastAPI application
@@ -125,10 +137,10 @@ def read_root():
 @app.get("/health")
 def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "mcp-streamable-http"}
+    return {"status": "healthy", "service": "mcp-streamable-http", "local_cache": CacheUtils.get_local_cache_stats()}
 
 @app.get("/mcp/status/{service_id}")
-def mcp_service_status(service_id: str):
+async def mcp_service_status(service_id: str):
     """
     Check MCP service status for specified service
     Supports both service_id (UUID) and slug_name
@@ -139,24 +151,19 @@ def mcp_service_status(service_id: str):
     
     try:
         from services.api_service.repositories.mcp_service_repository import McpServiceRepository
-        from services.common.database import get_db
+        from services.common.async_database import AsyncSessionLocal
         
-        db = next(get_db())
-        service_repository = McpServiceRepository(db)
-        
-        # Try to find by ID first
-        service = service_repository.get_by_id(service_id)
+        async with AsyncSessionLocal() as db:
+            service_repository = McpServiceRepository(db)
+            
+            # Try to find by ID first
+            service = await service_repository.get_by_id(service_id)
+            if not service:
+                # If not found by ID, try by slug_name
+                service = await service_repository.get_by_slug_name(service_id)
         if service:
             actual_service_id = service.id
             service_name = service.name
-        else:
-            # If not found by ID, try by slug_name
-            service = service_repository.get_by_slug_name(service_id)
-            if service:
-                actual_service_id = service.id
-                service_name = service.name
-                
-        db.close()
         
     except Exception as e:
         logger.error(f"Error occurred while querying service status: {str(e)}")
@@ -191,7 +198,10 @@ def mcp_connections_stats():
     
     return {
         "timestamp": time.time(),
-        "stats": connection_manager.get_stats()
+        "stats": connection_manager.get_stats(),
+        "upstream_clients": upstream_client_registry.get_stats(),
+        "billing_publisher": billing_service.rabbitmq.get_stats(),
+        "billing_spool": billing_service.spool.get_stats()
     }
 
 # Create MCP Streamable HTTP routes
@@ -2,12 +2,17 @@
 API service repository module
 
 Contains data access layer implementations for the API service, specifically for query operations.
+All repositories work on an AsyncSession so they never block the event loop.
 """
 
 from .mcp_service_repository import McpServiceRepository
 from .mcp_tool_api_repository import McpToolApiRepository
+from .user_apikey_repository import UserApiKeyRepository
+from .user_wallet_repository import UserWalletRepository
 
 __all__ = [
     "McpServiceRepository",
     "McpToolApiRepository",
+    "UserApiKeyRepository",
+    "UserWalletRepository",
 ]
@@ -1,6 +1,12 @@
-from sqlalchemy.orm import Session
+from functools import partial
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.common.async_database import AsyncSessionLocal
+from services.common.config import Config
 from services.common.models.mcp_service import McpService
+from services.common.redis_keys import RedisKeys
 from services.common.utils.cache_utils import CacheUtils
+from services.common.utils.sqlalchemy_utils import SqlalchemyUtils
 from typing import Optional, List
 import logging
 
@@ -10,45 +16,41 @@ logger = logging.getLogger(__name__)
 class McpServiceRepository:
     """MCP service repository layer for API service"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_by_id(self, service_id: str) -> Optional[McpService]:
+    async def get_by_id(self, service_id: str) -> Optional[McpService]:
         """
         Get single MCP service by service ID
         """
-        cache_key = f"mcp_service:id:{service_id}"
+        return await self._get_cached(RedisKeys.mcp_service_id_key(service_id), McpService.id == service_id)
 
-        # Try to get from cache using SQLAlchemy-specific method
-        cached_model = CacheUtils.get_sqlalchemy_cache(cache_key, McpService)
-        if cached_model:
-            return cached_model
-
-        # Query from database if not in cache
-        service = self.db.query(McpService).filter(McpService.id == service_id, McpService.enabled == 1).first()
-        if service:
-            # Cache the result for 10 minutes
-            CacheUtils.set_sqlalchemy_cache(cache_key, service, 600)
-            return service
-
-        return None
-
-    def get_by_slug_name(self, slug_name: str) -> Optional[McpService]:
+    async def get_by_slug_name(self, slug_name: str) -> Optional[McpService]:
         """
         Get single MCP service by slug name
         """
-        cache_key = f"mcp_service:slug:{slug_name}"
+        return await self._get_cached(RedisKeys.mcp_service_slug_key(slug_name), McpService.slug_name == slug_name)
 
-        # Try to get from cache using SQLAlchemy-specific method
-        cached_model = CacheUtils.get_sqlalchemy_cache(cache_key, McpService)
-        if cached_model:
-            return cached_model
+    @staticmethod
+    async def _get_cached(cache_key: str, condition) -> Optional[McpService]:
+        """
+        Get an enabled service through the stampede-protected cache
 
-        # Query from database if not in cache
-        service = self.db.query(McpService).filter(McpService.slug_name == slug_name, McpService.enabled == 1).first()
-        if service:
-            # Cache the result for 10 minutes
-            CacheUtils.set_sqlalchemy_cache(cache_key, service, 600)
-            return service
+        The loader opens its own session, as it may refresh the entry in the
+        background after the request's session is closed. Entries are tagged
+        with the service, so admin writes invalidate them before they expire.
+        """
 
-        return None
+        async def load() -> Optional[McpService]:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(select(McpService).where(condition, McpService.enabled == 1))
+                return result.scalars().first()
+
+        return await CacheUtils.get_or_load_async(
+            cache_key,
+            load,
+            Config.CACHE_ENTITY_TTL,
+            encode=SqlalchemyUtils.model_to_primitive_dict,
+            decode=partial(SqlalchemyUtils.primitive_dict_to_model, McpService),
+            tags=lambda service: [RedisKeys.service_tag_key(service.id)],
+        )
@@ -5,7 +5,9 @@ User API key repository class - used in API service
 import logging
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.common.config import Config
 from services.common.models.user_apikey import UserApiKey
 from services.common.redis_keys import RedisKeys
 from services.common.utils.cache_utils import CacheUtils
@@ -16,10 +18,10 @@ logger = logging.getLogger(__name__)
 class UserApiKeyRepository:
     """User API key repository class"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_by_apikey(self, apikey: str) -> Optional[UserApiKey]:
+    async def get_by_apikey(self, apikey: str) -> Optional[UserApiKey]:
         """
         Query user API key info by API key
 
@@ -32,20 +34,23 @@ class UserApiKeyRepository:
         cache_key = RedisKeys.user_apikey_key(apikey)
         
         # Try to get from cache using new SQLAlchemy-specific method
-        cached_model = CacheUtils.get_sqlalchemy_cache(cache_key, UserApiKey)
+        cached_model = await CacheUtils.get_sqlalchemy_cache_async(cache_key, UserApiKey)
         if cached_model:
             return cached_model
 
         # Query from database if not in cache
-        user_apikey = self.db.query(UserApiKey).filter(UserApiKey.apikey == apikey).first()
+        result = await self.db.execute(select(UserApiKey).where(UserApiKey.apikey == apikey))
+        user_apikey = result.scalars().first()
         if user_apikey:
-            # Cache the result using new SQLAlchemy-specific method
-            CacheUtils.set_sqlalchemy_cache(cache_key, user_apikey, 300)
+            # Cache the result using new SQLAlchemy-specific method, tagged so deleting the user drops it
+            await CacheUtils.set_sqlalchemy_cache_async(
+                cache_key, user_apikey, Config.CACHE_ENTITY_TTL, tags=[RedisKeys.user_tag_key(user_apikey.user_id)]
+            )
             return user_apikey
 
         return None
 
-    def is_apikey_valid(self, apikey: str) -> bool:
+    async def is_apikey_valid(self, apikey: str) -> bool:
         """
         Check if API key is valid
 
@@ -55,7 +60,7 @@ class UserApiKeyRepository:
         Returns:
             bool: Whether valid
         """
-        user_apikey = self.get_by_apikey(apikey)
+        user_apikey = await self.get_by_apikey(apikey)
         if not user_apikey:
             return False
 
@@ -4,17 +4,18 @@ User wallet repository class - used in API service
 import uuid
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from services.common.models.user_wallet import UserWallet
 
 
 class UserWalletRepository:
     """User wallet repository class"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create(self, user_id: str) -> UserWallet:
+    async def create(self, user_id: str) -> UserWallet:
         """
         Create user wallet
         
@@ -33,11 +34,11 @@ class UserWalletRepository:
             updated_at=datetime.now(timezone.utc),
         )
         self.db.add(wallet)
-        self.db.commit()
-        self.db.refresh(wallet)
+        await self.db.commit()
+        await self.db.refresh(wallet)
         return wallet
 
-    def get_by_user_id(self, user_id: str) -> Optional[UserWallet]:
+    async def get_by_user_id(self, user_id: str) -> Optional[UserWallet]:
         """
         Get wallet by user ID
         
@@ -47,9 +48,10 @@ class UserWalletRepository:
         Returns:
             Optional[UserWallet]: Wallet instance, returns None if not exists
         """
-        return self.db.query(UserWallet).filter(UserWallet.user_id == user_id).first()
+        result = await self.db.execute(select(UserWallet).where(UserWallet.user_id == user_id))
+        return result.scalars().first()
 
-    def update_balance(self, user_id: str, new_balance: float) -> bool:
+    async def update_balance(self, user_id: str, new_balance: float) -> bool:
         """
         Update user balance
         
@@ -60,10 +62,10 @@ class UserWalletRepository:
         Returns:
             bool: Whether update succeeded
         """
-        wallet = self.get_by_user_id(user_id)
+        wallet = await self.get_by_user_id(user_id)
         if wallet:
             wallet.balance = new_balance
             # updated_at field is automatically updated by database, no manual setting needed
-            self.db.commit()
+            await self.db.commit()
             return True
         return False
@@ -3,48 +3,143 @@ Billing service - Handle user API call billing logic
 """
 
 import json
-import os
-import uuid
-import asyncio
+import time
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Tuple, Optional
-from contextlib import asynccontextmanager
 
-from services.common.redis import redis_client
-from services.common.rabbitmq import rabbitmq_client
+from services.common.config import Config
+from services.common.redis import async_redis_client
+from services.common.redis_keys import RedisKeys
+from services.common.utils.billing_queue_utils import BillingQueueUtils
+from services.common.utils.cache_utils import CacheUtils, single_flight
+from services.common.utils.wallet_cache_utils import WalletCacheUtils, REBUILD_BALANCE_SCRIPT, RESERVATION_LUA
+from services.common.rabbitmq import async_rabbitmq_publisher
+from services.api_service.utils.billing_spool import billing_spool
 from services.common.models.billing import BillingMessage, PreDeductResult, ApiCallLogInfo
 from services.common.models.mcp_service import ChargeType
 from services.common.models.user_wallet import UserWallet
-from services.common.database import get_db
+from services.common.async_database import AsyncSessionLocal
 from services.api_service.repositories.mcp_service_repository import McpServiceRepository
 from services.api_service.repositories.user_wallet_repository import UserWalletRepository
 from services.common.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Pre-deduct script result codes
+PRE_DEDUCT_TOO_MANY_INFLIGHT = -2  # API key already has the maximum number of calls in flight
+PRE_DEDUCT_MISS = -1  # Wallet balance not cached, caller must hydrate and retry
+PRE_DEDUCT_INSUFFICIENT = 0
+PRE_DEDUCT_OK = 1
+
+# Atomically check the in-flight limit, decrement the cached wallet balance and
+# record a reservation for the call, all in one round trip. Expired reservations
+# of calls that never settled are dropped first and returned to the cached balance.
+# KEYS[1]: wallet balance key, KEYS[2]: reservation hash, KEYS[3]: in-flight sorted set
+# ARGV[1]: amount to reserve (plain decimal string), ARGV[2]: wallet cache expiration (seconds),
+# ARGV[3]: call ID, ARGV[4]: reservation TTL (seconds), ARGV[5]: max in-flight (0 = unlimited),
+# ARGV[6]: current unix time (seconds)
+# Returns {code, balance}
+PRE_DEDUCT_SCRIPT = RESERVATION_LUA + """
+local max_inflight = tonumber(ARGV[5])
+local ttl = tonumber(ARGV[4])
+local now = tonumber(ARGV[6])
+local expired = purge_expired_reservations(KEYS[2], now)
+if expired > 0 and redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('INCRBYFLOAT', KEYS[1], string.format('%.6f', expired))
+end
+if max_inflight > 0 then
+    -- Entries are scored by expiry, drop the ones whose call never settled
+    redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', ARGV[6])
+    if redis.call('ZCARD', KEYS[3]) >= max_inflight then
+        return {-2, ''}
+    end
+end
+local raw = redis.call('GET', KEYS[1])
+local balance = raw and tonumber(raw)
+if not balance then
+    -- Missing or corrupt cache entry
+    if raw then redis.call('DEL', KEYS[1]) end
+    return {-1, ''}
+end
+if balance < tonumber(ARGV[1]) then
+    return {0, raw}
+end
+local new_balance = redis.call('INCRBYFLOAT', KEYS[1], '-' .. ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('HSET', KEYS[2], ARGV[3], ARGV[1] .. ':' .. (now + ttl))
+redis.call('EXPIRE', KEYS[2], ttl)
+if max_inflight > 0 then
+    redis.call('ZADD', KEYS[3], now + ttl, ARGV[3])
+    redis.call('EXPIRE', KEYS[3], ttl)
+end
+return {1, new_balance}
+"""
+
+# Settle or release a reservation when the call ends. The difference between the
+# reserved and the charged amount is returned to the cached wallet balance. Every
+# rewrite of the balance (REBUILD_BALANCE_SCRIPT) keeps open reservations deducted,
+# and a missing balance gets no refund, so the refund only lands on a balance that
+# still holds this reservation.
+# KEYS[1]: wallet balance key, KEYS[2]: reservation hash, KEYS[3]: in-flight sorted set
+# ARGV[1]: call ID, ARGV[2]: charged amount (0 releases the full reservation)
+# Returns 1 if a reservation was found, 0 if it had already expired or been settled
+SETTLE_SCRIPT = RESERVATION_LUA + """
+redis.call('ZREM', KEYS[3], ARGV[1])
+local reserved = redis.call('HGET', KEYS[2], ARGV[1])
+if not reserved then
+    return 0
+end
+redis.call('HDEL', KEYS[2], ARGV[1])
+local delta = reservation_amount(reserved) - tonumber(ARGV[2])
+if delta ~= 0 and redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('INCRBYFLOAT', KEYS[1], string.format('%.6f', delta))
+end
+return 1
+"""
+
 
 class BillingService:
     """Billing service class"""
 
     # Configuration constants
-    BILLING_LOCK_TIMEOUT = 5  # Distributed lock timeout (seconds)
     WALLET_CACHE_EXPIRE = 300  # Wallet cache expiration time (seconds)
-    SERVICE_CACHE_EXPIRE = 3600  # Service price cache expiration time (seconds)
-    BILLING_QUEUE_NAME = os.getenv("BILLING_QUEUE_NAME") or "billing.api.calls"
+    SERVICE_CACHE_EXPIRE = Config.CACHE_ENTITY_TTL  # Service price cache expiration time (seconds), invalidated by service tag
 
     def __init__(self):
-        self.redis = redis_client
-        self.rabbitmq = rabbitmq_client
-
-    async def check_and_pre_deduct(self, user_id: str, service_id: str, tool_name: str) -> PreDeductResult:
+        self.redis = async_redis_client
+        self.rabbitmq = async_rabbitmq_publisher
+        self.spool = billing_spool
+        # Loaded once, then invoked by SHA (EVALSHA with transparent reload on NOSCRIPT)
+        self._pre_deduct_script = self.redis.client.register_script(PRE_DEDUCT_SCRIPT)
+        self._settle_script = self.redis.client.register_script(SETTLE_SCRIPT)
+        self._rebuild_balance_script = self.redis.client.register_script(REBUILD_BALANCE_SCRIPT)
+
+    async def start(self) -> None:
+        """Start billing message publishing (called from application startup)"""
+        await self.spool.start()
+        # Messages the broker does not confirm are kept in the local spool
+        self.rabbitmq.failure_handler = self.spool.append_batch
+        await self.rabbitmq.start(BillingQueueUtils.all_lane_queues())
+
+    async def stop(self) -> None:
+        """Flush pending billing messages and stop publishing (called from application shutdown)"""
+        await self.rabbitmq.close()
+        await self.spool.stop()
+
+    async def check_and_pre_deduct(self, user_id: str, service_id: str, tool_name: str, call_id: str, apikey_id: Optional[str] = None) -> PreDeductResult:
         """
-        Check balance and perform pre-deduction
+        Check balance and reserve the estimated cost of the call
+
+        Concurrent calls of the same user each hold their own reservation, which
+        must be settled or released with settle_reservation when the call ends.
 
         Args:
             user_id: User ID
             service_id: Service ID
             tool_name: Tool name
+            call_id: Unique call ID, used as reservation key
+            apikey_id: API key ID, used for the in-flight limit
 
         Returns:
             PreDeductResult: Pre-deduction result
@@ -71,38 +166,50 @@ class BillingService:
                     estimated_output_cost = (Decimal(500) / Decimal("1000000")) * output_token_price
                     service_price = estimated_input_cost + estimated_output_cost
 
-            async with self._acquire_billing_lock(user_id):
-                # Get user balance
-                user_balance = await self._get_user_wallet_balance(user_id)
-
-                # Check if balance is sufficient
-                if user_balance < service_price:
-                    logger.warning(f"User balance insufficient - User ID: {user_id}, Balance: {user_balance}, Required: {service_price}")
-                    return PreDeductResult(
-                        success=False,
-                        message=f"Insufficient balance, current balance: {user_balance}, required: {service_price}",
-                        service_price=service_price,
-                        user_balance=user_balance,
-                        input_token_price=input_token_price,
-                        output_token_price=output_token_price,
-                        charge_type=charge_type.value
-                    )
-
-                # Pre-deduct amount in Redis
-                new_balance = user_balance - service_price
-                await self._update_wallet_cache(user_id, new_balance)
+            # Check balance and reserve in a single atomic step
+            code, user_balance = await self._pre_deduct(user_id, apikey_id, call_id, service_price)
+            if code == PRE_DEDUCT_MISS:
+                # Wallet not cached yet, load it from database and retry once
+                await self._hydrate_wallet_cache(user_id)
+                code, user_balance = await self._pre_deduct(user_id, apikey_id, call_id, service_price)
+                if code == PRE_DEDUCT_MISS:
+                    raise Exception(f"Wallet balance cache unavailable - User ID: {user_id}")
+
+            if code == PRE_DEDUCT_TOO_MANY_INFLIGHT:
+                logger.warning(f"Too many concurrent calls - User ID: {user_id}, API Key ID: {apikey_id}, Limit: {Config.BILLING_MAX_INFLIGHT_PER_KEY}")
+                return PreDeductResult(
+                    success=False,
+                    message=f"Too many concurrent tool calls for this API key, limit: {Config.BILLING_MAX_INFLIGHT_PER_KEY}",
+                    service_price=service_price,
+                    user_balance=Decimal("0"),
+                    input_token_price=input_token_price,
+                    output_token_price=output_token_price,
+                    charge_type=charge_type.value
+                )
 
-                logger.info(f"Pre-deduction successful - User ID: {user_id}, Deduction: {service_price}, Balance: {user_balance} -> {new_balance}")
+            if code == PRE_DEDUCT_INSUFFICIENT:
+                logger.warning(f"User balance insufficient - User ID: {user_id}, Balance: {user_balance}, Required: {service_price}")
                 return PreDeductResult(
-                    success=True,
-                    message="Pre-deduction successful",
+                    success=False,
+                    message=f"Insufficient balance, current balance: {user_balance}, required: {service_price}",
                     service_price=service_price,
-                    user_balance=new_balance,
+                    user_balance=user_balance,
                     input_token_price=input_token_price,
                     output_token_price=output_token_price,
                     charge_type=charge_type.value
                 )
 
+            logger.info(f"Pre-deduction successful - User ID: {user_id}, Call ID: {call_id}, Reserved: {service_price}, Balance: {user_balance}")
+            return PreDeductResult(
+                success=True,
+                message="Pre-deduction successful",
+                service_price=service_price,
+                user_balance=user_balance,
+                input_token_price=input_token_price,
+                output_token_price=output_token_price,
+                charge_type=charge_type.value
+            )
+
         except Exception as e:
             logger.error(f"Pre-deduction check failed - User ID: {user_id}, Service ID: {service_id}: {str(e)}", exc_info=True)
             return PreDeductResult(
@@ -124,6 +231,9 @@ class BillingService:
             call_success: Whether the call was successful
             call_end_time: Call end time
         """
+        message_json = None
+        # Messages of one user always go to the same lane to keep them ordered
+        queue_name = BillingQueueUtils.queue_for_user(call_log.user_id)
         try:
             message = BillingMessage(
                 user_id=call_log.user_id,
@@ -138,6 +248,8 @@ class BillingService:
                 unit_price=call_log.unit_price,
                 call_start_time=call_log.call_start_time,
                 call_end_time=call_end_time,
+                # api_id is the per-call ID, it is the idempotency key of the billing consumer
+                call_log_id=call_log.api_id,
                 apikey_id=call_log.apikey_id,
             )
 
@@ -156,17 +268,23 @@ class BillingService:
                     "charge_type": message.charge_type, 
                     "call_start_time": message.call_start_time.isoformat(),
                     "call_end_time": message.call_end_time.isoformat() if message.call_end_time else None,
+                    "call_log_id": message.call_log_id,
                     "apikey_id": message.apikey_id,
                 }
             )
 
-            # Send to RabbitMQ
-            self.rabbitmq.publish(self.BILLING_QUEUE_NAME, message_json)
-            logger.info(f"Billing message sent successfully - User ID: {call_log.user_id}, Tool: {call_log.tool_name}")
+            # Buffer for batched, confirmed publishing to RabbitMQ
+            await self.rabbitmq.publish(queue_name, message_json)
+            logger.info(f"Billing message queued successfully - User ID: {call_log.user_id}, Tool: {call_log.tool_name}")
 
         except Exception as e:
             logger.error(f"Failed to send billing message: {str(e)}", exc_info=True)
-            # Consider saving failed messages to local queue for retry
+            if message_json is not None:
+                # Keep the message in the local spool, the drainer replays it later
+                try:
+                    await self.spool.append_batch([(queue_name, message_json, True)])
+                except Exception as spool_error:
+                    logger.error(f"Failed to spool billing message, message lost: {str(spool_error)}", exc_info=True)
 
     async def _get_service_price(self, service_id: str) -> Tuple[Decimal, Decimal, Decimal, ChargeType]:
         """
@@ -178,134 +296,129 @@ class BillingService:
         Returns:
             Tuple[Decimal, ChargeType]: Price and charge type
         """
-        # Try to get from Redis cache
-        cache_key = f"service:price:{service_id}"
-        cached_data = self.redis.get(cache_key)
-        if cached_data:
-            try:
-                data = json.loads(cached_data)
-                return Decimal(data["price"]), Decimal(data["input_token_price"]), Decimal(data["output_token_price"]), ChargeType(data["charge_type"])
-            except (json.JSONDecodeError, KeyError, ValueError):
-                logger.warning(f"Service price cache data anomaly, re-fetch from database - Service ID: {service_id}")
-
-        # Get from database
-        db = next(get_db())
-        try:
-            service_repo = McpServiceRepository(db)
-            service = service_repo.get_by_id(service_id)
-
+        async def load_price() -> Optional[dict]:
+            async with AsyncSessionLocal() as db:
+                service_repo = McpServiceRepository(db)
+                service = await service_repo.get_by_id(service_id)
             if not service:
-                raise ValueError(f"Service not found: {service_id}")
-
-            price = Decimal(str(service.price))
-            input_token_price = Decimal(str(service.input_token_price))
-            output_token_price = Decimal(str(service.output_token_price))
-            charge_type = service.charge_type
-
-            # Cache to Redis
-            cache_data = {
-                "price": str(price),
-                "input_token_price": str(input_token_price),
-                "output_token_price":str(output_token_price),
-                "charge_type": charge_type.value
+                return None
+            return {
+                "price": str(Decimal(str(service.price))),
+                "input_token_price": str(Decimal(str(service.input_token_price))),
+                "output_token_price": str(Decimal(str(service.output_token_price))),
+                "charge_type": service.charge_type.value
             }
-            self.redis.set(cache_key, json.dumps(cache_data), ex=self.SERVICE_CACHE_EXPIRE)
 
-            return price,input_token_price,output_token_price, charge_type
+        # Coalesced and refreshed ahead of expiry, so a hot service never sends a burst of loads to the database
+        data = await CacheUtils.get_or_load_async(
+            RedisKeys.service_price_key(service_id),
+            load_price,
+            self.SERVICE_CACHE_EXPIRE,
+            tags=lambda _: [RedisKeys.service_tag_key(service_id)],
+        )
+        if not data:
+            raise ValueError(f"Service not found: {service_id}")
 
-        finally:
-            db.close()
+        return Decimal(data["price"]), Decimal(data["input_token_price"]), Decimal(data["output_token_price"]), ChargeType(data["charge_type"])
 
-    async def _get_user_wallet_balance(self, user_id: str) -> Decimal:
+    async def settle_reservation(self, user_id: str, call_id: str, apikey_id: Optional[str], charged_amount: Decimal) -> None:
         """
-        Get user wallet balance
+        Settle the reservation of a finished call
+
+        The unused part of the reservation (all of it when charged_amount is 0)
+        is returned to the cached wallet balance, and the call leaves the
+        in-flight set of its API key.
 
         Args:
             user_id: User ID
-
-        Returns:
-            Decimal: User balance
+            call_id: Call ID used when reserving
+            apikey_id: API key ID used when reserving
+            charged_amount: Amount actually charged for the call
         """
-        # Try to get from Redis cache
-        cache_key = f"wallet:balance:{user_id}"
-        cached_balance = self.redis.get(cache_key)
-
-        if cached_balance:
-            try:
-                return Decimal(cached_balance)
-            except (ValueError, TypeError):
-                logger.warning(f"Wallet balance cache data anomaly, re-fetch from database - User ID: {user_id}")
-
-        # Get from database
-        db = next(get_db())
         try:
-            wallet_repo = UserWalletRepository(db)
-            wallet = wallet_repo.get_by_user_id(user_id)
-
-            if not wallet:
-                # User wallet doesn't exist, create a new one
-                wallet = wallet_repo.create(user_id)
-                logger.info(f"Created new wallet for user - User ID: {user_id}")
-
-            balance = Decimal(str(wallet.balance))
-
-            # Cache to Redis
-            self.redis.set(cache_key, str(balance), ex=self.WALLET_CACHE_EXPIRE)
-
-            return balance
-
-        finally:
-            db.close()
-
-    async def _update_wallet_cache(self, user_id: str, new_balance: Decimal) -> None:
+            found = await self._settle_script(
+                keys=self._reservation_keys(user_id, apikey_id),
+                args=[call_id, format(charged_amount, "f")],
+            )
+            if not found:
+                logger.warning(f"Reservation not found when settling, it may have expired - User ID: {user_id}, Call ID: {call_id}")
+            else:
+                logger.debug(f"Reservation settled - User ID: {user_id}, Call ID: {call_id}, Charged: {charged_amount}")
+        except Exception as e:
+            # Unsettled reservations expire on their own
+            logger.error(f"Failed to settle reservation - User ID: {user_id}, Call ID: {call_id}: {str(e)}", exc_info=True)
+
+    def _reservation_keys(self, user_id: str, apikey_id: Optional[str]) -> list:
+        """Build the key list shared by the reserve and settle scripts"""
+        return [
+            RedisKeys.wallet_balance_key(user_id),
+            RedisKeys.billing_reservation_key(user_id),
+            RedisKeys.billing_inflight_key(user_id, apikey_id or "-"),
+        ]
+
+    async def _pre_deduct(self, user_id: str, apikey_id: Optional[str], call_id: str, amount: Decimal) -> Tuple[int, Decimal]:
         """
-        Update wallet balance cache
+        Run the atomic reserve script against the cached wallet balance
 
         Args:
             user_id: User ID
-            new_balance: New balance
-        """
-        cache_key = f"wallet:balance:{user_id}"
-        self.redis.set(cache_key, str(new_balance), ex=self.WALLET_CACHE_EXPIRE)
+            apikey_id: API key ID, the in-flight limit is skipped when missing
+            call_id: Call ID
+            amount: Amount to reserve
 
-    @asynccontextmanager
-    async def _acquire_billing_lock(self, user_id: str):
+        Returns:
+            Tuple[int, Decimal]: Result code and balance (after deduction on success)
         """
-        Acquire billing distributed lock
+        max_inflight = Config.BILLING_MAX_INFLIGHT_PER_KEY if apikey_id else 0
+        code, balance = await self._pre_deduct_script(
+            keys=self._reservation_keys(user_id, apikey_id),
+            args=[
+                format(amount, "f"),
+                self.WALLET_CACHE_EXPIRE,
+                call_id,
+                Config.BILLING_RESERVATION_TTL,
+                max_inflight,
+                int(time.time()),
+            ],
+        )
+        return int(code), Decimal(balance) if balance else Decimal("0")
+
+    async def _hydrate_wallet_cache(self, user_id: str) -> Decimal:
+        """
+        Load user wallet balance from database into cache
+
+        A balance cached concurrently by another call or by the billing consumer
+        is never overwritten with a stale database value, and the amounts still
+        reserved by calls in flight stay deducted. Concurrent misses of the same user in this process share one load.
 
         Args:
             user_id: User ID
 
-        Yields:
-            Lock context
+        Returns:
+            Decimal: User balance from database
         """
-        lock_key = f"billing:lock:{user_id}"
-        lock_value = str(uuid.uuid4())
+        return await single_flight.do(RedisKeys.wallet_balance_key(user_id), lambda: self._load_wallet_cache(user_id))
 
-        try:
-            # Try to acquire lock (using Redis SET command with NX and EX options)
-            lua_script = """
-            return redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2])
-            """
-            acquired = self.redis.client.eval(lua_script, 1, lock_key, lock_value, str(self.BILLING_LOCK_TIMEOUT))
-            if not acquired:
-                raise Exception(f"Cannot acquire billing lock, user may have other operations in progress - User ID: {user_id}")
-
-            logger.debug(f"Acquired billing lock successfully - User ID: {user_id}")
-            yield
-
-        finally:
-            # Release lock (only the process holding the lock can release it)
-            lua_script = """
-            if redis.call("get", KEYS[1]) == ARGV[1] then
-                return redis.call("del", KEYS[1])
-            else
-                return 0
-            end
-            """
-            self.redis.client.eval(lua_script, 1, lock_key, lock_value)
-            logger.debug(f"Released billing lock - User ID: {user_id}")
+    async def _load_wallet_cache(self, user_id: str) -> Decimal:
+        """Read the wallet balance from database and cache it, minus open reservations, unless already cached"""
+        async with AsyncSessionLocal() as db:
+            wallet_repo = UserWalletRepository(db)
+            wallet = await wallet_repo.get_by_user_id(user_id)
+
+            if not wallet:
+                # User wallet doesn't exist, create a new one
+                wallet = await wallet_repo.create(user_id)
+                logger.info(f"Created new wallet for user - User ID: {user_id}")
+
+        balance = Decimal(str(wallet.balance))
+
+        # Cache to Redis minus the open reservations, unless already cached
+        await self._rebuild_balance_script(
+            keys=WalletCacheUtils.rebuild_keys(user_id),
+            args=WalletCacheUtils.rebuild_args(balance, self.WALLET_CACHE_EXPIRE, keep_cached=True),
+        )
 
+        return balance
 
 # Global instance
 billing_service = BillingService()
@@ -9,13 +9,14 @@ from decimal import Decimal
 from typing import List, Optional
 from mcp.server.lowlevel import Server
 import mcp.types as types
-from services.common.database import get_db
+from services.common.async_database import AsyncSessionLocal
 from services.api_service.repositories.mcp_tool_api_repository import McpToolApiRepository
 from services.api_service.repositories.mcp_service_repository import McpServiceRepository
 from services.api_service.services.mcp_service import McpService
 from services.api_service.services.mcp_tool_service import McpToolService
 from services.api_service.services.billing_service import billing_service
 from services.common.models.billing import ApiCallLogInfo
+from services.common.models.mcp_service import ChargeType
 from services.common.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -77,13 +78,13 @@ class McpServerFactory:
         """
         logger.info(f"Received tools list query request - Service ID: {service_id}")
 
-        db = next(get_db())
         try:
-            # Create service instance
-            mcp_service = self._create_mcp_service(db)
+            async with AsyncSessionLocal() as db:
+                # Create service instance
+                mcp_service = self._create_mcp_service(db)
 
-            # Get tools list
-            tools = mcp_service.get_tools_by_service_id(service_id)
+                # Get tools list
+                tools = await mcp_service.get_tools_by_service_id(service_id)
             logger.info(f"Found {len(tools)} tools")
 
             for tool in tools:
@@ -94,8 +95,6 @@ class McpServerFactory:
         except Exception as e:
             logger.error(f"Failed to get tools list: {str(e)}", exc_info=True)
             raise
-        finally:
-            db.close()
 
     async def _handle_call_tool_with_billing(self, service_id: str, name: str, arguments: dict, user_id: str, apikey_id: Optional[str] = None) -> List[types.Content]:
         """
@@ -118,7 +117,7 @@ class McpServerFactory:
         logger.debug(f"Tool arguments: {arguments}")
 
         # 1. Pre-deduction check
-        pre_deduct_result = await self.billing_service.check_and_pre_deduct(user_id, service_id, name)
+        pre_deduct_result = await self.billing_service.check_and_pre_deduct(user_id, service_id, name, call_log_id, apikey_id)
         if not pre_deduct_result.success:
             logger.warning(f"Pre-deduction failed: {pre_deduct_result.message}")
             error_msg = f"Billing check failed: {pre_deduct_result.message}"
@@ -145,7 +144,6 @@ class McpServerFactory:
         logger.info(f"Pre-deduction successful - User ID: {user_id}, Deduction amount: {pre_deduct_result.service_price}")
 
         # 2. Execute tool call
-        db = next(get_db())
         call_success = False
         result: List[types.ContentBlock] = []
         # calculate input token amount
@@ -164,24 +162,21 @@ class McpServerFactory:
             input_token_amount = (Decimal(str(estimated_input_tokens)) / Decimal("1000000")) * pre_deduct_result.input_token_price
         
         try:
-            # Create service instance
-            mcp_service = self._create_mcp_service(db)
+            # Resolve the plan in a short-lived session so no connection is held during the upstream call
+            async with AsyncSessionLocal() as db:
+                mcp_service = self._create_mcp_service(db)
 
-            # Find tool configuration
-            tool_config = mcp_service.get_tool_by_name(service_id, name)
-            if not tool_config:
+                # Find compiled tool plan
+                tool_plan = await mcp_service.get_tool_plan(service_id, name)
+            if not tool_plan:
                 error_msg = f"Unknown tool: {name}"
                 logger.error(error_msg)
                 raise ValueError(error_msg)
 
-            logger.info(f"Found tool configuration: {tool_config.name}")
-
-            # Get service authentication info
-            auth_info = mcp_service.get_service_auth_info(service_id)
-            logger.debug(f"Authentication info: {auth_info}")
+            logger.info(f"Found tool plan: {tool_plan.name}")
 
             # Execute tool
-            result = await self.tool_service.execute_tool(tool_config, arguments, auth_info)
+            result = await self.tool_service.execute_tool(tool_plan, arguments)
             call_success = True
             logger.info(f"Tool call successful - User ID: {user_id}, Tool: {name}")
             
@@ -202,29 +197,37 @@ class McpServerFactory:
             # Return error message instead of throwing exception to maintain MCP protocol stability
             error_msg = f"Tool execution failed: {str(e)}"
             result = [types.TextContent(type="text", text=error_msg)]
-
         finally:
-            db.close()
-
-        # 3. Send billing message
-        call_end_time = datetime.now(timezone.utc)
-        call_log = ApiCallLogInfo(
-            user_id=user_id,
-            service_id=service_id,
-            api_id=call_log_id,
-            tool_name=name,
-            input_params=json.dumps(arguments),
-            unit_price=(input_token_amount + output_token_amount).quantize(Decimal('0.000001')),
-            input_token=Decimal(str(input_token)).quantize(Decimal('0')),
-            output_token=Decimal(str(output_token)).quantize(Decimal('0')),
-            charge_type=pre_deduct_result.charge_type,
-            call_start_time=call_start_time,
-            call_end_time=call_end_time,
-            apikey_id=apikey_id,
-        )
-
-        await self.billing_service.send_billing_message(call_log, call_success, call_end_time)
-        logger.info(f"Billing message sent - User ID: {user_id}, Tool: {name}, Success: {call_success}")
+            # 3. Settle the reservation (failed calls release it in full). Steps 3 and 4 also run when the
+            # call is cancelled (client disconnect, request timeout), CancelledError is not an Exception
+            if pre_deduct_result.charge_type != ChargeType.FREE.value:
+                if not call_success:
+                    charged_amount = Decimal("0")
+                elif pre_deduct_result.charge_type == ChargeType.PER_TOKEN.value:
+                    charged_amount = (input_token_amount + output_token_amount).quantize(Decimal('0.000001'))
+                else:
+                    charged_amount = pre_deduct_result.service_price
+                await self.billing_service.settle_reservation(user_id, call_log_id, apikey_id, charged_amount)
+
+            # 4. Send billing message
+            call_end_time = datetime.now(timezone.utc)
+            call_log = ApiCallLogInfo(
+                user_id=user_id,
+                service_id=service_id,
+                api_id=call_log_id,
+                tool_name=name,
+                input_params=json.dumps(arguments),
+                unit_price=(input_token_amount + output_token_amount).quantize(Decimal('0.000001')),
+                input_token=Decimal(str(input_token)).quantize(Decimal('0')),
+                output_token=Decimal(str(output_token)).quantize(Decimal('0')),
+                charge_type=pre_deduct_result.charge_type,
+                call_start_time=call_start_time,
+                call_end_time=call_end_time,
+                apikey_id=apikey_id,
+            )
+
+            await self.billing_service.send_billing_message(call_log, call_success, call_end_time)
+            logger.info(f"Billing message sent - User ID: {user_id}, Tool: {name}, Success: {call_success}")
 
         # Ensure return type is correct
         return result
@@ -234,7 +237,7 @@ class McpServerFactory:
         Create MCP service instance
 
         Args:
-            db: Database connection
+            db: Async database session
 
         Returns:
             McpService: MCP service instance
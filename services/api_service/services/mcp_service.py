@@ -1,11 +1,10 @@
-import json
-import ast
 import mcp.types as types
 from typing import List, Optional
 from services.common.models.mcp_tool_api import McpToolApi
 from services.common.models.mcp_service import McpService as McpServiceModel
 from services.api_service.repositories.mcp_tool_api_repository import McpToolApiRepository
 from services.api_service.repositories.mcp_service_repository import McpServiceRepository
+from services.api_service.utils.tool_plan import ToolPlan, tool_plan_cache, build_auth_info
 from services.common.logging_config import get_logger
 
 
@@ -17,75 +16,7 @@ class McpService:
         self.service_repository = service_repository
         self.logger = get_logger(__name__)
 
-    def _safe_parse_params(self, params_str: str, tool_name: str, param_type: str) -> list:
-        """
-        Safely parse parameter string that might be in JSON or Python dict format
-        
-        Args:
-            params_str: Parameter string to parse
-            tool_name: Tool name for logging
-            param_type: Type of parameters (e.g., 'query', 'path', 'body')
-            
-        Returns:
-            list: Parsed parameters or empty list if parsing fails
-        """
-        if not params_str or params_str.strip() == '':
-            return []
-        
-        # Remove any surrounding whitespace
-        params_str = params_str.strip()
-        
-        # Try different parsing strategies
-        
-        # Strategy 1: Standard JSON format (with double quotes)
-        try:
-            result = json.loads(params_str)
-            if isinstance(result, list):
-                return result
-            elif isinstance(result, dict):
-                # If it's a single dict, wrap it in a list
-                return [result]
-            else:
-                self.logger.warning(f"Expected list or dict but got {type(result)} for {param_type} parameters in {tool_name}")
-                return []
-        except json.JSONDecodeError:
-            pass  # Try next strategy
-        
-        # Strategy 2: Python literal format (with single quotes)
-        try:
-            result = ast.literal_eval(params_str)
-            if isinstance(result, list):
-                return result
-            elif isinstance(result, dict):
-                # If it's a single dict, wrap it in a list
-                return [result]
-            else:
-                self.logger.warning(f"Expected list or dict but got {type(result)} for {param_type} parameters in {tool_name}")
-                return []
-        except (ValueError, SyntaxError):
-            pass  # Try next strategy
-        
-        # Strategy 3: Try to convert Python format to JSON format
-        try:
-            # Replace single quotes with double quotes for JSON compatibility
-            # This is a simple approach that works for most cases
-            json_str = params_str.replace("'", '"').replace('True', 'true').replace('False', 'false').replace('None', 'null')
-            result = json.loads(json_str)
-            if isinstance(result, list):
-                return result
-            elif isinstance(result, dict):
-                return [result]
-            else:
-                self.logger.warning(f"Expected list or dict but got {type(result)} for {param_type} parameters in {tool_name}")
-                return []
-        except json.JSONDecodeError:
-            pass  # All strategies failed
-        
-        # If all strategies fail, log the error
-        self.logger.warning(f"Failed to parse {param_type} parameters for {tool_name}. Data: {params_str[:100]}...")
-        return []
-
-    def get_tools_by_service_id(self, service_id: str) -> List[types.Tool]:
+    async def get_tools_by_service_id(self, service_id: str) -> List[types.Tool]:
         """
         Get all tools list for the service by service ID
         
@@ -96,140 +27,41 @@ class McpService:
             List[types.Tool]: MCP tools list
         """
         # Get tool configuration from database
-        tool_apis = self.tool_api_repository.get_by_service_id(service_id)
+        tool_apis = await self.tool_api_repository.get_by_service_id(service_id)
+        service = await self.service_repository.get_by_id(service_id)
         
         # Convert to MCP tool format
         tools = []
         for tool_api in tool_apis:
-            tool = self._convert_api_to_tool(tool_api)
+            tool = self._convert_api_to_tool(tool_api, service)
             if tool:
                 tools.append(tool)
         
         return tools
 
-    def _convert_api_to_tool(self, tool_api: McpToolApi) -> Optional[types.Tool]:
+    def _convert_api_to_tool(self, tool_api: McpToolApi, service: Optional[McpServiceModel]) -> Optional[types.Tool]:
         """
         Convert API configuration from database to MCP tool
         
         Args:
             tool_api: API configuration from database
+            service: Owning service, used to resolve the compiled plan
             
         Returns:
             Optional[types.Tool]: Converted MCP tool, returns None if conversion fails
         """
         try:
-            # Build input schema
-            input_schema = self._build_input_schema(tool_api)
-            
-            # If no schema was built (no parameters), create a minimal schema
-            if input_schema is None:
-                input_schema = {
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-            
+            plan = tool_plan_cache.get_plan(tool_api, service)
             return types.Tool(
-                name=tool_api.name,
-                description=tool_api.description,
-                inputSchema=input_schema
+                name=plan.name,
+                description=plan.description,
+                inputSchema=plan.input_schema
             )
         except Exception as e:
             self.logger.error(f"Tool conversion failed for {tool_api.name}: {e}")
             return None
 
-    def _build_input_schema(self, tool_api: McpToolApi) -> dict:
-        """
-        Build input schema based on API configuration
-        
-        Args:
-            tool_api: API configuration
-            
-        Returns:
-            dict: Input definition in JSON Schema format
-        """
-        schema = {
-            "type": "object",
-            "properties": {},
-            "required": []
-        }
-        
-        # Parse path parameters
-        if tool_api.path_parameters:
-            path_params = self._safe_parse_params(tool_api.path_parameters, tool_api.name, 'path')
-            for param in path_params:
-                if isinstance(param, dict) and "name" in param:
-                    # Handle both direct type and schema.type formats
-                    param_type = "string"  # default
-                    if "type" in param:
-                        param_type = param["type"]
-                    elif "schema" in param and isinstance(param["schema"], dict) and "type" in param["schema"]:
-                        param_type = param["schema"]["type"]
-                    
-                    schema["properties"][param["name"]] = {
-                        "type": param_type,
-                        "description": param.get("description", f"Path parameter: {param['name']}")
-                    }
-                    if param.get("required", False):
-                        schema["required"].append(param["name"])
-        
-        # Parse query parameters
-        if tool_api.query_parameters:
-            query_params = self._safe_parse_params(tool_api.query_parameters, tool_api.name, 'query')
-            for param in query_params:
-                if isinstance(param, dict) and "name" in param:
-                    # Handle both direct type and schema.type formats
-                    param_type = "string"  # default
-                    if "type" in param:
-                        param_type = param["type"]
-                    elif "schema" in param and isinstance(param["schema"], dict) and "type" in param["schema"]:
-                        param_type = param["schema"]["type"]
-                    
-                    schema["properties"][param["name"]] = {
-                        "type": param_type,
-                        "description": param.get("description", f"Query parameter: {param['name']}")
-                    }
-                    if param.get("required", False):
-                        schema["required"].append(param["name"])
-        
-        # Parse request body parameters
-        if tool_api.request_body_schema:
-            # Try to parse as parameters list first, then as schema object
-            try:
-                # First try to parse as parameters list (similar to query/path parameters)
-                body_params = self._safe_parse_params(tool_api.request_body_schema, tool_api.name, 'body')
-                if body_params:
-                    # If it's a list of parameters, process them like query parameters
-                    for param in body_params:
-                        if isinstance(param, dict) and "name" in param:
-                            param_type = "string"  # default
-                            if "type" in param:
-                                param_type = param["type"]
-                            elif "schema" in param and isinstance(param["schema"], dict) and "type" in param["schema"]:
-                                param_type = param["schema"]["type"]
-                            
-                            schema["properties"][param["name"]] = {
-                                "type": param_type,
-                                "description": param.get("description", f"Body parameter: {param['name']}")
-                            }
-                            if param.get("required", False):
-                                schema["required"].append(param["name"])
-                else:
-                    # If not a parameters list, try to parse as JSON schema object
-                    try:
-                        body_schema = json.loads(tool_api.request_body_schema)
-                        if isinstance(body_schema, dict) and "properties" in body_schema:
-                            schema["properties"].update(body_schema["properties"])
-                            if "required" in body_schema:
-                                schema["required"].extend(body_schema["required"])
-                    except json.JSONDecodeError:
-                        pass  # Already logged by _safe_parse_params
-            except Exception as e:
-                self.logger.warning(f"Failed to parse request body schema for {tool_api.name}: {e}")
-        
-        return schema
-
-    def get_tool_by_name(self, service_id: str, tool_name: str) -> Optional[McpToolApi]:
+    async def get_tool_by_name(self, service_id: str, tool_name: str) -> Optional[McpToolApi]:
         """
         Get tool configuration by service ID and tool name
         
@@ -240,13 +72,13 @@ class McpService:
         Returns:
             Optional[McpToolApi]: Tool configuration, returns None if not found
         """
-        tool_apis = self.tool_api_repository.get_by_service_id(service_id)
+        tool_apis = await self.tool_api_repository.get_by_service_id(service_id)
         for tool_api in tool_apis:
             if tool_api.name == tool_name:
                 return tool_api
         return None
 
-    def get_service_by_id(self, service_id: str) -> Optional[McpServiceModel]:
+    async def get_service_by_id(self, service_id: str) -> Optional[McpServiceModel]:
         """
         Get service information by service ID
         
@@ -256,9 +88,26 @@ class McpService:
         Returns:
             Optional[McpServiceModel]: Service information, returns None if not found
         """
-        return self.service_repository.get_by_id(service_id)
+        return await self.service_repository.get_by_id(service_id)
+
+    async def get_tool_plan(self, service_id: str, tool_name: str) -> Optional[ToolPlan]:
+        """
+        Get compiled execution plan by service ID and tool name
+        
+        Args:
+            service_id: Service ID
+            tool_name: Tool name
+            
+        Returns:
+            Optional[ToolPlan]: Compiled plan, returns None if tool not found
+        """
+        tool_api = await self.get_tool_by_name(service_id, tool_name)
+        if not tool_api:
+            return None
+        service = await self.service_repository.get_by_id(service_id)
+        return tool_plan_cache.get_plan(tool_api, service)
 
-    def get_service_auth_info(self, service_id: str) -> dict:
+    async def get_service_auth_info(self, service_id: str) -> dict:
         """
         Get service authentication information
         
@@ -268,15 +117,5 @@ class McpService:
         Returns:
             dict: Dictionary containing base_url and authentication information
         """
-        service = self.service_repository.get_by_id(service_id)
-        if not service:
-            return {}
-        
-        auth_info = {
-            "base_url": service.base_url or "",
-            "auth_method": service.auth_method.value if service.auth_method else "free",
-            "auth_header": service.auth_header or "",
-            "auth_token": service.auth_token or ""
-        }
-        
-        return auth_info
+        service = await self.service_repository.get_by_id(service_id)
+        return build_auth_info(service)
@@ -4,8 +4,9 @@ MCP tool service - Business logic for executing MCP tool calls
 import json
 from typing import List, Dict, Any
 import mcp.types as types
-from mcp.shared._httpx_utils import create_mcp_http_client
 from services.api_service.utils.http_client import HttpRequestBuilder
+from services.api_service.utils.tool_plan import ToolPlan
+from services.api_service.utils.upstream_client import upstream_client_registry
 from services.common.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -17,23 +18,22 @@ class McpToolService:
     def __init__(self):
         self.http_builder = HttpRequestBuilder()
     
-    async def execute_tool(self, tool_config, arguments: dict, auth_info: dict) -> List[types.Content]:
+    async def execute_tool(self, plan: ToolPlan, arguments: dict) -> List[types.Content]:
         """
         Execute tool call
         
         Args:
-            tool_config: Tool configuration
+            plan: Compiled tool execution plan
             arguments: Tool parameters
-            auth_info: Service authentication information
             
         Returns:
             List[types.Content]: Execution result
         """
         try:
-            logger.info(f"Starting tool execution: {tool_config.name}")
+            logger.info(f"Starting tool execution: {plan.name}")
             
             # Build HTTP request
-            request_info = self.http_builder.build_request(tool_config, arguments, auth_info)
+            request_info = self.http_builder.build_request(plan, arguments)
             
             # Send HTTP request
             response_text = await self._send_http_request(request_info)
@@ -66,24 +66,24 @@ class McpToolService:
         logger.debug(f"Query parameters: {query_params}")
         logger.debug(f"Request body: {request_body}")
         
-        async with create_mcp_http_client(headers=headers) as client:
-            if method == "GET":
-                response = await client.get(url, params=query_params)
-            elif method == "POST":
-                response = await client.post(url, params=query_params, json=request_body)
-            elif method == "PUT":
-                response = await client.put(url, params=query_params, json=request_body)
-            elif method == "DELETE":
-                response = await client.delete(url, params=query_params)
-            elif method == "PATCH":
-                response = await client.patch(url, params=query_params, json=request_body)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            logger.info(f"HTTP response status code: {response.status_code}")
-            response.raise_for_status()
-            
-            response_text = response.text
-            logger.debug(f"Response content length: {len(response_text)} characters")
-            
-            return response_text
+        if method not in ("GET", "POST", "PUT", "DELETE", "PATCH"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        # GET and DELETE requests carry no body
+        json_body = request_body if method in ("POST", "PUT", "PATCH") else None
+        response = await upstream_client_registry.request(
+            method,
+            url,
+            headers=headers,
+            params=query_params,
+            json=json_body,
+            timeout=request_info.get("timeout"),
+        )
+        
+        logger.info(f"HTTP response status code: {response.status_code}")
+        response.raise_for_status()
+        
+        response_text = response.text
+        logger.debug(f"Response content length: {len(response_text)} characters")
+        
+        return response_text
@@ -0,0 +1,351 @@
+"""
+Billing spool - Durable local storage for billing messages the broker did not accept
+"""
+import asyncio
+import fcntl
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+from services.common.config import Config
+from services.common.rabbitmq import AsyncRabbitMQPublisher, PendingMessage, async_rabbitmq_publisher
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+WORKER_DIR_PREFIX = "worker-"
+LOCK_FILE_NAME = ".lock"
+
+
+class BillingSpool:
+    """
+    Append-only, segment-rotated on-disk spool
+
+    Records are JSON lines appended to the active segment and fsynced in
+    batches by a background task. Full segments are sealed and a drainer
+    replays sealed segments to RabbitMQ, deleting each one once every record
+    in it has been confirmed. Delivery is at-least-once.
+
+    Worker processes share the spool directory, so each one spools into its
+    own subdirectory, held with an exclusive flock for the life of the
+    process. At start, a worker adopts a subdirectory whose lock is free (left
+    by a stopped or crashed worker, with its segments) or creates a new one.
+    """
+
+    def __init__(
+        self,
+        publisher: AsyncRabbitMQPublisher,
+        directory: str = Config.BILLING_SPOOL_DIR,
+        segment_max_bytes: int = Config.BILLING_SPOOL_SEGMENT_BYTES,
+        fsync_interval: float = Config.BILLING_SPOOL_FSYNC_INTERVAL,
+        drain_interval: float = Config.BILLING_SPOOL_DRAIN_INTERVAL,
+    ):
+        self.publisher = publisher
+        self.root = Path(directory)
+        # Subdirectory of this process, claimed on start
+        self.directory: Optional[Path] = None
+        self._lock_file = None
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_interval = fsync_interval
+        self.drain_interval = drain_interval
+        self._active_file = None
+        self._active_path: Optional[Path] = None
+        self._active_size = 0
+        self._next_seq = 0
+        self._dirty = False
+        # Per-segment bookkeeping: pending record count, first record timestamp, records already replayed
+        self._segment_records: Dict[Path, int] = {}
+        self._segment_first_ts: Dict[Path, float] = {}
+        self._drain_offsets: Dict[Path, int] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._stats: Dict[str, int] = {"spooled_total": 0, "drained_total": 0}
+
+    async def start(self) -> None:
+        """Claim a worker directory, recover its segments and start the fsync and drain tasks"""
+        if self._lock_file is None:
+            await asyncio.to_thread(self._claim_directory)
+        await asyncio.to_thread(self._adopt_shared_segments)
+        for path in self._list_segments():
+            records, first_ts = await asyncio.to_thread(self._scan_segment, path)
+            self._segment_records[path] = records
+            if first_ts is not None:
+                self._segment_first_ts[path] = first_ts
+            self._next_seq = max(self._next_seq, self._segment_seq(path) + 1)
+
+        pending = sum(self._segment_records.values())
+        if pending:
+            logger.warning(f"Recovered billing spool - Segments: {len(self._segment_records)}, Records: {pending}")
+
+        self._tasks = [
+            asyncio.create_task(self._fsync_loop()),
+            asyncio.create_task(self._drain_loop()),
+        ]
+        logger.info(f"Billing spool started - Directory: {self.directory}")
+
+    async def append_batch(self, batch: List[PendingMessage]) -> None:
+        """
+        Append messages to the active segment
+
+        Writes are flushed to the OS immediately; durability to disk follows
+        within fsync_interval.
+
+        Args:
+            batch: Messages that could not be published
+        """
+        if self._active_file is None:
+            self._open_segment()
+
+        now = time.time()
+        lines = "".join(
+            json.dumps({"queue": queue, "body": body, "persistent": persistent, "ts": now}) + "\n"
+            for queue, body, persistent in batch
+        )
+        data = lines.encode("utf-8")
+        self._active_file.write(data)
+        self._active_file.flush()
+        self._active_size += len(data)
+        self._dirty = True
+
+        self._segment_records[self._active_path] = self._segment_records.get(self._active_path, 0) + len(batch)
+        self._segment_first_ts.setdefault(self._active_path, now)
+        self._stats["spooled_total"] += len(batch)
+        logger.warning(f"Spooled {len(batch)} billing messages to {self._active_path.name}")
+
+        if self._active_size >= self.segment_max_bytes:
+            self._seal_active()
+
+    def _claim_directory(self) -> None:
+        """Lock a worker subdirectory for this process, adopting an orphaned one when possible"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        for candidate in sorted(path for path in self.root.glob(f"{WORKER_DIR_PREFIX}*") if path.is_dir()):
+            if self._try_lock(candidate):
+                logger.info(f"Billing spool adopted worker directory {candidate.name}")
+                return
+        candidate = self.root / f"{WORKER_DIR_PREFIX}{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        candidate.mkdir()
+        if not self._try_lock(candidate):
+            raise RuntimeError(f"Cannot lock billing spool directory {candidate}")
+
+    def _try_lock(self, directory: Path) -> bool:
+        """Take the exclusive lock of a worker directory without waiting"""
+        lock_file = open(directory / LOCK_FILE_NAME, "a")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        self.directory = directory
+        return True
+
+    def _adopt_shared_segments(self) -> None:
+        """Move segments spooled directly into the shared directory by earlier releases into this worker's directory"""
+        if not any(self.root.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")):
+            return
+        with open(self.root / LOCK_FILE_NAME, "a") as root_lock:
+            try:
+                fcntl.flock(root_lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Another worker is adopting them
+                return
+            next_seq = max((self._segment_seq(path) + 1 for path in self._list_segments()), default=0)
+            for path in sorted(self.root.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")):
+                path.rename(self.directory / f"{SEGMENT_PREFIX}{next_seq:012d}{SEGMENT_SUFFIX}")
+                next_seq += 1
+            logger.warning(f"Billing spool adopted shared segments into {self.directory.name}")
+
+    def _open_segment(self) -> None:
+        """Open a new active segment"""
+        if self._lock_file is None:
+            self._claim_directory()
+        self._active_path = self.directory / f"{SEGMENT_PREFIX}{self._next_seq:012d}{SEGMENT_SUFFIX}"
+        self._next_seq += 1
+        self._active_file = open(self._active_path, "ab")
+        self._active_size = 0
+
+    def _seal_active(self) -> None:
+        """Fsync and close the active segment so the drainer can replay it"""
+        if self._active_file is None:
+            return
+        try:
+            self._active_file.flush()
+            os.fsync(self._active_file.fileno())
+        finally:
+            self._active_file.close()
+            self._active_file = None
+            self._active_path = None
+            self._active_size = 0
+            self._dirty = False
+
+    async def _fsync_loop(self) -> None:
+        """Batch fsync of the active segment"""
+        while True:
+            await asyncio.sleep(self.fsync_interval)
+            if not self._dirty or self._active_file is None:
+                continue
+            self._dirty = False
+            try:
+                await asyncio.to_thread(os.fsync, self._active_file.fileno())
+            except (OSError, ValueError) as e:
+                # The segment may have been sealed concurrently, which fsyncs it anyway
+                logger.debug(f"Billing spool fsync skipped: {str(e)}")
+
+    async def _drain_loop(self) -> None:
+        """Periodically replay spooled messages"""
+        while True:
+            await asyncio.sleep(self.drain_interval)
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.error(f"Billing spool drain failed: {str(e)}", exc_info=True)
+
+    async def drain(self) -> int:
+        """
+        Replay sealed segments to RabbitMQ in order
+
+        Stops at the first unconfirmed batch so records stay in order and the
+        broker is not hammered while it is down.
+
+        Returns:
+            int: Number of records replayed
+        """
+        if not self._segment_records:
+            return 0
+
+        replayed, complete = await self._drain_sealed()
+        # Seal the active segment only once the backlog is cleared, so an
+        # unreachable broker does not leave behind a trail of tiny segments
+        if complete and self._active_file is not None:
+            self._seal_active()
+            more, _ = await self._drain_sealed()
+            replayed += more
+
+        if replayed:
+            logger.info(f"Billing spool drained {replayed} messages")
+        return replayed
+
+    async def _drain_sealed(self):
+        """Replay sealed segments, returns (replayed count, whether all were drained)"""
+        replayed = 0
+        for path in self._list_segments():
+            records = await asyncio.to_thread(self._read_segment, path)
+            offset = self._drain_offsets.get(path, 0)
+            while offset < len(records):
+                chunk = records[offset:offset + self.publisher.batch_size]
+                failed = await self.publisher.publish_confirmed(chunk)
+                if failed:
+                    self._drain_offsets[path] = offset
+                    logger.warning(f"Billing spool drain paused, broker not accepting messages - Segment: {path.name}")
+                    return replayed, False
+                offset += len(chunk)
+                replayed += len(chunk)
+                self._stats["drained_total"] += len(chunk)
+                self._segment_records[path] = max(0, self._segment_records.get(path, 0) - len(chunk))
+
+            await asyncio.to_thread(path.unlink, True)
+            self._segment_records.pop(path, None)
+            self._segment_first_ts.pop(path, None)
+            self._drain_offsets.pop(path, None)
+        return replayed, True
+
+    def _list_segments(self) -> List[Path]:
+        """List segments of this worker in sequence order, excluding the active one"""
+        if self.directory is None:
+            return []
+        return sorted(
+            path for path in self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")
+            if path != self._active_path
+        )
+
+    @staticmethod
+    def _segment_seq(path: Path) -> int:
+        """Parse segment sequence number from file name"""
+        try:
+            return int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+        except ValueError:
+            return 0
+
+    @staticmethod
+    def _parse_line(line: bytes) -> Optional[dict]:
+        """Parse one spool record, None for torn or corrupt lines"""
+        try:
+            record = json.loads(line)
+            if isinstance(record, dict) and "queue" in record and "body" in record:
+                return record
+        except (ValueError, UnicodeDecodeError):
+            pass
+        return None
+
+    def _read_segment(self, path: Path) -> List[PendingMessage]:
+        """Read all valid records of a segment"""
+        records = []
+        with open(path, "rb") as segment:
+            for line in segment:
+                record = self._parse_line(line)
+                if record is None:
+                    if line.strip():
+                        logger.warning(f"Skipping corrupt billing spool record in {path.name}")
+                    continue
+                records.append((record["queue"], record["body"], record.get("persistent", True)))
+        return records
+
+    def _scan_segment(self, path: Path):
+        """Count valid records and find the first record timestamp"""
+        count = 0
+        first_ts = None
+        with open(path, "rb") as segment:
+            for line in segment:
+                record = self._parse_line(line)
+                if record is None:
+                    continue
+                count += 1
+                if first_ts is None:
+                    first_ts = record.get("ts")
+        return count, first_ts
+
+    def get_stats(self) -> Dict:
+        """
+        Get spool statistics
+
+        Returns:
+            Dict: Depth (pending records), segment count, size and age of the oldest record
+        """
+        oldest_ts = min(self._segment_first_ts.values()) if self._segment_first_ts else None
+        total_bytes = 0
+        for path in self._segment_records:
+            try:
+                total_bytes += path.stat().st_size
+            except OSError:
+                pass
+        return {
+            **self._stats,
+            "depth": sum(self._segment_records.values()),
+            "segments": len(self._segment_records),
+            "bytes": total_bytes,
+            "oldest_age_seconds": round(time.time() - oldest_ts, 3) if oldest_ts else 0,
+        }
+
+    async def stop(self) -> None:
+        """Stop background tasks and make the active segment durable"""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._seal_active()
+        if self._lock_file is not None:
+            # Releasing the lock lets the next worker adopt the remaining segments
+            self._lock_file.close()
+            self._lock_file = None
+        logger.info("Billing spool stopped")
+
+
+# Global billing spool instance
+billing_spool = BillingSpool(async_rabbitmq_publisher)
@@ -0,0 +1,309 @@
+"""
+Tool plan utility - Compile tool configuration into reusable execution plans
+"""
+import ast
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Placeholder pattern for path templates, e.g. /users/{user_id}
+PATH_PLACEHOLDER_PATTERN = re.compile(r"\{([^{}]+)\}")
+
+# HTTP methods that carry a request body
+BODY_METHODS = ("POST", "PUT", "PATCH")
+
+DEFAULT_USER_AGENT = "MCP Tool Server (XPack)"
+
+
+def parse_param_definitions(params_str: str, param_type: str, tool_name: str = "") -> list:
+    """
+    Safely parse parameter string that might be in JSON or Python dict format
+
+    Args:
+        params_str: Parameter string to parse
+        param_type: Type of parameters (e.g., 'query', 'path', 'body')
+        tool_name: Tool name for logging
+
+    Returns:
+        list: Parsed parameters or empty list if parsing fails
+    """
+    if not params_str or params_str.strip() == '':
+        return []
+
+    # Remove any surrounding whitespace
+    params_str = params_str.strip()
+
+    # Strategy 1: Standard JSON format (with double quotes)
+    try:
+        return _wrap_params(json.loads(params_str), param_type, tool_name)
+    except json.JSONDecodeError:
+        pass  # Try next strategy
+
+    # Strategy 2: Python literal format (with single quotes)
+    try:
+        return _wrap_params(ast.literal_eval(params_str), param_type, tool_name)
+    except (ValueError, SyntaxError):
+        pass  # Try next strategy
+
+    # Strategy 3: Try to convert Python format to JSON format
+    try:
+        json_str = params_str.replace("'", '"').replace('True', 'true').replace('False', 'false').replace('None', 'null')
+        return _wrap_params(json.loads(json_str), param_type, tool_name)
+    except json.JSONDecodeError:
+        pass  # All strategies failed
+
+    # If all strategies fail, log the error
+    logger.warning(f"Failed to parse {param_type} parameters for {tool_name}. Data: {params_str[:100]}...")
+    return []
+
+
+def _wrap_params(result: Any, param_type: str, tool_name: str) -> list:
+    """Normalize parsed parameter definitions to a list"""
+    if isinstance(result, list):
+        return result
+    if isinstance(result, dict):
+        # If it's a single dict, wrap it in a list
+        return [result]
+    logger.warning(f"Expected list or dict but got {type(result)} for {param_type} parameters in {tool_name}")
+    return []
+
+
+@dataclass(frozen=True)
+class ToolPlan:
+    """Pre-compiled execution plan for a single tool revision"""
+    tool_id: str
+    name: str
+    description: str
+    method: str
+    # URL template split into (is_placeholder, text) segments
+    url_segments: Tuple[Tuple[bool, str], ...]
+    path_param_names: frozenset
+    header_param_names: Tuple[str, ...]
+    query_param_names: Tuple[str, ...]
+    # None means the tool never sends a request body
+    body_field_names: Optional[Tuple[str, ...]]
+    # Headers that do not depend on arguments (User-Agent and service auth)
+    static_headers: Dict[str, str] = field(default_factory=dict)
+    input_schema: Dict[str, Any] = field(default_factory=dict)
+    # Per-service upstream timeout in seconds, None uses the client default
+    timeout: Optional[float] = None
+
+    def render_url(self, arguments: dict) -> str:
+        """Fill path placeholders with argument values"""
+        parts = []
+        for is_placeholder, text in self.url_segments:
+            if is_placeholder and text in self.path_param_names and text in arguments:
+                parts.append(str(arguments[text]))
+            elif is_placeholder:
+                parts.append(f"{{{text}}}")
+            else:
+                parts.append(text)
+        return "".join(parts)
+
+
+class ToolPlanCompiler:
+    """Compile McpToolApi rows and service auth info into ToolPlan objects"""
+
+    def compile(self, tool_api, auth_info: dict) -> ToolPlan:
+        """
+        Compile tool configuration into an execution plan
+
+        Args:
+            tool_api: Tool configuration (McpToolApi)
+            auth_info: Service authentication information
+
+        Returns:
+            ToolPlan: Compiled execution plan
+        """
+        name = tool_api.name
+        method = tool_api.method.value
+
+        path_params = parse_param_definitions(tool_api.path_parameters, 'path', name)
+        header_params = parse_param_definitions(getattr(tool_api, 'header_parameters', None), 'header', name)
+        query_params = parse_param_definitions(tool_api.query_parameters, 'query', name)
+        body_params = parse_param_definitions(tool_api.request_body_schema, 'body', name)
+
+        body_schema = None
+        if tool_api.request_body_schema and not body_params:
+            # If not a parameters list, try to parse as JSON schema object
+            try:
+                body_schema = json.loads(tool_api.request_body_schema)
+            except json.JSONDecodeError:
+                pass  # Already logged by parse_param_definitions
+
+        return ToolPlan(
+            tool_id=tool_api.id,
+            name=name,
+            description=tool_api.description,
+            method=method,
+            url_segments=self._split_url_template(tool_api.path, auth_info.get("base_url", "")),
+            path_param_names=frozenset(self._param_names(path_params)),
+            header_param_names=tuple(self._param_names(header_params)),
+            query_param_names=tuple(self._param_names(query_params)),
+            body_field_names=self._body_field_names(tool_api, method, body_params, body_schema),
+            static_headers=self._static_headers(auth_info),
+            input_schema=self._input_schema(path_params, query_params, body_params, body_schema),
+            timeout=auth_info.get("timeout"),
+        )
+
+    def _split_url_template(self, path: str, base_url: str) -> Tuple[Tuple[bool, str], ...]:
+        """Resolve the full URL template and split it into literal and placeholder segments"""
+        url = path or ""
+        # If tool path is not a complete URL, concatenate with base_url
+        if not url.startswith(("http://", "https://")) and base_url:
+            url = f"{base_url.rstrip('/')}/{url.lstrip('/')}"
+
+        segments = []
+        position = 0
+        for match in PATH_PLACEHOLDER_PATTERN.finditer(url):
+            if match.start() > position:
+                segments.append((False, url[position:match.start()]))
+            segments.append((True, match.group(1)))
+            position = match.end()
+        if position < len(url):
+            segments.append((False, url[position:]))
+        return tuple(segments)
+
+    def _param_names(self, params: list) -> List[str]:
+        """Extract parameter names from parsed definitions"""
+        return [param["name"] for param in params if isinstance(param, dict) and "name" in param]
+
+    def _body_field_names(self, tool_api, method: str, body_params: list, body_schema: Any) -> Optional[Tuple[str, ...]]:
+        """Resolve the set of argument names that go into the request body"""
+        if not tool_api.request_body_schema or method not in BODY_METHODS:
+            return None
+        if body_params:
+            return tuple(self._param_names(body_params))
+        if isinstance(body_schema, dict) and "properties" in body_schema:
+            return tuple(body_schema["properties"])
+        return None
+
+    def _static_headers(self, auth_info: dict) -> Dict[str, str]:
+        """Build headers that are identical for every call of the tool"""
+        headers = {"User-Agent": DEFAULT_USER_AGENT}
+        if auth_info.get("auth_method", "free") != "free":
+            auth_header = auth_info.get("auth_header")
+            auth_token = auth_info.get("auth_token")
+            if auth_header and auth_token:
+                headers[auth_header] = auth_token
+        return headers
+
+    def _input_schema(self, path_params: list, query_params: list, body_params: list, body_schema: Any) -> Dict[str, Any]:
+        """Build input definition in JSON Schema format"""
+        schema = {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+        self._add_schema_params(schema, path_params, "Path")
+        self._add_schema_params(schema, query_params, "Query")
+        if body_params:
+            self._add_schema_params(schema, body_params, "Body")
+        elif isinstance(body_schema, dict) and "properties" in body_schema:
+            schema["properties"].update(body_schema["properties"])
+            if "required" in body_schema:
+                schema["required"].extend(body_schema["required"])
+        return schema
+
+    def _add_schema_params(self, schema: dict, params: list, label: str) -> None:
+        """Add parameter definitions to JSON Schema properties"""
+        for param in params:
+            if not isinstance(param, dict) or "name" not in param:
+                continue
+            # Handle both direct type and schema.type formats
+            param_type = "string"  # default
+            if "type" in param:
+                param_type = param["type"]
+            elif "schema" in param and isinstance(param["schema"], dict) and "type" in param["schema"]:
+                param_type = param["schema"]["type"]
+
+            schema["properties"][param["name"]] = {
+                "type": param_type,
+                "description": param.get("description", f"{label} parameter: {param['name']}")
+            }
+            if param.get("required", False):
+                schema["required"].append(param["name"])
+
+
+class ToolPlanCache:
+    """
+    Bounded LRU cache of compiled tool plans
+
+    Plans are keyed by tool ID and revision (tool and service updated_at),
+    so an edited tool or service automatically compiles a fresh plan.
+    """
+
+    def __init__(self, max_size: int = 2048):
+        self.max_size = max_size
+        self.compiler = ToolPlanCompiler()
+        self._plans: "OrderedDict[tuple, ToolPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_plan(self, tool_api, service=None) -> ToolPlan:
+        """
+        Get compiled plan for tool, compiling it on first use
+
+        Args:
+            tool_api: Tool configuration (McpToolApi)
+            service: Owning service (McpService), optional
+
+        Returns:
+            ToolPlan: Compiled execution plan
+        """
+        cache_key = (
+            tool_api.id,
+            tool_api.updated_at,
+            service.id if service else None,
+            service.updated_at if service else None,
+        )
+        with self._lock:
+            plan = self._plans.get(cache_key)
+            if plan is not None:
+                self._plans.move_to_end(cache_key)
+                return plan
+
+        plan = self.compiler.compile(tool_api, build_auth_info(service))
+        logger.debug(f"Compiled tool plan - Tool: {tool_api.name}, ID: {tool_api.id}")
+
+        with self._lock:
+            self._plans[cache_key] = plan
+            self._plans.move_to_end(cache_key)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        """Drop all compiled plans"""
+        with self._lock:
+            self._plans.clear()
+
+
+def build_auth_info(service) -> dict:
+    """
+    Build service authentication information
+
+    Args:
+        service: MCP service model, may be None
+
+    Returns:
+        dict: Dictionary containing base_url and authentication information
+    """
+    if not service:
+        return {}
+    return {
+        "base_url": service.base_url or "",
+        "auth_method": service.auth_method.value if service.auth_method else "free",
+        "auth_header": service.auth_header or "",
+        "auth_token": service.auth_token or "",
+        "timeout": float(service.request_timeout) if getattr(service, "request_timeout", None) else None,
+    }
+
+
+# Global tool plan cache instance
+tool_plan_cache = ToolPlanCache()
@@ -0,0 +1,140 @@
+"""
+Upstream client registry - Share long-lived HTTP clients per upstream host
+"""
+import asyncio
+import importlib.util
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+from services.common.config import Config
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class UpstreamClientRegistry:
+    """
+    Process-wide registry of pooled httpx clients
+
+    One AsyncClient is kept per (scheme, host, port), so keep-alive connections
+    and TLS sessions are reused across tool calls. Clients carry no auth state;
+    auth headers are passed per request, which makes sharing them across users safe.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str, int], httpx.AsyncClient] = {}
+        self._lock = asyncio.Lock()
+        self._http2 = self._resolve_http2()
+
+    def _resolve_http2(self) -> bool:
+        """Enable HTTP/2 only when configured and the h2 package is available"""
+        if not Config.UPSTREAM_HTTP2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("UPSTREAM_HTTP2 is enabled but the 'h2' package is not installed, falling back to HTTP/1.1")
+            return False
+        return True
+
+    @staticmethod
+    def _origin(url: str) -> Tuple[str, str, int]:
+        """Build registry key from request URL"""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port or DEFAULT_PORTS.get(scheme, 0)
+        return scheme, host, port
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create pooled client with configured limits"""
+        limits = httpx.Limits(
+            max_connections=Config.UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=Config.UPSTREAM_KEEPALIVE_EXPIRY,
+        )
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=httpx.Timeout(Config.UPSTREAM_TIMEOUT),
+            http2=self._http2,
+            follow_redirects=True,
+        )
+
+    async def get_client(self, url: str) -> httpx.AsyncClient:
+        """
+        Get shared client for the origin of the given URL
+
+        Args:
+            url: Request URL
+
+        Returns:
+            httpx.AsyncClient: Pooled client
+        """
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is not None and not client.is_closed:
+            return client
+
+        async with self._lock:
+            client = self._clients.get(origin)
+            if client is None or client.is_closed:
+                client = self._create_client()
+                self._clients[origin] = client
+                logger.info(f"Created upstream client - Origin: {origin[0]}://{origin[1]}:{origin[2]}, HTTP/2: {self._http2}")
+            return client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        """
+        Send request through the pooled client of the URL origin
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers (including per-request auth)
+            params: Query parameters
+            json: JSON request body
+            timeout: Per-request timeout in seconds, defaults to UPSTREAM_TIMEOUT
+
+        Returns:
+            httpx.Response: Upstream response
+        """
+        client = await self.get_client(url)
+        request_timeout = httpx.Timeout(timeout) if timeout else httpx.USE_CLIENT_DEFAULT
+        return await client.request(method, url, headers=headers, params=params, json=json, timeout=request_timeout)
+
+    def get_stats(self) -> Dict:
+        """
+        Get registry statistics
+
+        Returns:
+            Dict: Statistics information
+        """
+        return {
+            "http2": self._http2,
+            "origins": [f"{scheme}://{host}:{port}" for scheme, host, port in self._clients],
+            "total_clients": len(self._clients),
+        }
+
+    async def aclose(self) -> None:
+        """Close all pooled clients"""
+        async with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing upstream client: {str(e)}")
+        logger.info(f"Closed {len(clients)} upstream clients")
+
+
+# Global upstream client registry instance
+upstream_client_registry = UpstreamClientRegistry()
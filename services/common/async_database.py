@@ -0,0 +1,39 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from .config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Build async database engine configuration (aiomysql driver)
+async_engine_config = {
+    "url": f"mysql+aiomysql://{Config.MYSQL_USER}:{Config.MYSQL_PASSWORD}@{Config.MYSQL_HOST}:{Config.MYSQL_PORT}/{Config.MYSQL_DB}",
+    "echo": Config.DEBUG,
+    "pool_size": Config.DB_POOL_SIZE,
+    "max_overflow": Config.DB_MAX_OVERFLOW,
+    "pool_timeout": Config.DB_POOL_TIMEOUT,
+    "pool_recycle": Config.DB_POOL_RECYCLE,
+    "pool_pre_ping": Config.DB_POOL_PRE_PING,
+    # MySQL specific settings
+    "connect_args": {
+        "connect_timeout": 10,
+        "autocommit": False,
+        "charset": "utf8mb4",
+    },
+}
+
+logger.info(f"Async database pool config: pool_size={Config.DB_POOL_SIZE}, max_overflow={Config.DB_MAX_OVERFLOW}")
+
+async_engine = create_async_engine(**async_engine_config)
+# Keep loaded attributes after commit so models can be cached and returned safely
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """Close all pooled async connections"""
+    await async_engine.dispose()
+    logger.info("Async database engine disposed")
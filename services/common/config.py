@@ -38,12 +38,94 @@ class Config:
     REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
     REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "redis")
     REDIS_DB = int(os.getenv("REDIS_DB", 0))
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 200))
+    # Seconds a caller waits for a free pooled connection before failing (standalone mode)
+    REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
+    # Connection mode: standalone, sentinel or cluster
+    REDIS_MODE = os.getenv("REDIS_MODE", "standalone").lower()
+    # Sentinel mode: comma-separated host:port sentinels and the monitored master name
+    REDIS_SENTINELS = os.getenv("REDIS_SENTINELS", "")
+    REDIS_SENTINEL_MASTER = os.getenv("REDIS_SENTINEL_MASTER", "mymaster")
+    REDIS_SENTINEL_PASSWORD = os.getenv("REDIS_SENTINEL_PASSWORD", "")
+    # Cluster mode: comma-separated host:port startup nodes, REDIS_HOST:REDIS_PORT when empty
+    REDIS_CLUSTER_NODES = os.getenv("REDIS_CLUSTER_NODES", "")
+
+    # Process-local cache in front of Redis for model lookups, evicted through the invalidation channel
+    CACHE_L1_ENABLED = os.getenv("CACHE_L1_ENABLED", "true").lower() == "true"
+    CACHE_L1_TTL = int(os.getenv("CACHE_L1_TTL", 30))
+    CACHE_L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", 1000))
+    # Per-namespace max entries, namespace is the cache key without its last ":" segment
+    CACHE_L1_NAMESPACE_LIMITS = os.getenv(
+        "CACHE_L1_NAMESPACE_LIMITS", "xpack:user_apikey=10000,xpack:mcp_service:id=2000,xpack:mcp_service:slug=2000"
+    )
+    CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "xpack:cache:invalidate")
+    # CacheUtils.get_or_load_async: seconds an expired entry may still be served while it is reloaded,
+    # XFetch early refresh factor (0 disables it), and the cross-process load lock TTL in seconds
+    CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", 60))
+    CACHE_XFETCH_BETA = float(os.getenv("CACHE_XFETCH_BETA", 1.0))
+    CACHE_LOAD_LOCK_TTL = float(os.getenv("CACHE_LOAD_LOCK_TTL", 5))
+    # Entity caches (services, prices, API keys) are invalidated through tag sets on every admin write,
+    # so they can be kept for hours. Tag sets must outlive the longest tagged entry.
+    CACHE_ENTITY_TTL = int(os.getenv("CACHE_ENTITY_TTL", 6 * 3600))
+    CACHE_TAG_TTL = int(os.getenv("CACHE_TAG_TTL", 24 * 3600))
 
     RABBITMQ_HOST = os.getenv("RABBITMQ_HOST", "localhost")
     RABBITMQ_PORT = int(os.getenv("RABBITMQ_PORT", 5672))
     RABBITMQ_USER = os.getenv("RABBITMQ_USER", "guest")
     RABBITMQ_PASSWORD = os.getenv("RABBITMQ_PASSWORD", "guest")
     RABBITMQ_VHOST = os.getenv("RABBITMQ_VHOST", "/")
+    # Async publisher buffering (api_service)
+    RABBITMQ_PUBLISH_BATCH_SIZE = int(os.getenv("RABBITMQ_PUBLISH_BATCH_SIZE", 100))
+    RABBITMQ_PUBLISH_FLUSH_INTERVAL = float(os.getenv("RABBITMQ_PUBLISH_FLUSH_INTERVAL", 0.05))
+    RABBITMQ_PUBLISH_BUFFER_SIZE = int(os.getenv("RABBITMQ_PUBLISH_BUFFER_SIZE", 10000))
+
+    # Upstream HTTP client pool settings (api_service tool calls)
+    UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", 100))
+    UPSTREAM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", 20))
+    UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", 30))
+    UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", 30))
+    UPSTREAM_HTTP2 = os.getenv("UPSTREAM_HTTP2", "false").lower() == "true"
+
+    # Billing reservation settings (api_service)
+    # Max concurrent billed tool calls per API key, 0 disables the limit
+    BILLING_MAX_INFLIGHT_PER_KEY = int(os.getenv("BILLING_MAX_INFLIGHT_PER_KEY", 32))
+    # Lifetime of an unsettled reservation in seconds
+    BILLING_RESERVATION_TTL = int(os.getenv("BILLING_RESERVATION_TTL", 600))
+
+    # Billing consumer lanes, messages are sharded by user_id (api_service and admin_service must match)
+    BILLING_CONSUMER_LANES = int(os.getenv("BILLING_CONSUMER_LANES", 1))
+    # Run the consumer inside the admin service; disable when using `python -m services.admin_service.consumers`
+    BILLING_CONSUMER_EMBEDDED = os.getenv("BILLING_CONSUMER_EMBEDDED", "true").lower() == "true"
+    # Standalone consumer process: lanes it consumes (comma-separated, all when empty), health port and drain timeout
+    BILLING_CONSUMER_LANE_IDS = os.getenv("BILLING_CONSUMER_LANE_IDS", "")
+    BILLING_CONSUMER_PORT = int(os.getenv("BILLING_CONSUMER_PORT", 8003))
+    BILLING_CONSUMER_DRAIN_TIMEOUT = float(os.getenv("BILLING_CONSUMER_DRAIN_TIMEOUT", 30))
+    # /healthz reports unhealthy when a lane with a backlog lags more than this many seconds
+    BILLING_CONSUMER_MAX_LAG = float(os.getenv("BILLING_CONSUMER_MAX_LAG", 300))
+
+    # Billing consumer batching (admin_service)
+    BILLING_BATCH_SIZE = int(os.getenv("BILLING_BATCH_SIZE", 100))
+    # Max seconds a partial batch waits before it is processed
+    BILLING_BATCH_MAX_WAIT = float(os.getenv("BILLING_BATCH_MAX_WAIT", 0.5))
+    # Failed messages are retried with exponential backoff, then moved to the dead-letter queue
+    BILLING_RETRY_TIMES = int(os.getenv("BILLING_RETRY_TIMES", 3))
+    BILLING_RETRY_BASE_DELAY = int(os.getenv("BILLING_RETRY_BASE_DELAY", 5))
+
+    # Local spool for billing messages that could not be published (api_service)
+    BILLING_SPOOL_DIR = os.getenv("BILLING_SPOOL_DIR", "data/api_service/billing_spool")
+    BILLING_SPOOL_SEGMENT_BYTES = int(os.getenv("BILLING_SPOOL_SEGMENT_BYTES", 16 * 1024 * 1024))
+    BILLING_SPOOL_FSYNC_INTERVAL = float(os.getenv("BILLING_SPOOL_FSYNC_INTERVAL", 0.2))
+    BILLING_SPOOL_DRAIN_INTERVAL = float(os.getenv("BILLING_SPOOL_DRAIN_INTERVAL", 5))
+
+    # Seconds between reconciliations of the platform overview counters with MySQL (admin_service)
+    PLATFORM_STATS_RECONCILE_INTERVAL = int(os.getenv("PLATFORM_STATS_RECONCILE_INTERVAL", 600))
+
+    # Seconds a serialized marketplace catalog snapshot is kept; writes switch to a new catalog version (admin_service)
+    CATALOG_SNAPSHOT_TTL = int(os.getenv("CATALOG_SNAPSHOT_TTL", 3600))
+    # Marketplace keyword search: in-process index, MySQL FULLTEXT when disabled or failing (admin_service)
+    CATALOG_SEARCH_INDEX_ENABLED = os.getenv("CATALOG_SEARCH_INDEX_ENABLED", "true").lower() == "true"
+    CATALOG_SEARCH_SYNC_INTERVAL = int(os.getenv("CATALOG_SEARCH_SYNC_INTERVAL", 60))
+    CATALOG_SEARCH_REBUILD_INTERVAL = int(os.getenv("CATALOG_SEARCH_REBUILD_INTERVAL", 3600))
 
     # No authentication required paths
     # Can be overridden with NO_AUTH_PATHS environment variable (comma-separated)
@@ -53,6 +53,7 @@ class McpService(Base):
     )
     enabled: Mapped[int] = mapped_column(Integer, nullable=True, comment="Service status: 0=disabled, 1=enabled")
     tags: Mapped[str] = mapped_column(String, nullable=True, comment="Tags")
+    request_timeout: Mapped[int] = mapped_column(Integer, nullable=True, comment="Upstream request timeout in seconds")
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=True,
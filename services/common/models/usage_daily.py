@@ -0,0 +1,33 @@
+from sqlalchemy import String, Integer, BigInteger, Numeric, Date, DateTime
+from sqlalchemy.sql import func
+from sqlalchemy.orm import Mapped, mapped_column
+from services.common.models.base import Base
+from datetime import date, datetime
+
+
+class UsageDaily(Base):
+    """Daily call usage rollup, maintained incrementally by the billing consumer"""
+
+    __tablename__ = "usage_daily"
+
+    stats_day: Mapped[date] = mapped_column(Date, primary_key=True, comment="Call day (call start time)")
+    apikey_id: Mapped[str] = mapped_column(String(36), primary_key=True, default="", comment="API key ID, empty when unknown")
+    service_id: Mapped[str] = mapped_column(String(36), primary_key=True, comment="MCP service ID")
+    user_id: Mapped[str] = mapped_column(String(36), primary_key=True, comment="User ID")
+    call_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="Number of calls")
+    success_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="Number of successful calls")
+    amount: Mapped[float] = mapped_column(Numeric(16, 4), nullable=False, default=0.0000, comment="Sum of unit prices")
+    total_latency_ms: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, comment="Sum of call durations in milliseconds")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=True,
+        server_default=func.current_timestamp(),
+        comment="Creation time",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=True,
+        server_default=func.current_timestamp(),
+        server_onupdate=func.current_timestamp(),
+        comment="Update time",
+    )
@@ -1,5 +1,9 @@
+import asyncio
+import time
 import pika
+import aio_pika
 import logging
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 from .config import Config
 
 logger = logging.getLogger(__name__)
@@ -78,4 +82,234 @@ class RabbitMQClient:
             logger.warning(f"Error closing RabbitMQ connection: {str(e)}")
 
 
-rabbitmq_client = RabbitMQClient()
+# Buffered message: (queue, body, persistent)
+PendingMessage = Tuple[str, str, bool]
+
+
+class AsyncRabbitMQPublisher:
+    """
+    Asyncio RabbitMQ publisher for event-loop code (api_service)
+
+    One robust connection and one confirm-mode channel per worker. Messages are
+    put on a bounded in-memory buffer and published in batches by a background
+    flusher, either when the batch is full or when the flush interval elapses.
+    The buffer bound provides backpressure: if the broker blocks or is slow to
+    confirm, publish() waits instead of growing memory without limit.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = Config.RABBITMQ_PUBLISH_BATCH_SIZE,
+        flush_interval: float = Config.RABBITMQ_PUBLISH_FLUSH_INTERVAL,
+        buffer_size: int = Config.RABBITMQ_PUBLISH_BUFFER_SIZE,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.connection: Optional[aio_pika.abc.AbstractRobustConnection] = None
+        self.channel: Optional[aio_pika.abc.AbstractChannel] = None
+        # Called with the failed batch when publishing is not confirmed
+        self.failure_handler: Optional[Callable[[List[PendingMessage]], Awaitable[None]]] = None
+        self._buffer: Optional[asyncio.Queue] = None
+        self._declared_queues: set = set()
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._flusher_task: Optional[asyncio.Task] = None
+        # Batch the flusher took off the buffer and has not finished publishing or handing to failure_handler
+        self._inflight: List[PendingMessage] = []
+        self._stats: Dict[str, int] = {"published": 0, "failed": 0, "batches": 0}
+
+    async def start(self, queues: Iterable[str] = ()) -> None:
+        """
+        Start the background flusher and declare queues
+
+        A broker that is unreachable at startup is not fatal; the flusher
+        reconnects before the next batch.
+
+        Args:
+            queues: Durable queues to declare once at startup
+        """
+        if self._flusher_task:
+            return
+        self._buffer = asyncio.Queue(maxsize=self.buffer_size)
+        self._connect_lock = asyncio.Lock()
+        self._declared_queues = set()
+        try:
+            await self._ensure_channel()
+            for queue in queues:
+                await self._declare_queue(queue)
+        except Exception as e:
+            logger.error(f"RabbitMQ publisher could not connect at startup, will retry on flush: {str(e)}")
+        self._flusher_task = asyncio.create_task(self._flush_loop())
+        logger.info(f"RabbitMQ publisher started - Batch size: {self.batch_size}, Flush interval: {self.flush_interval}s")
+
+    async def publish(self, queue: str, message: str, persistent: bool = True) -> None:
+        """
+        Buffer message for publishing, waits when the buffer is full
+
+        Args:
+            queue: Target queue
+            message: Message body
+            persistent: Whether the message is persisted by the broker
+        """
+        if self._buffer is None:
+            raise Exception("RabbitMQ publisher is not started")
+        await self._buffer.put((queue, message, persistent))
+
+    async def _ensure_channel(self) -> aio_pika.abc.AbstractChannel:
+        """Open connection and confirm-mode channel if needed"""
+        if self.channel and not self.channel.is_closed:
+            return self.channel
+        async with self._connect_lock:
+            if self.channel and not self.channel.is_closed:
+                return self.channel
+            if not self.connection or self.connection.is_closed:
+                self.connection = await aio_pika.connect_robust(
+                    host=Config.RABBITMQ_HOST,
+                    port=Config.RABBITMQ_PORT,
+                    login=Config.RABBITMQ_USER,
+                    password=Config.RABBITMQ_PASSWORD,
+                    virtualhost=Config.RABBITMQ_VHOST,
+                    heartbeat=600,
+                )
+            self.channel = await self.connection.channel(publisher_confirms=True)
+            logger.info("RabbitMQ async publisher connection established successfully")
+            return self.channel
+
+    async def _declare_queue(self, queue: str) -> None:
+        """Declare durable queue once per publisher"""
+        if queue in self._declared_queues:
+            return
+        channel = await self._ensure_channel()
+        await channel.declare_queue(queue, durable=True)
+        self._declared_queues.add(queue)
+
+    async def _next_batch(self) -> List[PendingMessage]:
+        """Wait for the first message, then collect until batch is full or interval elapses"""
+        # Collected on self, so close() still publishes a batch the cancelled flusher was holding
+        self._inflight = batch = [await self._buffer.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._buffer.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush_loop(self) -> None:
+        """Background flusher"""
+        while True:
+            batch = await self._next_batch()
+            await self._flush(batch)
+            self._inflight = []
+
+    async def publish_confirmed(self, batch: List[PendingMessage]) -> List[PendingMessage]:
+        """
+        Publish batch directly and wait for broker confirms, bypassing the buffer
+
+        Args:
+            batch: Messages to publish
+
+        Returns:
+            List[PendingMessage]: Messages that were not confirmed
+        """
+        try:
+            channel = await self._ensure_channel()
+            for queue in {item[0] for item in batch}:
+                await self._declare_queue(queue)
+
+            # Confirms are pipelined: all messages are sent before waiting on any of them
+            results = await asyncio.gather(
+                *[
+                    channel.default_exchange.publish(
+                        aio_pika.Message(
+                            body=message.encode("utf-8"),
+                            delivery_mode=aio_pika.DeliveryMode.PERSISTENT if persistent else aio_pika.DeliveryMode.NOT_PERSISTENT,
+                        ),
+                        routing_key=queue,
+                    )
+                    for queue, message, persistent in batch
+                ],
+                return_exceptions=True,
+            )
+        except Exception as e:
+            logger.error(f"RabbitMQ batch publish failed ({len(batch)} messages): {str(e)}")
+            return list(batch)
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        failed = [item for item, result in zip(batch, results) if isinstance(result, BaseException)]
+        self._stats["batches"] += 1
+        self._stats["published"] += len(batch) - len(failed)
+        if errors:
+            logger.error(f"RabbitMQ publish not confirmed for {len(failed)}/{len(batch)} messages: {str(errors[0])}")
+        return failed
+
+    async def _flush(self, batch: List[PendingMessage]) -> None:
+        """Publish buffered batch, handing unconfirmed messages to the failure handler"""
+        failed = await self.publish_confirmed(batch)
+        if failed:
+            await self._handle_failure(failed)
+        else:
+            logger.debug(f"Published batch of {len(batch)} messages")
+
+    async def _handle_failure(self, batch: List[PendingMessage]) -> None:
+        """Hand failed messages to the failure handler, or drop them"""
+        self._stats["failed"] += len(batch)
+        if self.failure_handler:
+            try:
+                await self.failure_handler(batch)
+                return
+            except Exception as e:
+                logger.error(f"RabbitMQ publish failure handler raised: {str(e)}", exc_info=True)
+        logger.error(f"Dropped {len(batch)} unpublished messages")
+
+    def get_stats(self) -> Dict:
+        """
+        Get publisher statistics
+
+        Returns:
+            Dict: Statistics information
+        """
+        return {
+            **self._stats,
+            "buffered": self._buffer.qsize() if self._buffer else 0,
+            "connected": bool(self.channel and not self.channel.is_closed),
+        }
+
+    async def close(self) -> None:
+        """
+        Flush buffered messages and close connection
+
+        The batch held by the cancelled flusher is published again with the
+        buffered messages; if it was already confirmed, the billing consumer
+        drops the duplicates by call log ID.
+        """
+        if self._flusher_task:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+
+        # Flush the flusher's batch and whatever is still buffered
+        remaining, self._inflight = self._inflight, []
+        while self._buffer and not self._buffer.empty():
+            remaining.append(self._buffer.get_nowait())
+        for start in range(0, len(remaining), self.batch_size):
+            await self._flush(remaining[start:start + self.batch_size])
+
+        try:
+            if self.connection and not self.connection.is_closed:
+                await self.connection.close()
+                logger.info("RabbitMQ async publisher connection closed")
+        except Exception as e:
+            logger.warning(f"Error closing RabbitMQ async publisher connection: {str(e)}")
+        self.connection = None
+        self.channel = None
+
+
+# Global async RabbitMQ publisher instance, started by the api_service lifespan
+async_rabbitmq_publisher = AsyncRabbitMQPublisher()
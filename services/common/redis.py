@@ -1,25 +1,151 @@
+import json
 import redis
-from typing import Optional, Any
+import redis.asyncio as aioredis
+from redis.cluster import RedisCluster, ClusterNode
+from redis.sentinel import Sentinel
+from redis.asyncio.cluster import RedisCluster as AsyncRedisCluster, ClusterNode as AsyncClusterNode
+from redis.asyncio.sentinel import Sentinel as AsyncSentinel
+from typing import Optional, Any, List, Tuple
 from .config import Config
 
 
+def serialize_value(value: Any) -> str:
+    """Serialize value for text storage, shared by sync and async clients"""
+    if isinstance(value, (dict, list)):
+        # Complex values are stored as JSON, typed values go through cache_codecs
+        return json.dumps(value)
+    elif isinstance(value, str):
+        return value
+    # For other types, convert to string
+    return str(value)
+
+
+def parse_nodes(value: str) -> List[Tuple[str, int]]:
+    """Parse "host:port,host:port" into (host, port) pairs"""
+    nodes = []
+    for item in value.split(","):
+        host, _, port = item.strip().rpartition(":")
+        if host and port.isdigit():
+            nodes.append((host, int(port)))
+    return nodes
+
+
+def cluster_nodes() -> List[Tuple[str, int]]:
+    """Cluster startup nodes, REDIS_HOST:REDIS_PORT when none are configured"""
+    return parse_nodes(Config.REDIS_CLUSTER_NODES) or [(Config.REDIS_HOST, Config.REDIS_PORT)]
+
+
+def connection_kwargs(decode_responses: bool) -> dict:
+    """Connection options shared by every connection mode"""
+    return {
+        "password": Config.REDIS_PASSWORD,
+        "decode_responses": decode_responses,
+        "socket_connect_timeout": 5,
+        "socket_timeout": 5,
+        "health_check_interval": 30,
+    }
+
+
+def sentinel_kwargs() -> dict:
+    """Options of the connections to the sentinels themselves"""
+    return {"password": Config.REDIS_SENTINEL_PASSWORD or None, "socket_timeout": 5}
+
+
+def create_redis(decode_responses: bool) -> redis.Redis:
+    """
+    Create a sync Redis client for the configured connection mode
+
+    Standalone clients share a BlockingConnectionPool: when all
+    REDIS_MAX_CONNECTIONS connections are busy, callers wait up to
+    REDIS_POOL_TIMEOUT seconds instead of opening more.
+
+    Args:
+        decode_responses: Return str (True) or bytes (False)
+
+    Returns:
+        redis.Redis: Client, a RedisCluster in cluster mode
+    """
+    if Config.REDIS_MODE == "cluster":
+        return RedisCluster(
+            startup_nodes=[ClusterNode(host, port) for host, port in cluster_nodes()],
+            max_connections=Config.REDIS_MAX_CONNECTIONS,
+            **connection_kwargs(decode_responses),
+        )
+    if Config.REDIS_MODE == "sentinel":
+        sentinel = Sentinel(parse_nodes(Config.REDIS_SENTINELS), sentinel_kwargs=sentinel_kwargs())
+        return sentinel.master_for(
+            Config.REDIS_SENTINEL_MASTER,
+            db=Config.REDIS_DB,
+            max_connections=Config.REDIS_MAX_CONNECTIONS,
+            retry_on_timeout=True,
+            **connection_kwargs(decode_responses),
+        )
+    pool = redis.BlockingConnectionPool(
+        host=Config.REDIS_HOST,
+        port=Config.REDIS_PORT,
+        db=Config.REDIS_DB,
+        max_connections=Config.REDIS_MAX_CONNECTIONS,
+        timeout=Config.REDIS_POOL_TIMEOUT,
+        retry_on_timeout=True,
+        **connection_kwargs(decode_responses),
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def create_async_redis(decode_responses: bool) -> aioredis.Redis:
+    """
+    Async variant of create_redis for event-loop code
+
+    Connections are opened lazily on first use, so clients can be created at
+    import time.
+
+    Args:
+        decode_responses: Return str (True) or bytes (False)
+
+    Returns:
+        aioredis.Redis: Client, a RedisCluster in cluster mode
+    """
+    if Config.REDIS_MODE == "cluster":
+        return AsyncRedisCluster(
+            startup_nodes=[AsyncClusterNode(host, port) for host, port in cluster_nodes()],
+            max_connections=Config.REDIS_MAX_CONNECTIONS,
+            **connection_kwargs(decode_responses),
+        )
+    if Config.REDIS_MODE == "sentinel":
+        sentinel = AsyncSentinel(parse_nodes(Config.REDIS_SENTINELS), sentinel_kwargs=sentinel_kwargs())
+        return sentinel.master_for(
+            Config.REDIS_SENTINEL_MASTER,
+            db=Config.REDIS_DB,
+            max_connections=Config.REDIS_MAX_CONNECTIONS,
+            retry_on_timeout=True,
+            **connection_kwargs(decode_responses),
+        )
+    pool = aioredis.BlockingConnectionPool(
+        host=Config.REDIS_HOST,
+        port=Config.REDIS_PORT,
+        db=Config.REDIS_DB,
+        max_connections=Config.REDIS_MAX_CONNECTIONS,
+        timeout=Config.REDIS_POOL_TIMEOUT,
+        retry_on_timeout=True,
+        **connection_kwargs(decode_responses),
+    )
+    return aioredis.Redis(connection_pool=pool)
+
+
 class RedisClient:
-    """Redis client wrapper providing basic Redis operations"""
+    """
+    Redis client wrapper providing basic Redis operations
+
+    Use the process-wide redis_client instance (get_redis_client in FastAPI
+    dependencies); every instance opens its own connection pools.
+    """
     
     def __init__(self):
         """Initialize Redis connection"""
         try:
-            self.client = redis.Redis(
-                host=Config.REDIS_HOST,
-                port=Config.REDIS_PORT,
-                password=Config.REDIS_PASSWORD,
-                db=Config.REDIS_DB,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True,
-                health_check_interval=30
-            )
+            self.client = create_redis(decode_responses=True)
+            # Binary client for codec-serialized values, see services.common.utils.cache_codec
+            self.binary_client = create_redis(decode_responses=False)
             # Test connection
             self.client.ping()
         except redis.ConnectionError as e:
@@ -30,37 +156,14 @@ class RedisClient:
     def set(self, key: str, value: Any, ex: Optional[int] = None) -> Any:
         """Set key-value pair with automatic serialization"""
         try:
-            # Handle different value types
-            if isinstance(value, (dict, list)):
-                # For complex objects, use pickle serialization
-                import pickle
-                serialized_value = pickle.dumps(value).decode('latin1')
-                return self.client.set(key, serialized_value, ex=ex)
-            elif isinstance(value, str):
-                return self.client.set(key, value, ex=ex)
-            else:
-                # For other types, convert to string
-                return self.client.set(key, str(value), ex=ex)
+            return self.client.set(key, serialize_value(value), ex=ex)
         except redis.RedisError as e:
             raise Exception(f"Redis SET operation failed: {e}")
 
     def get(self, key: str) -> Any:
-        """Get value by key with automatic deserialization"""
-        try:
-            result = self.client.get(key)
-            if result is not None:
-                # Try to deserialize if it's pickled data
-                try:
-                    import pickle
-                    # Ensure result is string before encoding
-                    if isinstance(result, str):
-                        return pickle.loads(result.encode('latin1'))
-                    else:
-                        return result
-                except:
-                    # If not pickled, return as is
-                    return result
-            return None
+        """Get string value by key"""
+        try:
+            return self.client.get(key)
         except redis.RedisError as e:
             raise Exception(f"Redis GET operation failed: {e}")
 
@@ -93,10 +196,25 @@ class RedisClient:
         except redis.RedisError as e:
             raise Exception(f"Redis TTL operation failed: {e}")
 
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get raw bytes by key"""
+        try:
+            return self.binary_client.get(key)
+        except redis.RedisError as e:
+            raise Exception(f"Redis GET operation failed: {e}")
+
+    def set_bytes(self, key: str, value: bytes, ex: Optional[int] = None) -> Any:
+        """Set raw bytes"""
+        try:
+            return self.binary_client.set(key, value, ex=ex)
+        except redis.RedisError as e:
+            raise Exception(f"Redis SET operation failed: {e}")
+
     def close(self):
         """Close Redis connection"""
         try:
             self.client.close()
+            self.binary_client.close()
         except Exception as e:
             # Ignore close errors
             pass
@@ -110,5 +228,119 @@ class RedisClient:
         self.close()
 
 
+class AsyncRedisClient:
+    """
+    Async Redis client wrapper for event-loop code (api_service)
+
+    Backed by one shared connection pool; connections are opened lazily on
+    first use, so the instance can be created at import time.
+    """
+
+    def __init__(self):
+        """Initialize shared connection pool"""
+        self.client = create_async_redis(decode_responses=True)
+        # Binary client for codec-serialized values, see services.common.utils.cache_codec
+        self.binary_client = create_async_redis(decode_responses=False)
+        # Cluster clients keep one pool per node instead
+        self.pool = getattr(self.client, "connection_pool", None)
+        self.binary_pool = getattr(self.binary_client, "connection_pool", None)
+
+    def pubsub(self) -> aioredis.client.PubSub:
+        """
+        Open a pub/sub session
+
+        In cluster mode the session connects to a startup node, since published
+        messages are forwarded to every node of the cluster.
+        """
+        if isinstance(self.client, AsyncRedisCluster):
+            host, port = cluster_nodes()[0]
+            return aioredis.Redis(host=host, port=port, **connection_kwargs(decode_responses=True)).pubsub()
+        return self.client.pubsub()
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None) -> Any:
+        """Set key-value pair with automatic serialization"""
+        try:
+            return await self.client.set(key, serialize_value(value), ex=ex)
+        except redis.RedisError as e:
+            raise Exception(f"Redis SET operation failed: {e}")
+
+    async def get(self, key: str) -> Any:
+        """Get string value by key"""
+        try:
+            return await self.client.get(key)
+        except redis.RedisError as e:
+            raise Exception(f"Redis GET operation failed: {e}")
+
+    async def delete(self, key: str) -> Any:
+        """Delete key"""
+        try:
+            return await self.client.delete(key)
+        except redis.RedisError as e:
+            raise Exception(f"Redis DELETE operation failed: {e}")
+
+    async def exists(self, key: str) -> bool:
+        """Check if key exists"""
+        try:
+            result = await self.client.exists(key)
+            return bool(result)
+        except redis.RedisError as e:
+            raise Exception(f"Redis EXISTS operation failed: {e}")
+
+    async def expire(self, key: str, seconds: int) -> Any:
+        """Set key expiration time"""
+        try:
+            return await self.client.expire(key, seconds)
+        except redis.RedisError as e:
+            raise Exception(f"Redis EXPIRE operation failed: {e}")
+
+    async def ttl(self, key: str) -> Any:
+        """Get remaining TTL for key"""
+        try:
+            return await self.client.ttl(key)
+        except redis.RedisError as e:
+            raise Exception(f"Redis TTL operation failed: {e}")
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get raw bytes by key"""
+        try:
+            return await self.binary_client.get(key)
+        except redis.RedisError as e:
+            raise Exception(f"Redis GET operation failed: {e}")
+
+    async def set_bytes(self, key: str, value: bytes, ex: Optional[int] = None) -> Any:
+        """Set raw bytes"""
+        try:
+            return await self.binary_client.set(key, value, ex=ex)
+        except redis.RedisError as e:
+            raise Exception(f"Redis SET operation failed: {e}")
+
+    async def ping(self) -> bool:
+        """Check connectivity"""
+        try:
+            return bool(await self.client.ping())
+        except redis.RedisError as e:
+            raise ConnectionError(f"Cannot connect to Redis server: {e}")
+
+    async def aclose(self):
+        """Close client and disconnect pooled connections"""
+        try:
+            await self.client.aclose()
+            await self.binary_client.aclose()
+            for pool in (self.pool, self.binary_pool):
+                if pool is not None:
+                    await pool.disconnect()
+        except Exception:
+            # Ignore close errors
+            pass
+
+
 # Global Redis client instance
 redis_client = RedisClient()
+
+# Global async Redis client instance
+async_redis_client = AsyncRedisClient()
+
+
+def get_redis_client() -> RedisClient:
+    """FastAPI dependency providing the process-wide Redis client"""
+    return redis_client
@@ -42,3 +42,75 @@ class RedisKeys:
     def user_apikey_key(apikey_hash: str) -> str:
         """Generate user API key cache key (using hash for security)"""
         return f"xpack:user_apikey:{apikey_hash}"
+
+    @staticmethod
+    def service_price_key(service_id: str) -> str:
+        """Generate MCP service price cache key"""
+        return f"xpack:service:price:{service_id}"
+
+    @staticmethod
+    def service_tag_key(service_id: str) -> str:
+        """Generate tag set key of the cache entries of an MCP service"""
+        return f"xpack:tag:service:{service_id}"
+
+    @staticmethod
+    def user_tag_key(user_id: str) -> str:
+        """Generate tag set key of the cache entries of a user"""
+        return f"xpack:tag:user:{user_id}"
+
+    @staticmethod
+    def cache_load_lock_key(cache_key: str) -> str:
+        """Generate cross-process load lock key of a cache entry"""
+        return f"{cache_key}:load_lock"
+
+    @staticmethod
+    def platform_stats_key() -> str:
+        """Generate platform counters hash key (total_user, total_balance, total_service)"""
+        return "xpack:platform:stats"
+
+    @staticmethod
+    def platform_daily_calls_key() -> str:
+        """Generate platform daily call count hash key (YYYY-MM-DD -> count)"""
+        return "xpack:platform:daily_calls"
+
+    @staticmethod
+    def platform_stats_reconcile_lock_key() -> str:
+        """Generate platform counters reconciliation lock key"""
+        return "xpack:platform:stats:reconcile_lock"
+
+    @staticmethod
+    def catalog_version_key() -> str:
+        """Generate marketplace catalog version key"""
+        return "xpack:catalog:version"
+
+    @staticmethod
+    def catalog_page_key(version: int, page: int, page_size: int) -> str:
+        """Generate serialized catalog page snapshot key"""
+        return f"xpack:catalog:{version}:page:{page}:{page_size}"
+
+    @staticmethod
+    def catalog_service_key(version: int, service_id: str) -> str:
+        """Generate serialized catalog service detail snapshot key"""
+        return f"xpack:catalog:{version}:service:{service_id}"
+
+    @staticmethod
+    def page_total_key(scope: str) -> str:
+        """Generate cached list total key for cursor pagination"""
+        return f"xpack:page_total:{scope}"
+
+    # Billing keys share the {user_id} hash tag so billing scripts touch a single slot
+
+    @staticmethod
+    def wallet_balance_key(user_id: str) -> str:
+        """Generate cached wallet balance key"""
+        return f"wallet:balance:{{{user_id}}}"
+
+    @staticmethod
+    def billing_reservation_key(user_id: str) -> str:
+        """Generate per-user billing reservation hash key (call_id -> reserved amount)"""
+        return f"billing:reservation:{{{user_id}}}"
+
+    @staticmethod
+    def billing_inflight_key(user_id: str, apikey_id: str) -> str:
+        """Generate per-API-key in-flight call set key"""
+        return f"billing:inflight:{{{user_id}}}:{apikey_id}"
@@ -0,0 +1,102 @@
+"""
+Billing queue utilities - Route billing messages to user-sharded consumer lanes
+"""
+import os
+import zlib
+from typing import Dict, List
+from services.common.config import Config
+
+
+class BillingQueueUtils:
+    """
+    Billing queue routing shared by the publisher (api_service) and the consumers (admin_service)
+
+    With BILLING_CONSUMER_LANES = N > 1, messages are published to "<base>.<lane>"
+    where lane = crc32(user_id) % N, so all messages of a user land on the same
+    lane and keep their order. With a single lane the base queue is used as before.
+    """
+
+    BASE_QUEUE_NAME = os.getenv("BILLING_QUEUE_NAME") or "billing.api.calls"
+
+    @staticmethod
+    def lane_count() -> int:
+        """Get configured number of consumer lanes"""
+        return max(1, Config.BILLING_CONSUMER_LANES)
+
+    @staticmethod
+    def lane_for_user(user_id: str) -> int:
+        """Get lane index of a user (stable across processes)"""
+        return zlib.crc32(user_id.encode("utf-8")) % BillingQueueUtils.lane_count()
+
+    @staticmethod
+    def lane_queue(lane: int) -> str:
+        """Get queue name of a lane"""
+        if BillingQueueUtils.lane_count() == 1:
+            return BillingQueueUtils.BASE_QUEUE_NAME
+        return f"{BillingQueueUtils.BASE_QUEUE_NAME}.{lane}"
+
+    @staticmethod
+    def queue_for_user(user_id: str) -> str:
+        """Get queue name a user's billing messages are published to"""
+        return BillingQueueUtils.lane_queue(BillingQueueUtils.lane_for_user(user_id))
+
+    @staticmethod
+    def all_lane_queues() -> List[str]:
+        """Get queue names of all lanes"""
+        return [BillingQueueUtils.lane_queue(lane) for lane in range(BillingQueueUtils.lane_count())]
+
+    @staticmethod
+    def consumer_queues(lane: int) -> List[str]:
+        """
+        Get queues consumed by a lane
+
+        Lane 0 also drains the unsharded base queue, so messages published
+        before lanes were enabled are still processed.
+        """
+        queues = [BillingQueueUtils.lane_queue(lane)]
+        if lane == 0 and BillingQueueUtils.lane_count() > 1:
+            queues.append(BillingQueueUtils.BASE_QUEUE_NAME)
+        return queues
+
+    @staticmethod
+    def all_consumer_queues() -> List[str]:
+        """Get all queues consumed by the lanes, including the base queue"""
+        queues = []
+        for lane in range(BillingQueueUtils.lane_count()):
+            queues.extend(BillingQueueUtils.consumer_queues(lane))
+        return queues
+
+    @staticmethod
+    def retry_delay_seconds(attempt: int) -> int:
+        """Get backoff delay of a retry attempt (1-based), doubling each time"""
+        return Config.BILLING_RETRY_BASE_DELAY * (2 ** (attempt - 1))
+
+    @staticmethod
+    def retry_queue(queue: str, attempt: int) -> str:
+        """
+        Get delayed retry queue of an attempt
+
+        The delay is part of the name, so changing BILLING_RETRY_BASE_DELAY
+        declares new queues instead of conflicting with existing queue arguments.
+        """
+        return f"{queue}.retry.{BillingQueueUtils.retry_delay_seconds(attempt)}s"
+
+    @staticmethod
+    def retry_queue_arguments(queue: str, attempt: int) -> Dict:
+        """Get arguments of a retry queue: expire after the delay back into the source queue"""
+        return {
+            "x-message-ttl": BillingQueueUtils.retry_delay_seconds(attempt) * 1000,
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": queue,
+        }
+
+    @staticmethod
+    def dead_letter_queue(queue: str) -> str:
+        """Get dead-letter queue of a source queue"""
+        return f"{queue}.dead"
+
+    @staticmethod
+    def source_queue(dead_letter_queue: str) -> str:
+        """Get source queue of a dead-letter queue"""
+        suffix = ".dead"
+        return dead_letter_queue[:-len(suffix)] if dead_letter_queue.endswith(suffix) else dead_letter_queue
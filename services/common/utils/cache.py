@@ -6,6 +6,7 @@ import logging
 from typing import Optional, Any
 from objtyping import to_primitive
 from services.common.redis import redis_client
+from services.common.utils.cache_utils import CacheUtils
 
 logger = logging.getLogger(__name__)
 
@@ -78,14 +79,12 @@ def delete_cache(key: str) -> bool:
 
 def clear_pattern_cache(pattern: str) -> int:
     """
+    Clear cache keys matching pattern, see CacheUtils.clear_pattern_cache
 
     Args:
+        pattern: Pattern to match cache keys
 
     Returns:
+        int: Number of keys cleared
     """
-    try:
-        logger.warning("Pattern cache clearing not implemented - use specific keys instead")
-        return 0
-    except Exception as e:
-        logger.error(f"Failed to clear pattern cache for {pattern}: {e}")
-        return 0
+    return CacheUtils.clear_pattern_cache(pattern)
@@ -0,0 +1,166 @@
+"""
+Cache codecs - Explicit, versioned serialization per cache key namespace
+"""
+
+import json
+import logging
+import struct
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+import msgpack
+
+logger = logging.getLogger(__name__)
+
+# Envelope: magic, codec id (1 byte), schema version (2 bytes), payload.
+# 0xc1 is unused by msgpack and never starts valid UTF-8, so it cannot collide with plain values.
+ENVELOPE_MAGIC = b"\xc1X"
+ENVELOPE_HEADER = struct.Struct(">2sBH")
+
+
+class CacheCodec(ABC):
+    """Serializer of cache values, one per key namespace"""
+
+    codec_id = 0
+    name = "raw"
+    # Enveloped values carry codec id and schema version; raw values are stored as-is
+    enveloped = False
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """Serialize a primitive value"""
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """Deserialize a stored payload"""
+
+
+class RawCodec(CacheCodec):
+    """Plain UTF-8 values, e.g. counters and balances also read by INCRBY or Lua scripts"""
+
+    def dumps(self, value: Any) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode("utf-8")
+
+    def loads(self, data: bytes) -> str:
+        return data.decode("utf-8")
+
+
+class JsonCodec(CacheCodec):
+    """JSON of primitive values"""
+
+    codec_id = 1
+    name = "json"
+    enveloped = True
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data.decode("utf-8"))
+
+
+class MsgpackCodec(CacheCodec):
+    """msgpack of primitive values"""
+
+    codec_id = 2
+    name = "msgpack"
+    enveloped = True
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+RAW_CODEC = RawCodec()
+JSON_CODEC = JsonCodec()
+MSGPACK_CODEC = MsgpackCodec()
+
+
+class CacheCodecRegistry:
+    """
+    Maps cache key namespaces (key prefixes) to a codec and schema version
+
+    Enveloped values whose codec or schema version differ from the current
+    registration are treated as cache misses, so entries written by an older
+    release or with an unknown codec are reloaded instead of misread.
+    Unregistered keys use JSON with schema version 1.
+    """
+
+    def __init__(self):
+        self._namespaces: List[Tuple[str, CacheCodec, int]] = []
+        self._decoders: Dict[int, CacheCodec] = {codec.codec_id: codec for codec in (JSON_CODEC, MSGPACK_CODEC)}
+
+    def register(self, prefix: str, codec: CacheCodec, schema_version: int = 1) -> None:
+        """
+        Register the codec of a key namespace, the longest matching prefix wins
+
+        Args:
+            prefix: Key prefix, e.g. "xpack:mcp_service:"
+            codec: Codec of the namespace
+            schema_version: Version of the value layout (0-65535), bump it when the layout changes
+        """
+        self._namespaces = [entry for entry in self._namespaces if entry[0] != prefix]
+        self._namespaces.append((prefix, codec, schema_version & 0xFFFF))
+        self._namespaces.sort(key=lambda entry: len(entry[0]), reverse=True)
+
+    def resolve(self, key: str) -> Tuple[CacheCodec, int]:
+        """Get (codec, schema version) of a key"""
+        for prefix, codec, schema_version in self._namespaces:
+            if key.startswith(prefix):
+                return codec, schema_version
+        return JSON_CODEC, 1
+
+    def dumps(self, key: str, value: Any) -> bytes:
+        """
+        Serialize a value for a key
+
+        Args:
+            key: Cache key, selects the codec
+            value: Primitive value (dict, list, str, int, float, bool, None, bytes)
+
+        Returns:
+            bytes: Stored value
+        """
+        codec, schema_version = self.resolve(key)
+        payload = codec.dumps(value)
+        if not codec.enveloped:
+            return payload
+        return ENVELOPE_HEADER.pack(ENVELOPE_MAGIC, codec.codec_id, schema_version) + payload
+
+    def loads(self, key: str, data: Optional[bytes]) -> Optional[Any]:
+        """
+        Deserialize a stored value
+
+        Args:
+            key: Cache key, selects the codec
+            data: Stored value
+
+        Returns:
+            Optional[Any]: Value, None when missing, stale or unreadable
+        """
+        if data is None:
+            return None
+        codec, schema_version = self.resolve(key)
+        if not codec.enveloped:
+            return codec.loads(data)
+
+        if len(data) < ENVELOPE_HEADER.size or not data.startswith(ENVELOPE_MAGIC):
+            logger.debug(f"Ignoring cache value without envelope for key {key}")
+            return None
+        _, codec_id, stored_version = ENVELOPE_HEADER.unpack_from(data)
+        decoder = self._decoders.get(codec_id)
+        if decoder is None or stored_version != schema_version:
+            logger.debug(f"Ignoring stale cache value for key {key} - Codec: {codec_id}, Schema version: {stored_version}")
+            return None
+        try:
+            return decoder.loads(data[ENVELOPE_HEADER.size:])
+        except Exception as e:
+            logger.warning(f"Failed to decode cache value for key {key}: {e}")
+            return None
+
+
+# Global cache codec registry instance
+cache_codecs = CacheCodecRegistry()
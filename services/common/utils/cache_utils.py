@@ -2,19 +2,200 @@
 Cache utilities for Redis operations
 """
 
+import asyncio
 import json
 import logging
-import pickle
-from typing import Optional, Any
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Any, Awaitable, Callable, Dict, Iterable, Tuple
 from objtyping import to_primitive
-from services.common.redis import redis_client
+from services.common.config import Config
+from services.common.redis import redis_client, async_redis_client
 from services.common.utils.sqlalchemy_utils import SqlalchemyUtils
+from services.common.utils.cache_codec import cache_codecs, MSGPACK_CODEC, RAW_CODEC
+from services.common.models.mcp_service import McpService
+from services.common.models.user_apikey import UserApiKey
+from services.common.redis_keys import RedisKeys
 
 logger = logging.getLogger(__name__)
 
+# Release a load lock only if it still holds our token: after the lock expired
+# mid-load, another process may have taken it.
+# KEYS[1] = lock key, ARGV[1] = token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def parse_namespace_limits(value: str) -> Dict[str, int]:
+    """Parse "namespace=max_entries,..." into a dict"""
+    limits = {}
+    for item in value.split(","):
+        namespace, _, max_entries = item.strip().rpartition("=")
+        if namespace and max_entries.isdigit():
+            limits[namespace] = int(max_entries)
+    return limits
+
+
+class LocalCache:
+    """
+    Process-local LRU cache with TTL, bounded per namespace
+
+    The namespace of a key is the key without its last ":" segment, e.g.
+    "xpack:user_apikey" for "xpack:user_apikey:<apikey>", so one hot namespace
+    cannot evict the others. Entries are shared across requests and must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_entries: int, ttl: int, namespace_limits: Optional[Dict[str, int]] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.namespace_limits = namespace_limits or {}
+        self._lock = threading.Lock()
+        self._entries: Dict[str, OrderedDict] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def namespace(key: str) -> str:
+        """Get the namespace of a cache key"""
+        return key.rsplit(":", 1)[0]
+
+    def _namespace_stats(self, namespace: str) -> Dict[str, int]:
+        """Get the counters of a namespace, caller holds the lock"""
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = {"hits": 0, "misses": 0, "evictions": 0}
+        return stats
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Get a cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple[bool, Any]: (hit, value)
+        """
+        namespace = self.namespace(key)
+        with self._lock:
+            stats = self._namespace_stats(namespace)
+            entries = self._entries.get(namespace)
+            entry = entries.get(key) if entries else None
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del entries[key]
+                stats["misses"] += 1
+                return False, None
+            entries.move_to_end(key)
+            stats["hits"] += 1
+            return True, entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Cache a value, evicting the least recently used entries of its namespace
+
+        Args:
+            key: Cache key
+            value: Value, shared by all readers
+            ttl: Seconds to keep the value, capped by the cache TTL
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        namespace = self.namespace(key)
+        max_entries = self.namespace_limits.get(namespace, self.max_entries)
+        with self._lock:
+            entries = self._entries.setdefault(namespace, OrderedDict())
+            entries[key] = (time.monotonic() + ttl, value)
+            entries.move_to_end(key)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+                self._namespace_stats(namespace)["evictions"] += 1
+
+    def delete(self, *keys: str) -> int:
+        """Evict keys, returns the number of entries removed"""
+        removed = 0
+        with self._lock:
+            for key in keys:
+                entries = self._entries.get(self.namespace(key))
+                if entries and entries.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Evict all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get hits, misses, evictions and size per namespace"""
+        with self._lock:
+            return {
+                namespace: {**stats, "size": len(self._entries.get(namespace, ()))}
+                for namespace, stats in self._stats.items()
+            }
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent async loads of the same key within the process
+
+    The first caller starts the load as a task, later callers await the same
+    task. The task is shielded, so a cancelled caller (e.g. a disconnected
+    client) does not cancel the load the others are waiting for.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a load of the key is running"""
+        return key in self._calls
+
+    def start(self, key: str, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        Start a load of the key unless one is already running
+
+        Args:
+            key: Load key
+            factory: Creates the load coroutine, only called when no load is running
+
+        Returns:
+            asyncio.Task: Running load
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a load of the key, or wait for the running one, and return its result"""
+        return await asyncio.shield(self.start(key, factory))
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve the exception so a load nobody awaits anymore is not reported as unhandled
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Load of {key} failed: {task.exception()}")
+
 
 class CacheUtils:
     DEFAULT_CACHE_EXPIRE_TIME = 3600
+    # Interval at which a caller waiting for another process's load re-reads the cache
+    LOAD_LOCK_POLL_INTERVAL = 0.05
+    SCAN_BATCH_SIZE = 500
+    _release_lock_script = async_redis_client.client.register_script(RELEASE_LOCK_SCRIPT)
 
     @staticmethod
     def get_model_cache(cache_key: str, model_class: type) -> Optional[Any]:
@@ -85,20 +266,357 @@ class CacheUtils:
         """
         Clear cache keys matching pattern
 
+        Walks the keyspace with SCAN, so Redis is never blocked, but the cost
+        grows with the total number of keys. Entity caches should be cleared
+        with invalidate_tags instead.
+
         Args:
             pattern: Pattern to match cache keys
 
         Returns:
             int: Number of keys cleared
         """
+        cleared = 0
         try:
-            logger.warning("Pattern cache clearing not implemented - use specific keys instead")
-            return 0
+            batch = []
+            for key in redis_client.client.scan_iter(match=pattern, count=CacheUtils.SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= CacheUtils.SCAN_BATCH_SIZE:
+                    cleared += CacheUtils._delete_keys(batch)
+                    batch = []
+            if batch:
+                cleared += CacheUtils._delete_keys(batch)
+            logger.info(f"Cleared {cleared} cache keys matching {pattern}")
+            return cleared
         except Exception as e:
             logger.error(f"Failed to clear pattern cache for {pattern}: {e}")
+            return cleared
+
+    # Process-local (L1) cache, only used for model lookups
+    @staticmethod
+    def _get_local(cache_key: str) -> Tuple[bool, Any]:
+        """Look up the local cache, (False, None) when disabled"""
+        if not Config.CACHE_L1_ENABLED:
+            return False, None
+        return local_cache.get(cache_key)
+
+    @staticmethod
+    def _set_local(cache_key: str, value: Any, expire_time: Optional[int] = None) -> None:
+        """Store a value in the local cache when enabled"""
+        if Config.CACHE_L1_ENABLED:
+            local_cache.set(cache_key, value, expire_time)
+
+    @staticmethod
+    def get_local_cache_stats() -> Dict[str, Dict[str, int]]:
+        """Get local cache hits, misses, evictions and size per namespace"""
+        return local_cache.get_stats()
+
+    @staticmethod
+    def invalidate(*keys: str) -> bool:
+        """
+        Delete keys from Redis and evict them from the local cache of every process
+
+        Call after writing the underlying rows so no process keeps serving the old copy.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not keys:
+            return True
+        try:
+            CacheUtils._delete_keys(keys)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to invalidate cache keys {keys}: {e}")
+            return False
+
+    @staticmethod
+    def invalidate_tags(*tags: str) -> int:
+        """
+        Invalidate every cache entry recorded under the tags, in Redis and every local cache
+
+        Call after writing the underlying rows. The tag sets are deleted with
+        their entries; the next load of each entry tags it again.
+
+        Args:
+            tags: Tag set keys, e.g. RedisKeys.service_tag_key(service_id)
+
+        Returns:
+            int: Number of cache entries deleted from Redis
+        """
+        if not tags:
             return 0
+        try:
+            pipe = redis_client.client.pipeline(transaction=False)
+            for tag in tags:
+                pipe.smembers(tag)
+            keys = sorted(set().union(*pipe.execute()))
+            deleted = CacheUtils._delete_keys(keys, extra_keys=tags)
+            logger.debug(f"Invalidated cache tags {tags} - Keys: {len(keys)}, Deleted: {deleted}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Failed to invalidate cache tags {tags}: {e}")
+            return 0
+
+    @staticmethod
+    def _delete_keys(keys: Iterable[str], extra_keys: Iterable[str] = ()) -> int:
+        """
+        Delete keys and publish their eviction in one pipelined round trip
+
+        Keys are deleted one command each, so the pipeline also works when
+        they live in different cluster slots.
+
+        Args:
+            keys: Cache keys, also evicted from local caches
+            extra_keys: Keys deleted along without eviction, e.g. tag sets
+
+        Returns:
+            int: Number of cache keys deleted
+        """
+        keys = list(keys)
+        local_cache.delete(*keys)
+        pipe = redis_client.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.delete(key)
+        for key in extra_keys:
+            pipe.delete(key)
+        if keys:
+            pipe.publish(Config.CACHE_INVALIDATION_CHANNEL, json.dumps(keys))
+        results = pipe.execute()
+        return sum(results[:len(keys)])
+
+    @staticmethod
+    def tag_key(cache_key: str, tags: Iterable[str]) -> None:
+        """
+        Record a cache key in tag sets so invalidate_tags finds it
+
+        Call before storing the value, so a stored value is never left untagged.
+
+        Args:
+            cache_key: Cache key
+            tags: Tag set keys
+        """
+        tags = list(tags)
+        if not tags:
+            return
+        try:
+            pipe = redis_client.client.pipeline(transaction=False)
+            for tag in tags:
+                pipe.sadd(tag, cache_key)
+                pipe.expire(tag, Config.CACHE_TAG_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to tag cache key {cache_key} with {tags}: {e}")
+
+    @staticmethod
+    async def tag_key_async(cache_key: str, tags: Iterable[str]) -> None:
+        """
+        Async variant of tag_key for event-loop code
+
+        Args:
+            cache_key: Cache key
+            tags: Tag set keys
+        """
+        tags = list(tags)
+        if not tags:
+            return
+        try:
+            pipe = async_redis_client.client.pipeline(transaction=False)
+            for tag in tags:
+                pipe.sadd(tag, cache_key)
+                pipe.expire(tag, Config.CACHE_TAG_TTL)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to tag cache key {cache_key} with {tags}: {e}")
+
+    # Read-through cache with stampede protection
+    # Entries hold the value with its logical expiry and load time; Redis keeps them stale_ttl longer
+    @staticmethod
+    async def get_or_load_async(
+        cache_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire_time: int = DEFAULT_CACHE_EXPIRE_TIME,
+        encode: Optional[Callable[[Any], Any]] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+        stale_ttl: Optional[int] = None,
+        tags: Optional[Callable[[Any], Iterable[str]]] = None,
+    ) -> Optional[Any]:
+        """
+        Get a value from cache, loading it at most once per key when missing
+
+        A miss is loaded once per process (single-flight) and once across
+        processes (short Redis lock, the other processes wait for the entry).
+        Before expiry, an entry is refreshed early in the background with a
+        probability that grows as expiry nears and with the load time (XFetch).
+        After expiry, the stale value is served for up to stale_ttl seconds
+        while one background load refreshes it. None results are not cached.
+
+        Args:
+            cache_key: Cache key
+            loader: Loads the value, must not use the caller's database session since it may run in the background
+            expire_time: Seconds the value is fresh
+            encode: Converts the loaded value to a primitive value, identity by default
+            decode: Converts the primitive value back, identity by default
+            stale_ttl: Seconds an expired value may still be served, Config.CACHE_STALE_TTL by default
+            tags: Returns the tag set keys of a loaded value, for invalidate_tags
+
+        Returns:
+            Optional[Any]: Decoded value or None if the loader found nothing
+        """
+        stale_ttl = Config.CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+        hit, value = CacheUtils._get_local(cache_key)
+        if hit:
+            return value
+
+        entry = await CacheUtils._read_entry_async(cache_key)
+        if entry is not None:
+            value = decode(entry["v"]) if decode else entry["v"]
+            now = time.time()
+            if now >= entry["e"] or CacheUtils._should_refresh_early(now, entry["e"], entry["d"]):
+                CacheUtils._refresh_in_background(cache_key, loader, expire_time, encode, stale_ttl, tags)
+            else:
+                CacheUtils._set_local(cache_key, value, int(entry["e"] - now))
+            return value
+
+        primitive = await single_flight.do(
+            cache_key, lambda: CacheUtils._load_entry_async(cache_key, loader, expire_time, encode, stale_ttl, tags, wait=True)
+        )
+        if primitive is None:
+            return None
+        value = decode(primitive) if decode else primitive
+        CacheUtils._set_local(cache_key, value, expire_time)
+        return value
+
+    @staticmethod
+    def _should_refresh_early(now: float, expires_at: float, delta: float) -> bool:
+        """XFetch: refresh early with probability rising as expiry nears, scaled by the load time"""
+        if Config.CACHE_XFETCH_BETA <= 0:
+            return False
+        # 1 - random() is in (0, 1], so the log is defined and never positive
+        return now - delta * Config.CACHE_XFETCH_BETA * math.log(1.0 - random.random()) >= expires_at
+
+    @staticmethod
+    def _refresh_in_background(
+        cache_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire_time: int,
+        encode: Optional[Callable[[Any], Any]],
+        stale_ttl: int,
+        tags: Optional[Callable[[Any], Iterable[str]]],
+    ) -> None:
+        """Start one background refresh of an entry per process"""
+        single_flight.start(
+            f"refresh:{cache_key}",
+            lambda: CacheUtils._load_entry_async(cache_key, loader, expire_time, encode, stale_ttl, tags, wait=False),
+        )
+
+    @staticmethod
+    async def _load_entry_async(
+        cache_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        expire_time: int,
+        encode: Optional[Callable[[Any], Any]],
+        stale_ttl: int,
+        tags: Optional[Callable[[Any], Iterable[str]]],
+        wait: bool,
+    ) -> Optional[Any]:
+        """
+        Load and store an entry under the cross-process load lock
+
+        Args:
+            wait: When another process holds the lock, wait for its entry (True) or skip the load (False)
+
+        Returns:
+            Optional[Any]: Primitive value, None if not found or the load was skipped
+        """
+        lock_key = RedisKeys.cache_load_lock_key(cache_key)
+        token = uuid.uuid4().hex
+        try:
+            locked = await async_redis_client.client.set(lock_key, token, nx=True, px=int(Config.CACHE_LOAD_LOCK_TTL * 1000))
+        except Exception as e:
+            logger.error(f"Failed to acquire cache load lock for key {cache_key}: {e}")
+            # Without Redis every process loads on its own
+            locked = False
+            wait = True
+        else:
+            if not locked:
+                if not wait:
+                    return None
+                entry = await CacheUtils._wait_for_entry_async(cache_key)
+                if entry is not None:
+                    return entry["v"]
+                # The other load failed or is too slow, load anyway
+
+        try:
+            started = time.monotonic()
+            value = await loader()
+            delta = time.monotonic() - started
+            if value is None:
+                return None
+            primitive = encode(value) if encode else value
+            if tags:
+                await CacheUtils.tag_key_async(cache_key, tags(value))
+            await CacheUtils._write_entry_async(cache_key, primitive, delta, expire_time, stale_ttl)
+            return primitive
+        finally:
+            if locked:
+                try:
+                    await CacheUtils._release_lock_script(keys=[lock_key], args=[token])
+                except Exception as e:
+                    logger.error(f"Failed to release cache load lock for key {cache_key}: {e}")
+
+    @staticmethod
+    async def _wait_for_entry_async(cache_key: str) -> Optional[Dict[str, Any]]:
+        """Poll for the entry another process is loading, None when the load lock would have expired"""
+        deadline = time.monotonic() + Config.CACHE_LOAD_LOCK_TTL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(CacheUtils.LOAD_LOCK_POLL_INTERVAL)
+            entry = await CacheUtils._read_entry_async(cache_key)
+            if entry is not None:
+                return entry
+        return None
+
+    @staticmethod
+    async def _read_entry_async(cache_key: str) -> Optional[Dict[str, Any]]:
+        """Read a get_or_load entry, None when missing, unreadable or in another format"""
+        try:
+            entry = cache_codecs.loads(cache_key, await async_redis_client.get_bytes(cache_key))
+        except Exception as e:
+            logger.error(f"Failed to read cache entry for key {cache_key}: {e}")
+            return None
+        if not isinstance(entry, dict) or not {"v", "e", "d"} <= entry.keys():
+            return None
+        return entry
+
+    @staticmethod
+    async def _write_entry_async(cache_key: str, value: Any, delta: float, expire_time: int, stale_ttl: int) -> None:
+        """Store a get_or_load entry, fresh for expire_time and kept stale_ttl longer"""
+        entry = {"v": value, "e": time.time() + expire_time, "d": delta}
+        try:
+            await async_redis_client.set_bytes(cache_key, cache_codecs.dumps(cache_key, entry), ex=expire_time + stale_ttl)
+        except Exception as e:
+            logger.error(f"Failed to write cache entry for key {cache_key}: {e}")
 
     # SQLAlchemy Model specific cache methods
+    # Models are stored as primitive dicts through the binary client, encoded by the codec of the key namespace
+    @staticmethod
+    def _encode_models(cache_key: str, value: Any) -> bytes:
+        """Encode a model or list of models for a cache key"""
+        if isinstance(value, list):
+            return cache_codecs.dumps(cache_key, [SqlalchemyUtils.model_to_primitive_dict(model) for model in value])
+        return cache_codecs.dumps(cache_key, SqlalchemyUtils.model_to_primitive_dict(value))
+
+    @staticmethod
+    def _decode_model(cache_key: str, data: Optional[bytes], model_class: type) -> Optional[Any]:
+        """Decode a cached model, None when missing, stale or not a model"""
+        model_data = cache_codecs.loads(cache_key, data)
+        if not isinstance(model_data, dict):
+            return None
+        return SqlalchemyUtils.primitive_dict_to_model(model_class, model_data)
+
     @staticmethod
     def get_sqlalchemy_cache(cache_key: str, model_class: type) -> Optional[Any]:
         """
@@ -111,27 +629,46 @@ class CacheUtils:
         Returns:
             Optional[Any]: Model instance or None if not found
         """
+        hit, model = CacheUtils._get_local(cache_key)
+        if hit:
+            return model
         try:
-            cache_value = redis_client.get(cache_key)
-            if cache_value:
-                # Check if cache_value is already deserialized (dict) or needs deserialization (str)
-                if isinstance(cache_value, dict):
-                    model_data = cache_value
-                elif isinstance(cache_value, str):
-                    # Deserialize from pickled string data
-                    model_data = pickle.loads(cache_value.encode('latin1'))
-                else:
-                    logger.warning(f"Unexpected cache value type for key {cache_key}: {type(cache_value)}")
-                    return None
-                    
-                return SqlalchemyUtils.dict_to_model(model_class, model_data)
+            model = CacheUtils._decode_model(cache_key, redis_client.get_bytes(cache_key), model_class)
+            if model is not None:
+                CacheUtils._set_local(cache_key, model)
+            return model
+        except Exception as e:
+            logger.error(f"Failed to get SQLAlchemy cache for key {cache_key}: {e}")
             return None
+
+    @staticmethod
+    async def get_sqlalchemy_cache_async(cache_key: str, model_class: type) -> Optional[Any]:
+        """
+        Async variant of get_sqlalchemy_cache for event-loop code
+
+        Args:
+            cache_key: Cache key
+            model_class: SQLAlchemy model class
+
+        Returns:
+            Optional[Any]: Model instance or None if not found
+        """
+        hit, model = CacheUtils._get_local(cache_key)
+        if hit:
+            return model
+        try:
+            model = CacheUtils._decode_model(cache_key, await async_redis_client.get_bytes(cache_key), model_class)
+            if model is not None:
+                CacheUtils._set_local(cache_key, model)
+            return model
         except Exception as e:
             logger.error(f"Failed to get SQLAlchemy cache for key {cache_key}: {e}")
             return None
 
     @staticmethod
-    def set_sqlalchemy_cache(cache_key: str, model: Any, expire_time: int = DEFAULT_CACHE_EXPIRE_TIME) -> bool:
+    def set_sqlalchemy_cache(
+        cache_key: str, model: Any, expire_time: int = DEFAULT_CACHE_EXPIRE_TIME, tags: Iterable[str] = ()
+    ) -> bool:
         """
         Set SQLAlchemy model to cache with proper serialization
 
@@ -139,15 +676,42 @@ class CacheUtils:
             cache_key: Cache key
             model: SQLAlchemy model instance
             expire_time: Cache expiration time in seconds
+            tags: Tag set keys, for invalidate_tags
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            model_dict = SqlalchemyUtils.model_to_dict(model)
-            # Serialize using pickle for better type preservation
-            serialized_data = pickle.dumps(model_dict).decode('latin1')
-            redis_client.set(cache_key, serialized_data, ex=expire_time)
+            CacheUtils.tag_key(cache_key, tags)
+            redis_client.set_bytes(cache_key, CacheUtils._encode_models(cache_key, model), ex=expire_time)
+            # Detached copy, the loaded instance stays bound to its session
+            CacheUtils._set_local(cache_key, SqlalchemyUtils.dict_to_model(type(model), SqlalchemyUtils.model_to_dict(model)), expire_time)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to set SQLAlchemy cache for key {cache_key}: {e}")
+            return False
+
+    @staticmethod
+    async def set_sqlalchemy_cache_async(
+        cache_key: str, model: Any, expire_time: int = DEFAULT_CACHE_EXPIRE_TIME, tags: Iterable[str] = ()
+    ) -> bool:
+        """
+        Async variant of set_sqlalchemy_cache for event-loop code
+
+        Args:
+            cache_key: Cache key
+            model: SQLAlchemy model instance
+            expire_time: Cache expiration time in seconds
+            tags: Tag set keys, for invalidate_tags
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            await CacheUtils.tag_key_async(cache_key, tags)
+            await async_redis_client.set_bytes(cache_key, CacheUtils._encode_models(cache_key, model), ex=expire_time)
+            # Detached copy, the loaded instance stays bound to its session
+            CacheUtils._set_local(cache_key, SqlalchemyUtils.dict_to_model(type(model), SqlalchemyUtils.model_to_dict(model)), expire_time)
             return True
         except Exception as e:
             logger.error(f"Failed to set SQLAlchemy cache for key {cache_key}: {e}")
@@ -166,20 +730,9 @@ class CacheUtils:
             Optional[list]: List of model instances or None if not found
         """
         try:
-            cache_value = redis_client.get(cache_key)
-            if cache_value:
-                # Check if cache_value is already deserialized (list) or needs deserialization (str)
-                if isinstance(cache_value, list):
-                    model_list_data = cache_value
-                elif isinstance(cache_value, str):
-                    # Deserialize from pickled string data
-                    model_list_data = pickle.loads(cache_value.encode('latin1'))
-                else:
-                    logger.warning(f"Unexpected cache value type for key {cache_key}: {type(cache_value)}")
-                    return None
-                    
-                if isinstance(model_list_data, list):
-                    return [SqlalchemyUtils.dict_to_model(model_class, item) for item in model_list_data]
+            model_list_data = cache_codecs.loads(cache_key, redis_client.get_bytes(cache_key))
+            if isinstance(model_list_data, list):
+                return [SqlalchemyUtils.primitive_dict_to_model(model_class, item) for item in model_list_data]
             return None
         except Exception as e:
             logger.error(f"Failed to get SQLAlchemy list cache for key {cache_key}: {e}")
@@ -202,12 +755,92 @@ class CacheUtils:
             if not isinstance(model_list, list):
                 logger.error(f"Expected list for cache key {cache_key}, got {type(model_list)}")
                 return False
-                
-            model_dict_list = [SqlalchemyUtils.model_to_dict(model) for model in model_list]
-            # Serialize using pickle for better type preservation
-            serialized_data = pickle.dumps(model_dict_list).decode('latin1')
-            redis_client.set(cache_key, serialized_data, ex=expire_time)
+
+            redis_client.set_bytes(cache_key, CacheUtils._encode_models(cache_key, model_list), ex=expire_time)
             return True
         except Exception as e:
             logger.error(f"Failed to set SQLAlchemy list cache for key {cache_key}: {e}")
             return False
+
+
+class CacheInvalidationListener:
+    """
+    Evicts local cache entries named in invalidation messages (api_service)
+
+    Runs as a background task on the event loop. The local cache is cleared on
+    every (re)subscription, since messages sent while unsubscribed are lost.
+    """
+
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start listening in the background"""
+        if Config.CACHE_L1_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @staticmethod
+    def _evict(data: str) -> None:
+        """Evict the keys of one invalidation message"""
+        try:
+            keys = json.loads(data)
+        except ValueError:
+            logger.warning(f"Ignoring malformed cache invalidation message: {data}")
+            return
+        local_cache.delete(*keys)
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = async_redis_client.pubsub()
+            try:
+                await pubsub.subscribe(Config.CACHE_INVALIDATION_CHANNEL)
+                local_cache.clear()
+                logger.info(f"Subscribed to cache invalidation channel {Config.CACHE_INVALIDATION_CHANNEL}")
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._evict(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener failed, resubscribing: {e}")
+                local_cache.clear()
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+# Global local cache instance
+local_cache = LocalCache(
+    max_entries=Config.CACHE_L1_MAX_ENTRIES,
+    ttl=Config.CACHE_L1_TTL,
+    namespace_limits=parse_namespace_limits(Config.CACHE_L1_NAMESPACE_LIMITS),
+)
+
+# Global single-flight instance
+single_flight = SingleFlight()
+
+# Global cache invalidation listener instance
+cache_invalidation_listener = CacheInvalidationListener()
+
+# Codecs of the cache namespaces; model schema versions follow the model columns
+cache_codecs.register(RedisKeys.mcp_service_id_key(""), MSGPACK_CODEC, SqlalchemyUtils.model_schema_version(McpService))
+cache_codecs.register(RedisKeys.mcp_service_slug_key(""), MSGPACK_CODEC, SqlalchemyUtils.model_schema_version(McpService))
+cache_codecs.register(RedisKeys.user_apikey_key(""), MSGPACK_CODEC, SqlalchemyUtils.model_schema_version(UserApiKey))
+cache_codecs.register(RedisKeys.page_total_key(""), RAW_CODEC)
@@ -0,0 +1,123 @@
+"""
+Pagination utilities - Keyset (cursor) pagination on (created_at, id)
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+from services.common.utils.cache_utils import CacheUtils
+
+logger = logging.getLogger(__name__)
+
+
+class PaginationUtils:
+    """
+    Keyset pagination helpers
+
+    Rows are ordered by (created_at DESC, id DESC) and a page starts right after
+    the last row of the previous page, so deep pages cost the same as the first
+    one instead of scanning and discarding OFFSET rows. The cursor is opaque to
+    clients: url-safe base64 of the last row's created_at and id.
+    """
+
+    TOTAL_CACHE_EXPIRE_TIME = 60
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, row_id: str) -> str:
+        """
+        Encode the position after a row
+
+        Args:
+            created_at: Row creation time
+            row_id: Row ID
+
+        Returns:
+            str: Opaque cursor
+        """
+        payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+        """
+        Decode a cursor produced by encode_cursor
+
+        Args:
+            cursor: Opaque cursor, empty for the first page
+
+        Returns:
+            Optional[Tuple[datetime, str]]: (created_at, id), None for the first page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            return datetime.fromisoformat(created_at), str(row_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def keyset_page(query: Query, created_column: Any, id_column: Any, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+        """
+        Fetch one page of a query in (created_at DESC, id DESC) order
+
+        Args:
+            query: Filtered query, without ordering or limit
+            created_column: Creation time column, e.g. User.created_at
+            id_column: Primary key column, e.g. User.id
+            cursor: Cursor of the previous page, empty for the first page
+            limit: Page size
+
+        Returns:
+            Tuple[List[Any], Optional[str]]: (rows, next_cursor), next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        position = PaginationUtils.decode_cursor(cursor)
+        if position:
+            created_at, row_id = position
+            query = query.filter(
+                or_(created_column < created_at, and_(created_column == created_at, id_column < row_id))
+            )
+        # One extra row tells whether a next page exists
+        rows = query.order_by(created_column.desc(), id_column.desc()).limit(limit + 1).all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, PaginationUtils.encode_cursor(getattr(last, created_column.key), getattr(last, id_column.key))
+
+    @staticmethod
+    def cached_total(query: Query, cache_key: str, expire_time: int = TOTAL_CACHE_EXPIRE_TIME) -> int:
+        """
+        Count the rows of a query, cached for a short time
+
+        The total is only indicative for cursor pages, so it may lag behind
+        writes by up to expire_time seconds.
+
+        Args:
+            query: Filtered query
+            cache_key: Redis key of the cached total
+            expire_time: Cache TTL in seconds
+
+        Returns:
+            int: Row count
+        """
+        cached = CacheUtils.get_cache(cache_key)
+        if cached is not None:
+            try:
+                return int(cached)
+            except (TypeError, ValueError):
+                logger.warning(f"Ignoring invalid cached total for key {cache_key}")
+        total = query.order_by(None).count()
+        CacheUtils.set_cache(cache_key, total, expire_time)
+        return total
@@ -63,6 +63,42 @@ class ResponseUtils:
             }
         }
 
+    @staticmethod
+    def success_cursor(
+        data: Any = None,
+        message: str = "Success",
+        code: int = 200,
+        page_size: int = 10,
+        next_cursor: Optional[str] = None,
+        total: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a successful cursor-paginated response
+
+        Args:
+            data: Response data
+            message: Success message
+            code: HTTP status code
+            page_size: Page size
+            next_cursor: Cursor of the next page, None on the last page
+            total: Approximate total number of items, if known
+
+        Returns:
+            Standardized cursor-paginated success response
+        """
+        return {
+            "success": True,
+            "code": str(code),
+            "error_message": message,
+            "data": data,
+            "page": {
+                "page_size": page_size,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+                "total": total
+            }
+        }
+
     @staticmethod
     def error(
         message: str = "An error occurred", 
@@ -1,3 +1,10 @@
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from sqlalchemy import Date, DateTime, Enum as SqlEnum, Numeric
+
+
 class SqlalchemyUtils:
 
     @staticmethod
@@ -27,3 +34,59 @@ class SqlalchemyUtils:
                 setattr(instance, key, value)
 
         return instance
+
+    @staticmethod
+    def model_to_primitive_dict(model):
+        """
+        Convert a model to a dict of codec-safe primitives
+
+        datetime/date become ISO strings, Decimal a string and Enum its value;
+        primitive_dict_to_model restores them from the column types.
+        """
+        data = {}
+        for column in model.__table__.columns:
+            value = getattr(model, column.name)
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            elif isinstance(value, Decimal):
+                value = str(value)
+            elif isinstance(value, Enum):
+                value = value.value
+            data[column.name] = value
+        return data
+
+    @staticmethod
+    def primitive_dict_to_model(model_class, data_dict):
+        """
+        Convert a dict produced by model_to_primitive_dict back to a model instance
+
+        Args:
+            model_class: SQLAlchemy model class
+            data_dict: Dictionary of primitives
+
+        Returns:
+            Instance of the model class with typed values
+        """
+        restored = {}
+        for column in model_class.__table__.columns:
+            if column.name not in data_dict:
+                continue
+            value = data_dict[column.name]
+            if value is not None:
+                column_type = column.type
+                if isinstance(column_type, SqlEnum) and column_type.enum_class is not None:
+                    value = column_type.enum_class(value)
+                elif isinstance(column_type, DateTime):
+                    value = datetime.fromisoformat(value)
+                elif isinstance(column_type, Date):
+                    value = date.fromisoformat(value)
+                elif isinstance(column_type, Numeric) and column_type.asdecimal:
+                    value = Decimal(value)
+            restored[column.name] = value
+        return SqlalchemyUtils.dict_to_model(model_class, restored)
+
+    @staticmethod
+    def model_schema_version(model_class) -> int:
+        """Derive a 16-bit cache schema version from the model's column names and types"""
+        layout = ",".join(f"{column.name}:{column.type.__class__.__name__}" for column in model_class.__table__.columns)
+        return zlib.crc32(layout.encode("utf-8")) & 0xFFFF
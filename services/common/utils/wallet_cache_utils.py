@@ -0,0 +1,75 @@
+"""
+Wallet cache utilities - Rebuild the cached wallet balance without losing open reservations
+"""
+import time
+from decimal import Decimal
+from typing import List
+from services.common.redis_keys import RedisKeys
+
+# Lua helpers shared by the scripts that read the reservation hash. Each entry of
+# the hash is "<amount>:<expires_at>" (unix seconds); the hash TTL is refreshed by
+# every reservation, so entries of calls that never settled expire one by one here.
+# Entries without an expiry (written by earlier releases) count as expired.
+RESERVATION_LUA = """
+local function reservation_amount(entry)
+    return tonumber(string.match(entry, '^[^:]+')) or 0
+end
+
+-- Delete the expired reservations, returns their total amount
+local function purge_expired_reservations(key, now)
+    local expired = 0
+    local entries = redis.call('HGETALL', key)
+    for i = 1, #entries, 2 do
+        local expires_at = tonumber(string.match(entries[i + 1], ':(.+)$'))
+        if not expires_at or expires_at <= now then
+            redis.call('HDEL', key, entries[i])
+            expired = expired + reservation_amount(entries[i + 1])
+        end
+    end
+    return expired
+end
+"""
+
+# Rebuild the cached balance from the database balance minus the amounts still reserved
+# by calls in flight. Those calls were not charged in the database yet, and settling them
+# later refunds their unused part onto this value, so it must keep their reservation.
+# Expired reservations are dropped first, so abandoned calls stop being deducted.
+# KEYS[1]: wallet balance key, KEYS[2]: reservation hash
+# ARGV[1]: database balance (plain decimal string), ARGV[2]: cache expiration (seconds),
+# ARGV[3]: '1' to keep a balance that is already cached, ARGV[4]: current unix time (seconds)
+# Returns the cached balance
+REBUILD_BALANCE_SCRIPT = RESERVATION_LUA + """
+if ARGV[3] == '1' then
+    local cached = redis.call('GET', KEYS[1])
+    if cached then
+        return cached
+    end
+end
+purge_expired_reservations(KEYS[2], tonumber(ARGV[4]))
+local balance = tonumber(ARGV[1])
+for _, reserved in ipairs(redis.call('HVALS', KEYS[2])) do
+    balance = balance - reservation_amount(reserved)
+end
+local value = string.format('%.6f', balance)
+redis.call('SET', KEYS[1], value, 'EX', ARGV[2])
+return value
+"""
+
+
+class WalletCacheUtils:
+    """
+    Cached wallet balance shared by the reservations (api_service) and the billing consumer (admin_service)
+
+    The cached balance is the database balance minus the open reservations, so
+    it must never be overwritten with the plain database balance.
+    """
+
+    @staticmethod
+    def rebuild_keys(user_id: str) -> List[str]:
+        """Keys of REBUILD_BALANCE_SCRIPT, they share the {user_id} hash tag"""
+        return [RedisKeys.wallet_balance_key(user_id), RedisKeys.billing_reservation_key(user_id)]
+
+    @staticmethod
+    def rebuild_args(db_balance: Decimal, expire_time: int, keep_cached: bool) -> list:
+        """Arguments of REBUILD_BALANCE_SCRIPT"""
+        return [format(db_balance, "f"), expire_time, "1" if keep_cached else "0", int(time.time())]
@@ -0,0 +1,136 @@
+"""
+Billing message handler tests
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+# services.common.redis pings the server when imported
+with mock.patch("redis.Redis.ping", return_value=True):
+    from services.admin_service.services import billing_message_handler
+    from services.admin_service.services.billing_message_handler import BillingMessageHandler
+    from services.common.models.mcp_call_log import ProcessStatus
+
+
+class FakeCallLogRepository:
+    """In-memory call logs, only committed state is kept"""
+
+    def __init__(self):
+        self.logs = {}
+
+    def get_by_id(self, log_id):
+        return self.logs.get(log_id)
+
+    def create(self, call_log):
+        self.logs[call_log.id] = call_log
+        return call_log
+
+    def update_status(self, log_id, status, error_msg=None, wallet_history_id=None):
+        call_log = self.logs[log_id]
+        call_log.process_status = status
+        call_log.error_msg = error_msg
+        if wallet_history_id:
+            call_log.wallet_history_id = wallet_history_id
+        return True
+
+
+class FakeWalletRepository:
+    """Wallet whose next decrement can fail with a transient error"""
+
+    def __init__(self, balance):
+        self.balance = balance
+        self.fail_next = False
+        self.charges = []
+
+    def decrement_balance(self, user_id, amount):
+        if self.fail_next:
+            self.fail_next = False
+            raise Exception("Lock wait timeout exceeded; try restarting transaction")
+        if self.balance < amount:
+            return None
+        self.balance -= amount
+        self.charges.append(amount)
+        return self.balance
+
+    def get_by_user_id(self, user_id):
+        return object()
+
+
+@pytest.fixture
+def handler():
+    with mock.patch.object(billing_message_handler, "platform_counters"):
+        handler = BillingMessageHandler(mock.MagicMock())
+        handler.call_log_repo = FakeCallLogRepository()
+        handler.wallet_repo = FakeWalletRepository(Decimal("10"))
+        handler.wallet_history_repo = mock.MagicMock()
+        handler.usage_daily_repo = mock.MagicMock()
+        handler.redis = mock.MagicMock()
+        handler._rebuild_balance_script = mock.MagicMock()
+        yield handler
+
+
+def build_message(call_log_id="call-1"):
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "user_id": "user-1",
+        "service_id": "service-1",
+        "api_id": "api-1",
+        "tool_name": "search",
+        "input_params": "{}",
+        "call_success": True,
+        "unit_price": "1.5",
+        "input_token": "0",
+        "output_token": "0",
+        "charge_type": "per_call",
+        "call_start_time": now,
+        "call_end_time": now,
+        "call_log_id": call_log_id,
+    }
+
+
+def test_transient_failure_then_redelivery_charges_once(handler):
+    message = build_message()
+    handler.wallet_repo.fail_next = True
+
+    assert handler.process_billing_message(message) is False
+    assert handler.call_log_repo.get_by_id("call-1").process_status == ProcessStatus.PENDING
+    assert handler.wallet_repo.charges == []
+
+    # Retry queue redelivery
+    assert handler.process_billing_message(message) is True
+    assert handler.call_log_repo.get_by_id("call-1").process_status == ProcessStatus.PROCESSED
+
+    # Duplicate redelivery after success
+    assert handler.process_billing_message(message) is True
+    assert handler.wallet_repo.charges == [Decimal("1.5")]
+    assert handler.wallet_repo.balance == Decimal("8.5")
+    handler.wallet_history_repo.add_consume_records_batch.assert_called_once()
+
+
+def test_business_failure_is_final(handler):
+    message = build_message()
+    handler.wallet_repo.balance = Decimal("1")
+
+    # Insufficient balance is acked, not retried
+    assert handler.process_billing_message(message) is True
+    assert handler.call_log_repo.get_by_id("call-1").process_status == ProcessStatus.FAILED
+
+    # A redelivery after the user tops up is skipped as a duplicate
+    handler.wallet_repo.balance = Decimal("5")
+    assert handler.process_billing_message(message) is True
+    assert handler.call_log_repo.get_by_id("call-1").process_status == ProcessStatus.FAILED
+    assert handler.wallet_repo.charges == []
+    assert handler.usage_daily_repo.add_increments.call_count == 2
+
+
+def test_charge_updates_call_log_once(handler):
+    with mock.patch.object(handler.call_log_repo, "update_status", wraps=handler.call_log_repo.update_status) as update_status:
+        assert handler.process_billing_message(build_message()) is True
+
+    update_status.assert_called_once()
+    call_log = handler.call_log_repo.get_by_id("call-1")
+    assert call_log.process_status == ProcessStatus.PROCESSED
+    assert call_log.wallet_history_id is not None
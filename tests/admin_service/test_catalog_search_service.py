@@ -0,0 +1,162 @@
+"""
+Catalog search index tests
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+# services.common.redis pings the server when imported
+with mock.patch("redis.Redis.ping", return_value=True):
+    from services.admin_service.services import catalog_search_service as catalog_search_module
+    from services.admin_service.services.catalog_search_service import CatalogSearchService
+
+
+class FakeCatalog:
+    """Enabled services and tool APIs, passed to the index in place of the database session"""
+
+    def __init__(self):
+        self.version = 1
+        self.services = {}
+        self.tools = []
+        self.loaded = []
+
+    def add_service(self, service_id, name, short_description="", tags="", age_days=0, updated=0):
+        self.services[service_id] = SimpleNamespace(
+            id=service_id,
+            name=name,
+            short_description=short_description,
+            tags=tags,
+            created_at=datetime(2026, 10, 1) - timedelta(days=age_days),
+            updated_at=datetime(2026, 10, 1) + timedelta(seconds=updated),
+        )
+        self.version += 1
+
+
+class FakeServiceRepository:
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def get_search_signatures(self):
+        return [
+            SimpleNamespace(id=service.id, updated_at=service.updated_at, tool_updated_at=None, tool_count=0)
+            for service in self.catalog.services.values()
+        ]
+
+    def get_search_documents(self, service_ids):
+        self.catalog.loaded.extend(service_ids)
+        return [self.catalog.services[service_id] for service_id in service_ids if service_id in self.catalog.services]
+
+
+class FakeToolApiRepository:
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def get_enabled_summaries_by_service_ids(self, service_ids):
+        return [tool for tool in self.catalog.tools if tool[0] in service_ids]
+
+
+@pytest.fixture
+def catalog():
+    catalog = FakeCatalog()
+    with mock.patch.object(catalog_search_module, "McpServiceRepository", FakeServiceRepository), \
+            mock.patch.object(catalog_search_module, "McpToolApiRepository", FakeToolApiRepository), \
+            mock.patch.object(catalog_search_module.catalog_service, "get_version", side_effect=lambda: catalog.version):
+        yield catalog
+
+
+def search(index, catalog, keyword, tag=None):
+    service_ids, total, facets = index.search(catalog, keyword, tag=tag, offset=0, limit=10)
+    assert total == len(service_ids)
+    return service_ids, facets
+
+
+def test_ranks_by_field_weight_then_creation_time(catalog):
+    catalog.add_service("description", "Geo Tools", "Weather forecasts", age_days=5)
+    catalog.add_service("name-old", "Weather Station", age_days=3)
+    catalog.add_service("name-new", "Weather Now", age_days=1)
+    catalog.add_service("tool", "Misc")
+    catalog.tools.append(("tool", "api-1", "get_weather", "Current weather"))
+    catalog.add_service("unrelated", "Stock Quotes")
+
+    service_ids, _ = search(CatalogSearchService(), catalog, "weather")
+
+    assert service_ids == ["name-new", "name-old", "description", "tool"]
+
+
+def test_prefix_matches_score_below_exact_matches(catalog):
+    catalog.add_service("exact", "Sea Charts")
+    catalog.add_service("prefix", "Search Engine")
+    index = CatalogSearchService()
+
+    assert search(index, catalog, "sea")[0] == ["exact", "prefix"]
+    assert search(index, catalog, "sear")[0] == ["prefix"]
+    # Single-character terms only match exactly
+    assert search(index, catalog, "s")[0] == []
+
+
+def test_all_query_terms_must_match(catalog):
+    catalog.add_service("both", "Weather Maps")
+    catalog.add_service("one", "Weather Station")
+    index = CatalogSearchService()
+
+    assert search(index, catalog, "weather maps")[0] == ["both"]
+    assert search(index, catalog, "weather nothing")[0] == []
+    # Without keyword every service matches
+    assert sorted(search(index, catalog, "")[0]) == ["both", "one"]
+
+
+def test_tag_filter_and_facets(catalog):
+    catalog.add_service("maps", "Weather Maps", tags="Maps, Weather")
+    catalog.add_service("station", "Weather Station", tags="weather,iot")
+    catalog.add_service("stocks", "Stock Quotes", tags="finance")
+    index = CatalogSearchService()
+
+    service_ids, facets = search(index, catalog, "weather", tag="WEATHER")
+    assert sorted(service_ids) == ["maps", "station"]
+    # Facets cover the keyword matches, not only the tag-filtered page
+    assert facets == {"Maps": 1, "Weather": 1, "weather": 1, "iot": 1}
+
+    service_ids, facets = search(index, catalog, "weather", tag="iot")
+    assert service_ids == ["station"]
+    assert "finance" not in facets
+
+    # Whole tags only
+    assert search(index, catalog, "", tag="fin")[0] == []
+
+
+def test_incremental_sync_drops_removed_and_changed_documents(catalog):
+    catalog.add_service("kept", "Weather Maps")
+    catalog.add_service("removed", "Weather Station")
+    catalog.add_service("renamed", "Weather Radar")
+    index = CatalogSearchService()
+    assert sorted(search(index, catalog, "weather")[0]) == ["kept", "removed", "renamed"]
+
+    catalog.loaded.clear()
+    del catalog.services["removed"]
+    catalog.add_service("renamed", "Storm Radar", updated=1)
+    catalog.add_service("added", "Weather Alerts")
+
+    assert sorted(search(index, catalog, "weather")[0]) == ["added", "kept"]
+    assert search(index, catalog, "storm")[0] == ["renamed"]
+    # Only new and changed services were re-read
+    assert sorted(catalog.loaded) == ["added", "renamed"]
+    # Terms of the removed and changed documents left the index
+    assert "station" not in index._postings
+    assert "station" not in index._sorted_terms
+    assert "renamed" not in index._postings.get("weather", {})
+
+
+def test_index_is_not_synced_while_catalog_version_is_unchanged(catalog):
+    catalog.add_service("first", "Weather Maps")
+    index = CatalogSearchService()
+    search(index, catalog, "weather")
+
+    catalog.loaded.clear()
+    # A write that did not bump the version is not picked up until the next sync
+    catalog.services["first"].updated_at += timedelta(seconds=1)
+    search(index, catalog, "weather")
+
+    assert catalog.loaded == []
@@ -0,0 +1,180 @@
+"""
+Billing spool tests
+"""
+
+import asyncio
+import fcntl
+import json
+
+from services.api_service.utils.billing_spool import BillingSpool, LOCK_FILE_NAME
+
+
+class FakePublisher:
+    """Confirms everything, except the publish calls listed in fail_calls"""
+
+    def __init__(self, batch_size=2, fail_calls=()):
+        self.batch_size = batch_size
+        self.fail_calls = set(fail_calls)
+        self.calls = 0
+        self.published = []
+
+    async def publish_confirmed(self, batch):
+        self.calls += 1
+        if self.calls in self.fail_calls:
+            return list(batch)
+        self.published.extend(batch)
+        return []
+
+
+def build_spool(root, publisher, segment_max_bytes=1024 * 1024):
+    # Background loops never fire during a test, drains are run explicitly
+    return BillingSpool(publisher, str(root), segment_max_bytes=segment_max_bytes, fsync_interval=3600, drain_interval=3600)
+
+
+def build_batch(start, count):
+    return [("billing", json.dumps({"call": index}), True) for index in range(start, start + count)]
+
+
+def write_segment(path, lines):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"".join(lines))
+
+
+def record_line(index):
+    return (json.dumps({"queue": "billing", "body": json.dumps({"call": index}), "persistent": True, "ts": 1.0}) + "\n").encode()
+
+
+def test_append_seals_full_segments_and_recovers_after_crash(tmp_path):
+    async def scenario():
+        spool = build_spool(tmp_path, FakePublisher(), segment_max_bytes=1)
+        await spool.start()
+        await spool.append_batch(build_batch(0, 2))
+        await spool.append_batch(build_batch(2, 1))
+
+        # Each append exceeded the segment size, so both segments are sealed
+        assert spool._active_file is None
+        assert len(spool._list_segments()) == 2
+        assert spool.get_stats()["depth"] == 3
+
+        # Crash: the process dies without stopping, which releases its lock
+        for task in spool._tasks:
+            task.cancel()
+        spool._lock_file.close()
+
+        publisher = FakePublisher()
+        recovered = build_spool(tmp_path, publisher)
+        await recovered.start()
+        assert recovered.directory == spool.directory
+        assert recovered.get_stats()["depth"] == 3
+        assert await recovered.drain() == 3
+        await recovered.stop()
+        return publisher
+
+    publisher = asyncio.run(scenario())
+    assert [json.loads(body)["call"] for _, body, _ in publisher.published] == [0, 1, 2]
+
+
+def test_drain_pauses_at_unconfirmed_chunk_and_resumes(tmp_path):
+    async def scenario():
+        publisher = FakePublisher(batch_size=2, fail_calls={2})
+        spool = build_spool(tmp_path, publisher)
+        await spool.start()
+        await spool.append_batch(build_batch(0, 5))
+        spool._seal_active()
+        segment = spool._list_segments()[0]
+
+        # The second chunk is not confirmed, the first stays replayed
+        assert await spool.drain() == 2
+        assert spool._drain_offsets[segment] == 2
+        assert segment.exists()
+        assert spool.get_stats()["depth"] == 3
+
+        assert await spool.drain() == 3
+        assert not segment.exists()
+        assert spool.get_stats()["depth"] == 0
+        await spool.stop()
+        return publisher
+
+    publisher = asyncio.run(scenario())
+    assert [json.loads(body)["call"] for _, body, _ in publisher.published] == [0, 1, 2, 3, 4]
+
+
+def test_torn_lines_are_skipped(tmp_path):
+    worker = tmp_path / "worker-crashed"
+    write_segment(
+        worker / "segment-000000000000.log",
+        [record_line(0), b'{"queue": "billing", "bo', b"\n", record_line(1), record_line(2)[:20]],
+    )
+
+    async def scenario():
+        publisher = FakePublisher(batch_size=10)
+        spool = build_spool(tmp_path, publisher)
+        await spool.start()
+        assert spool.get_stats()["depth"] == 2
+        assert await spool.drain() == 2
+        await spool.stop()
+        return publisher
+
+    publisher = asyncio.run(scenario())
+    assert [json.loads(body)["call"] for _, body, _ in publisher.published] == [0, 1]
+
+
+def test_adopts_only_unlocked_worker_directories(tmp_path):
+    busy = tmp_path / "worker-a-busy"
+    orphan = tmp_path / "worker-b-orphan"
+    write_segment(busy / "segment-000000000000.log", [record_line(0)])
+    write_segment(orphan / "segment-000000000003.log", [record_line(1)])
+
+    async def scenario():
+        spool = build_spool(tmp_path, FakePublisher())
+        await spool.start()
+        directory = spool.directory
+        depth = spool.get_stats()["depth"]
+        # New segments continue the adopted sequence instead of reusing its names
+        await spool.append_batch(build_batch(2, 1))
+        active = spool._active_path
+        await spool.stop()
+        return directory, depth, active
+
+    # A live worker holds its directory
+    with open(busy / LOCK_FILE_NAME, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        directory, depth, active = asyncio.run(scenario())
+
+    assert directory == orphan
+    assert depth == 1
+    assert active.name == "segment-000000000004.log"
+    assert (busy / "segment-000000000000.log").exists()
+
+
+def test_creates_own_directory_when_all_are_locked(tmp_path):
+    async def scenario():
+        first = build_spool(tmp_path, FakePublisher())
+        second = build_spool(tmp_path, FakePublisher())
+        await first.start()
+        await second.start()
+        directories = (first.directory, second.directory)
+        await first.stop()
+        await second.stop()
+        return directories
+
+    first_directory, second_directory = asyncio.run(scenario())
+    assert first_directory != second_directory
+    assert first_directory.parent == second_directory.parent == tmp_path
+
+
+def test_moves_shared_segments_into_worker_directory(tmp_path):
+    write_segment(tmp_path / "segment-000000000000.log", [record_line(0), record_line(1)])
+
+    async def scenario():
+        publisher = FakePublisher()
+        spool = build_spool(tmp_path, publisher)
+        await spool.start()
+        assert not list(tmp_path.glob("segment-*.log"))
+        assert spool.get_stats()["depth"] == 2
+        assert await spool.drain() == 2
+        await spool.stop()
+        return publisher
+
+    publisher = asyncio.run(scenario())
+    assert len(publisher.published) == 2
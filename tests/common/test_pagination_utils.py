@@ -0,0 +1,81 @@
+"""
+Keyset pagination tests
+"""
+
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+from sqlalchemy import Column, DateTime, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+# services.common.redis pings the server when imported
+with mock.patch("redis.Redis.ping", return_value=True):
+    from services.common.utils.pagination_utils import PaginationUtils
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "row"
+
+    id = Column(String(36), primary_key=True)
+    created_at = Column(DateTime, nullable=False)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 18, 12, 30, 45, 123456)
+
+    cursor = PaginationUtils.encode_cursor(created_at, "row-7")
+
+    assert PaginationUtils.decode_cursor(cursor) == (created_at, "row-7")
+    assert PaginationUtils.decode_cursor("") is None
+    assert PaginationUtils.decode_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", PaginationUtils.encode_cursor(datetime(2026, 1, 1), "x")[:-3] + "!!!"])
+def test_malformed_cursor_raises(cursor):
+    with pytest.raises(ValueError):
+        PaginationUtils.decode_cursor(cursor)
+
+
+def test_keyset_page_splits_equal_timestamps_by_id(db):
+    start = datetime(2026, 10, 18, 12, 0, 0)
+    # Seven rows share one timestamp, so page boundaries fall inside the tie
+    rows = [Row(id=f"tie-{index}", created_at=start) for index in range(7)]
+    rows += [Row(id=f"newer-{index}", created_at=start + timedelta(seconds=index + 1)) for index in range(2)]
+    rows.append(Row(id="older", created_at=start - timedelta(seconds=1)))
+    db.add_all(rows)
+    db.commit()
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        page, cursor = PaginationUtils.keyset_page(db.query(Row), Row.created_at, Row.id, cursor, 3)
+        seen.extend(row.id for row in page)
+        pages += 1
+        if cursor is None:
+            break
+
+    expected = sorted(rows, key=lambda row: (row.created_at, row.id), reverse=True)
+    assert seen == [row.id for row in expected]
+    assert pages == 4
+
+
+def test_keyset_page_without_next_page(db):
+    db.add(Row(id="only", created_at=datetime(2026, 10, 18)))
+    db.commit()
+
+    page, cursor = PaginationUtils.keyset_page(db.query(Row), Row.created_at, Row.id, None, 1)
+
+    assert [row.id for row in page] == ["only"]
+    assert cursor is None